@@ -0,0 +1,91 @@
+# benchmarks/bench_annotations.py
+"""Annotation/default/raise text extraction: source slicing vs ast.unparse.
+
+Two measurements over every file under the given paths (ast.parse is done
+once up front and excluded):
+ - text only: producing the text of every annotation, default and raise
+   expression, including building the line index
+ - extraction: the whole parse_functions/parse_classes stage
+
+Usage:
+    python -m benchmarks.bench_annotations [paths ...] [--repeat N]
+"""
+import argparse
+import ast
+import time
+
+from benchmarks.bench_parser import _collect_files
+from core.parser.python_parser import _node_text, _scan_module, _SourceIndex, parse_classes, parse_functions
+
+
+def _text_nodes(tree):
+    nodes = []
+    for n in ast.walk(tree):
+        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            nodes.extend(a.annotation for a in n.args.args + n.args.kwonlyargs if a.annotation)
+            nodes.extend(n.args.defaults)
+            if n.returns:
+                nodes.append(n.returns)
+        elif isinstance(n, ast.Raise) and n.exc:
+            nodes.append(n.exc)
+    return nodes
+
+
+def _text_only(modules, use_slices):
+    for tree, source, nodes in modules:
+        src = _SourceIndex(source) if use_slices else None
+        for n in nodes:
+            _node_text(n, src)
+
+
+def _extraction(modules, use_slices):
+    for tree, source, _ in modules:
+        src = _SourceIndex(source) if use_slices else None
+        stats, _, _ = _scan_module(tree, src)
+        parse_functions(tree, stats, src)
+        parse_classes(tree, stats, src)
+
+
+def _best(fn, modules, use_slices, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(modules, use_slices)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(paths, repeat: int = 5):
+    modules = []
+    for path in paths:
+        for fp in _collect_files(path):
+            try:
+                with open(fp, "rb") as f:
+                    source = f.read()
+                tree = ast.parse(source)
+            except SyntaxError:
+                continue
+            modules.append((tree, source, _text_nodes(tree)))
+
+    n_nodes = sum(len(m[2]) for m in modules)
+    print(f"{len(modules)} files, {n_nodes} annotation/default/raise expressions")
+    results = {}
+    for label, fn in (("text only", _text_only), ("extraction", _extraction)):
+        unparse_ms = _best(fn, modules, False, repeat)
+        slice_ms = _best(fn, modules, True, repeat)
+        results[label] = (unparse_ms, slice_ms)
+        print(f"{label:11} ast.unparse {unparse_ms:8.1f} ms   source slice {slice_ms:8.1f} ms   "
+              f"({unparse_ms / slice_ms:.2f}x)")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("paths", nargs="*", default=["core"])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    run(args.paths, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_dedup.py
+"""LLM requests with and without fingerprint deduplication.
+
+Writes a synthetic package in which each distinct helper is repeated
+--copies times across modules, every copy with its own argument and local
+names, comments and spacing. The package is then parsed and all of its
+undocumented functions are generated against FakeBackend, once per function
+and once per fingerprint. The parse is also timed with and without
+fingerprints, to show what computing them costs.
+
+Usage:
+    python -m benchmarks.bench_dedup [--helpers N] [--copies N] [--latency S]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict
+from unittest import mock
+
+from core.docstring_engine.backends import FakeBackend
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.parser.fingerprint import dedup_summary
+from core.parser import python_parser
+from core.parser.python_parser import parse_path
+
+_TEMPLATE = """
+def {name}({a}, {b}={k}):
+    # helper {i}, copy {c}
+    {t} = []
+    for {x} in {a}:{pad}
+        if {x} % {k} == {b}:
+            {t}.append({x} * {i})
+    return sorted({t})
+"""
+
+
+def write_corpus(root: str, helpers: int, copies: int) -> None:
+    for c in range(copies):
+        with open(os.path.join(root, f"module_{c}.py"), "w", encoding="utf-8") as f:
+            for i in range(helpers):
+                f.write(_TEMPLATE.format(name=f"helper_{i}_{c}", a=f"items{c}", b=f"rem{c}", k=i % 7 + 2,
+                                         t=f"out{c}", x=f"v{c}", i=i, c=c, pad=" " * (c % 3)))
+
+
+def _generate(fns, dedup: bool, latency: float) -> Dict[str, Any]:
+    backend = FakeBackend(latency=latency)
+    stats: Dict[str, int] = {}
+    start = time.perf_counter()
+    generate_all(fns, "google", backend=backend, limiter=RateLimiter(None, None), dedup=dedup, stats=stats)
+    return {"requests": stats.get("requests", 0), "seconds": time.perf_counter() - start}
+
+
+def run(helpers: int = 50, copies: int = 8, latency: float = 0.01) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(tmp, helpers, copies)
+        start = time.perf_counter()
+        results = parse_path(tmp)
+        parse_s = time.perf_counter() - start
+        with mock.patch.object(python_parser, "_fingerprint", lambda node: None):
+            start = time.perf_counter()
+            parse_path(tmp)
+            bare_s = time.perf_counter() - start
+    fns = [fn for r in results for fn in r["functions"] if not fn["has_docstring"]]
+    summary = dedup_summary(fn["fingerprint"] for fn in fns)
+    rows = {"per function": _generate(fns, False, latency), "per fingerprint": _generate(fns, True, latency)}
+    print(f"{len(fns)} undocumented functions, {summary['unique']} unique, "
+          f"dedup ratio {summary['dedup_ratio']:.0%}")
+    print(f"parse: {bare_s * 1000:.1f} ms without fingerprints, {parse_s * 1000:.1f} ms with")
+    print(f"{'mode':16} {'requests':>9} {'seconds':>8}")
+    for mode, row in rows.items():
+        print(f"{mode:16} {row['requests']:9d} {row['seconds']:8.2f}")
+    return {"functions": len(fns), "dedup": summary, "parse_s": parse_s, "bare_parse_s": bare_s, "modes": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--helpers", type=int, default=50)
+    ap.add_argument("--copies", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.01, help="seconds per fake request")
+    args = ap.parse_args()
+    run(args.helpers, args.copies, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_llm_client.py
+"""Per-call overhead of a fresh LLM client per call vs the pooled ClientManager.
+
+Both variants talk to a local StubLLMServer, so the numbers are client
+construction plus connection setup, not provider latency. With
+langchain-groq installed the benchmark times ChatGroq.invoke; without it,
+it times the transport alone (a new http.client connection per call vs one
+kept-alive connection), which is the part the pool saves.
+
+Usage:
+    python -m benchmarks.bench_llm_client [--calls N] [--latency SECONDS]
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import time
+from typing import Any, Callable, Dict
+from urllib.parse import urlparse
+
+from benchmarks.llm_stub import StubLLMServer
+from core.docstring_engine.llm_integration import DEFAULT_MODEL, DEFAULT_TEMPERATURE, ClientManager
+
+_PROMPT = "Return ONLY valid JSON.\nFunction name: add\nArguments: ['a', 'b']"
+
+
+def _time_calls(call: Callable[[], Any], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def _chatgroq_variants(url: str):
+    from langchain_core.messages import HumanMessage
+    from langchain_groq import ChatGroq
+
+    messages = [HumanMessage(content=_PROMPT)]
+    manager = ClientManager()
+
+    def fresh():
+        ChatGroq(model=DEFAULT_MODEL, temperature=DEFAULT_TEMPERATURE, api_key="stub", base_url=url).invoke(messages)
+
+    def pooled():
+        manager.get(DEFAULT_MODEL, DEFAULT_TEMPERATURE, api_key="stub", base_url=url).invoke(messages)
+
+    return fresh, pooled, manager.close
+
+
+def _transport_variants(url: str):
+    address = urlparse(url)
+    body = json.dumps({"model": DEFAULT_MODEL, "messages": [{"role": "user", "content": _PROMPT}]})
+    headers = {"Content-Type": "application/json"}
+    path = "/openai/v1/chat/completions"
+
+    def post(conn: http.client.HTTPConnection) -> None:
+        conn.request("POST", path, body, headers)
+        json.loads(conn.getresponse().read())
+
+    def fresh():
+        conn = http.client.HTTPConnection(address.hostname, address.port)
+        try:
+            post(conn)
+        finally:
+            conn.close()
+
+    kept = http.client.HTTPConnection(address.hostname, address.port)
+
+    def pooled():
+        post(kept)
+
+    return fresh, pooled, kept.close
+
+
+def run(calls: int = 200, latency: float = 0.0) -> Dict[str, Any]:
+    if importlib.util.find_spec("langchain_groq") is not None:
+        mode, make = "ChatGroq.invoke", _chatgroq_variants
+    else:
+        mode, make = "transport only (langchain-groq not installed)", _transport_variants
+    print(f"{calls} calls per variant, stub latency {latency * 1000:.1f} ms, {mode}")
+    print(f"{'variant':10} {'ms/call':>10} {'connections':>12}")
+    rows = {}
+    for variant in ("fresh", "pooled"):
+        with StubLLMServer(latency=latency) as server:
+            fresh, pooled, close = make(server.url)
+            call = fresh if variant == "fresh" else pooled
+            call()  # warm-up: imports, first connection
+            before = server.connections
+            ms = _time_calls(call, calls)
+            close()
+            connections = server.connections - before
+        print(f"{variant:10} {ms:10.3f} {connections:12}")
+        rows[variant] = {"ms_per_call": ms, "connections": connections}
+    return {"mode": mode, "calls": calls, "latency": latency, "variants": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--calls", type=int, default=200)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds the stub waits before answering")
+    args = ap.parse_args()
+    run(args.calls, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_memory.py
+"""Peak memory of a full scan: list-based pipeline vs streaming pipeline.
+
+list:      parse_path -> compute_coverage -> write_report
+streaming: iter_parse_path -> stream_coverage_report
+
+Usage:
+    python -m benchmarks.bench_memory [--files 1000] [--functions 100]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import generate_corpus
+from core.parser.python_parser import iter_parse_path, parse_path
+from core.reporter.coverage_reporter import compute_coverage, stream_coverage_report, write_report
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def run(files: int = 1000, functions: int = 100):
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        n = generate_corpus(corpus, files=files, functions_per_file=functions)
+        list_out = os.path.join(tmp, "list.json")
+        stream_out = os.path.join(tmp, "stream.json")
+
+        def list_pipeline():
+            write_report(compute_coverage(parse_path(corpus)), list_out)
+
+        def stream_pipeline():
+            stream_coverage_report(iter_parse_path(corpus), stream_out)
+
+        list_peak, list_s = _measure(list_pipeline)
+        stream_peak, stream_s = _measure(stream_pipeline)
+        same = open(list_out, "rb").read() == open(stream_out, "rb").read()
+
+    print(f"corpus: {files} files, {n} functions")
+    print(f"list pipeline:      peak {list_peak / 2**20:8.1f} MiB  {list_s:6.1f} s")
+    print(f"streaming pipeline: peak {stream_peak / 2**20:8.1f} MiB  {stream_s:6.1f} s")
+    print(f"reports identical: {same}")
+    return {"list_peak": list_peak, "stream_peak": stream_peak, "identical": same}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--files", type=int, default=1000)
+    ap.add_argument("--functions", type=int, default=100)
+    args = ap.parse_args()
+    run(args.files, args.functions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_packing.py
+"""Requests and prompt tokens per documented function: one per request vs packed.
+
+Uses an in-process fake model (the stub server's replies, no network) so
+only the request count and the estimated prompt tokens are measured.
+--malformed drops that fraction of the items from each packed reply, to
+show what re-requesting only the failed items costs.
+
+Usage:
+    python -m benchmarks.bench_packing [--functions N] [--budget TOKENS] [--malformed RATE]
+"""
+import argparse
+import json
+import random
+from typing import Any, Dict, List
+
+from benchmarks.llm_stub import completion_content
+from core.docstring_engine.llm_integration import build_prompt, estimate_tokens
+from core.docstring_engine.packing import MAX_PACK, PACK_TOKEN_BUDGET, generate_packed
+
+_WORDS = ["path", "user", "items", "config", "timeout", "data", "key", "value", "limit", "callback"]
+
+
+def synthetic_functions(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [{"name": f"{rng.choice(['get', 'load', 'build', 'parse'])}_{rng.choice(_WORDS)}_{i}",
+             "args": [{"name": a, "annotation": "str"} for a in rng.sample(_WORDS, rng.randint(0, 4))],
+             "returns": rng.choice([None, "int", "str", "Dict[str, Any]"])} for i in range(n)]
+
+
+def fake_model(malformed: float, seed: int = 0):
+    rng = random.Random(seed)
+
+    def complete(prompt: str) -> str:
+        text = completion_content(prompt)
+        reply = json.loads(text)
+        if isinstance(reply, list) and malformed:
+            for item in reply:
+                if rng.random() < malformed:
+                    del item["summary"]
+            return json.dumps(reply)
+        return text
+
+    return complete
+
+
+def run(functions: int = 3000, budget: int = PACK_TOKEN_BUDGET, max_items: int = MAX_PACK,
+        malformed: float = 0.0) -> Dict[str, Any]:
+    fns = synthetic_functions(functions)
+    single_tokens = sum(estimate_tokens(build_prompt(fn)) for fn in fns)
+    stats: Dict[str, int] = {}
+    generate_packed(fns, fake_model(malformed), budget, max_items, stats)
+    rows = {
+        "single": {"requests": functions, "prompt_tokens": single_tokens},
+        "packed": {"requests": stats["requests"], "prompt_tokens": stats["prompt_tokens"]},
+    }
+    print(f"{functions} functions, budget {budget} tokens, max {max_items} per request, "
+          f"{malformed:.0%} of packed items malformed")
+    print(f"{'mode':8} {'requests':>9} {'req/fn':>8} {'tokens/fn':>10}")
+    for mode, row in rows.items():
+        print(f"{mode:8} {row['requests']:9} {row['requests'] / functions:8.3f} "
+              f"{row['prompt_tokens'] / functions:10.1f}")
+    print(f"failed items re-requested: {stats.get('failed_items', 0)}")
+    return {"functions": functions, "budget": budget, "malformed": malformed, "modes": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--functions", type=int, default=3000)
+    ap.add_argument("--budget", type=int, default=PACK_TOKEN_BUDGET)
+    ap.add_argument("--max-items", type=int, default=MAX_PACK)
+    ap.add_argument("--malformed", type=float, default=0.0)
+    args = ap.parse_args()
+    run(args.functions, args.budget, args.max_items, args.malformed)
+
+
+if __name__ == "__main__":
+    main()
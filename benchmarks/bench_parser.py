@@ -0,0 +1,93 @@
+# benchmarks/bench_parser.py
+"""Per-file parse time: fused single-pass parser vs the legacy multi-walk parser.
+
+Usage:
+    python -m benchmarks.bench_parser [path] [--repeat N] [--top N]
+"""
+import argparse
+import os
+import time
+from typing import Callable, Dict, List
+
+from benchmarks import legacy_parser
+from core.parser import python_parser
+
+
+def _collect_files(path: str) -> List[str]:
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in ("venv", ".venv", "__pycache__", ".git")]
+        files.extend(os.path.join(root, n) for n in names if n.endswith(".py"))
+    return sorted(files)
+
+
+def _normalized(value):
+    """Expression text in canonical unparse form (the parser now keeps source text).
+
+    Relative imports lose their leading dots and body hashes and fingerprints
+    are dropped, as in the legacy parser.
+    """
+    if isinstance(value, dict):
+        return {k: (sorted({x.lstrip(".") for x in v}) if k == "imports"
+                    else [python_parser.normalize_annotation(x) for x in v] if k in ("raises", "defaults")
+                    else python_parser.normalize_annotation(v) if k in ("annotation", "returns")
+                    else _normalized(v))
+                for k, v in value.items() if k not in ("body_hash", "fingerprint")}
+    if isinstance(value, list):
+        return [_normalized(v) for v in value]
+    return value
+
+
+def _time_file(fn: Callable, fp: str, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(fp)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(path: str, repeat: int = 5, top: int = 10) -> Dict[str, float]:
+    files = []
+    for fp in _collect_files(path):
+        try:
+            expected = legacy_parser.parse_file(fp)
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        if _normalized(python_parser.parse_file(fp)) != _normalized(expected):
+            raise AssertionError(f"fused parser output differs for {fp}")
+        files.append(fp)
+
+    rows = []
+    for fp in files:
+        legacy_ms = _time_file(legacy_parser.parse_file, fp, repeat)
+        fused_ms = _time_file(python_parser.parse_file, fp, repeat)
+        rows.append((fp, legacy_ms, fused_ms))
+
+    legacy_total = sum(r[1] for r in rows)
+    fused_total = sum(r[2] for r in rows)
+
+    print(f"{'file':60} {'legacy ms':>10} {'fused ms':>10} {'speedup':>8}")
+    for fp, legacy_ms, fused_ms in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"{fp[-60:]:60} {legacy_ms:10.3f} {fused_ms:10.3f} {legacy_ms / fused_ms:7.2f}x")
+    print("-" * 91)
+    print(f"{len(rows)} files, per-file mean: legacy {legacy_total / max(len(rows), 1):.3f} ms, "
+          f"fused {fused_total / max(len(rows), 1):.3f} ms "
+          f"({legacy_total / fused_total if fused_total else 0:.2f}x)")
+    return {"files": len(rows), "legacy_ms": legacy_total, "fused_ms": fused_total}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("path", nargs="?", default="core")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+    run(args.path, repeat=args.repeat, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_pipeline.py
+"""Throughput and latency of the whole generation pipeline, offline.
+
+Runs generate_all against FakeBackend (fixed latency per request, optional
+injected 503s), so the rate limiter, retries, packing, parsing and
+rendering are measured without a network or an API key. Latency is the
+time from the start of the run until each function's docstring arrives.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--functions N] [--latency S] [--failure-rate R] [--concurrency N]
+"""
+import argparse
+import time
+from typing import Any, Dict
+
+from benchmarks.bench_packing import synthetic_functions
+from core.docstring_engine.backends import FakeBackend
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.packing import PACK_TOKEN_BUDGET
+
+
+def _percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _run_mode(fns, pack_budget, latency: float, failure_rate: float, concurrency: int) -> Dict[str, Any]:
+    backend = FakeBackend(latency=latency, failure_rate=failure_rate, seed=0)
+    stats: Dict[str, int] = {}
+    arrivals = []
+    start = time.perf_counter()
+    results = generate_all(fns, "google", on_result=lambda _: arrivals.append(time.perf_counter() - start),
+                           backend=backend, limiter=RateLimiter(None, None), max_concurrency=concurrency,
+                           pack_budget=pack_budget, base_delay=0.01, max_delay=0.05, seed=0, stats=stats)
+    wall = time.perf_counter() - start
+    return {
+        "wall_s": wall,
+        "fn_per_s": len(fns) / wall,
+        "p50_ms": _percentile(arrivals, 0.5) * 1000,
+        "p95_ms": _percentile(arrivals, 0.95) * 1000,
+        "requests": stats.get("requests", 0),
+        "retries": stats.get("retries", 0),
+        "errors": sum(r["error"] is not None for r in results),
+        "max_in_flight": backend.max_in_flight,
+    }
+
+
+def run(functions: int = 1000, latency: float = 0.05, failure_rate: float = 0.0,
+        concurrency: int = 8) -> Dict[str, Any]:
+    fns = synthetic_functions(functions)
+    rows = {
+        "single": _run_mode(fns, None, latency, failure_rate, concurrency),
+        "packed": _run_mode(fns, PACK_TOKEN_BUDGET, latency, failure_rate, concurrency),
+    }
+    print(f"{functions} functions, {latency * 1000:.0f} ms per request, {failure_rate:.0%} injected 503s, "
+          f"concurrency {concurrency}")
+    print(f"{'mode':8} {'wall s':>8} {'fn/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'requests':>9} {'retries':>8} "
+          f"{'errors':>7}")
+    for mode, row in rows.items():
+        print(f"{mode:8} {row['wall_s']:8.2f} {row['fn_per_s']:8.0f} {row['p50_ms']:8.0f} {row['p95_ms']:8.0f} "
+              f"{row['requests']:9d} {row['retries']:8d} {row['errors']:7d}")
+    return {"functions": functions, "modes": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--functions", type=int, default=1000)
+    ap.add_argument("--latency", type=float, default=0.05, help="seconds per fake request")
+    ap.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests failing with 503")
+    ap.add_argument("--concurrency", type=int, default=8)
+    args = ap.parse_args()
+    run(args.functions, args.latency, args.failure_rate, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
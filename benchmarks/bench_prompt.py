@@ -0,0 +1,66 @@
+# benchmarks/bench_prompt.py
+"""Prompt tokens per request against the source-context budget.
+
+Parses every function under --path, attaches its source and reports, per
+budget, the mean / p95 / max estimated prompt tokens of the single-function
+prompt and the time spent building it. The first line shows what
+compaction alone saves: raw vs compacted source tokens.
+
+Usage:
+    python -m benchmarks.bench_prompt [--path DIR] [--budgets 0,150,300,600,1200]
+"""
+import argparse
+import os
+import time
+from typing import Any, Dict, List
+
+from core.docstring_engine.llm_integration import build_prompt
+from core.docstring_engine.source_context import compact_source, estimate_tokens, with_sources
+from core.parser.python_parser import parse_file
+
+
+def _functions(path: str) -> List[Dict[str, Any]]:
+    items = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+        for name in files:
+            if name.endswith(".py"):
+                fp = os.path.join(root, name)
+                try:
+                    parsed = parse_file(fp)
+                except SyntaxError:
+                    continue
+                fns = parsed["functions"] + [m for c in parsed["classes"] for m in c["methods"]]
+                items.extend((fp, fn) for fn in fns)
+    return [fn for fn in with_sources(items) if fn.get("source")]
+
+
+def run(path: str = "core", budgets=(0, 150, 300, 600, 1200)) -> Dict[str, Any]:
+    fns = _functions(path)
+    raw = sum(estimate_tokens(fn["source"]) for fn in fns)
+    compacted = sum(estimate_tokens(compact_source(fn["source"])) for fn in fns)
+    print(f"{len(fns)} functions under {path}: source {raw} tokens raw, {compacted} compacted "
+          f"({1 - compacted / raw:.0%} saved)")
+    print(f"{'budget':>7} {'mean':>7} {'p95':>7} {'max':>7} {'ms/fn':>7}")
+    rows = {}
+    for budget in budgets:
+        start = time.perf_counter()
+        tokens = sorted(estimate_tokens(build_prompt(fn, budget)) for fn in fns)
+        elapsed = time.perf_counter() - start
+        row = {"mean": sum(tokens) / len(tokens), "p95": tokens[int(0.95 * (len(tokens) - 1))],
+               "max": tokens[-1], "ms_per_fn": elapsed / len(fns) * 1000}
+        print(f"{budget:7d} {row['mean']:7.0f} {row['p95']:7d} {row['max']:7d} {row['ms_per_fn']:7.2f}")
+        rows[budget] = row
+    return {"functions": len(fns), "raw_tokens": raw, "compacted_tokens": compacted, "budgets": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--path", default="core")
+    ap.add_argument("--budgets", default="0,150,300,600,1200")
+    args = ap.parse_args()
+    run(args.path, tuple(int(b) for b in args.budgets.split(",")))
+
+
+if __name__ == "__main__":
+    main()
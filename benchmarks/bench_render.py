@@ -0,0 +1,65 @@
+# benchmarks/bench_render.py
+"""Cost of switching the docstring style for N functions.
+
+cache:  generate_all with a warm ContentCache (no network; one SQLite
+        lookup per function plus rendering); the path a style switch took
+        before the content and render stages were split
+render: render_docstrings from content already held in memory
+
+Usage:
+    python -m benchmarks.bench_render [--functions N] [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from benchmarks.bench_packing import synthetic_functions
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.content_cache import ContentCache, content_key
+from core.docstring_engine.generator import STYLES, render_docstrings
+
+
+def _content(fn: Dict[str, Any]) -> Dict[str, Any]:
+    return {"summary": f"Run {fn['name']}.", "args": {a["name"]: "Value." for a in fn["args"]},
+            "returns": "Result.", "raises": {"ValueError": "Bad input."}}
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(functions: int = 5000, repeat: int = 3) -> Dict[str, Any]:
+    fns = synthetic_functions(functions)
+    contents = [_content(fn) for fn in fns]
+    rows = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ContentCache(os.path.join(tmp, "content.sqlite3"))
+        cache.put_many({content_key(fn): c for fn, c in zip(fns, contents)})
+        print(f"{functions} functions")
+        print(f"{'style':8} {'cache ms':>10} {'render ms':>10}")
+        for style in STYLES:
+            cache_ms = _best(lambda: generate_all(fns, style, cache=cache, limiter=RateLimiter(None, None)), repeat)
+            render_ms = _best(lambda: render_docstrings(fns, contents, style), repeat)
+            print(f"{style:8} {cache_ms:10.1f} {render_ms:10.1f}")
+            rows[style] = {"cache_ms": cache_ms, "render_ms": render_ms}
+        cache.close()
+    return {"functions": functions, "styles": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--functions", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    run(args.functions, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_search.py
+"""Symbol search: SymbolIndex vs the linear substring scan it replaced.
+
+Builds synthetic parse results with --symbols functions and methods, then
+times each query (best of --repeat) against both.
+
+Usage:
+    python -m benchmarks.bench_search [--symbols N] [--repeat N]
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from core.search.symbol_index import SymbolIndex
+
+_WORDS = ["get", "set", "load", "save", "parse", "build", "user", "item", "cache", "index",
+          "config", "report", "file", "path", "node", "token", "request", "session", "handler"]
+QUERIES = ["pa", "load", "oad", "user_item", "cache_index_re", "config_path", "zzzz"]
+
+
+def synthetic_results(symbols: int, per_file: int = 100, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    results = []
+    for i in range(0, symbols, per_file):
+        fns = [{"name": "_".join(rng.sample(_WORDS, 3)) + str(j), "lineno": j + 1,
+                "has_docstring": rng.random() < 0.5} for j in range(min(per_file, symbols - i))]
+        results.append({"path": f"pkg/mod{i // per_file:05d}.py", "functions": fns, "classes": []})
+    return results
+
+
+def _linear(results, query):
+    q = query.lower()
+    return [fn for r in results for fn in r["functions"] if q in fn["name"].lower()]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(symbols: int = 300_000, repeat: int = 5) -> Dict[str, Any]:
+    results = synthetic_results(symbols)
+    start = time.perf_counter()
+    index = SymbolIndex(results)
+    build_ms = (time.perf_counter() - start) * 1000
+    update_ms = _best(lambda: index.update_file(results[0]), repeat)
+    print(f"{len(index)} symbols, build {build_ms:.0f} ms, one-file update {update_ms:.3f} ms")
+    print(f"{'query':16} {'linear ms':>10} {'index ms':>10} {'hits':>8}")
+    rows = {}
+    for q in QUERIES:
+        linear_ms = _best(lambda: _linear(results, q), repeat)
+        index_ms = _best(lambda: index.search(q), repeat)
+        hits = len(index.search(q, limit=None))
+        print(f"{q:16} {linear_ms:10.2f} {index_ms:10.2f} {hits:8}")
+        rows[q] = {"linear_ms": linear_ms, "index_ms": index_ms, "hits": hits}
+    return {"symbols": len(index), "build_ms": build_ms, "update_ms": update_ms, "queries": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=300_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    run(args.symbols, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
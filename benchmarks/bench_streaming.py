@@ -0,0 +1,60 @@
+# benchmarks/bench_streaming.py
+"""Time to first visible output: blocking vs streamed docstring generation.
+
+FakeBackend replies in chunks of --chunk characters (about one token) with
+--latency seconds spread over the whole reply, the way a model streams.
+blocking: the docstring appears once the full reply is parsed
+stream:   the first partial docstring with summary text appears after the
+          first few chunks (stream_docstring); "done" is the final rendering
+
+Usage:
+    python -m benchmarks.bench_streaming [--functions N] [--latency S] [--chunk N]
+"""
+import argparse
+import time
+from typing import Any, Dict
+
+from benchmarks.bench_packing import synthetic_functions
+from core.docstring_engine.backends import FakeBackend
+from core.docstring_engine.generator import generate_docstring
+from core.docstring_engine.streaming import stream_docstring
+
+
+def run(functions: int = 20, latency: float = 0.5, chunk: int = 4) -> Dict[str, Any]:
+    fns = synthetic_functions(functions)
+    backend = FakeBackend(latency=latency, chunk_size=chunk)
+    blocking = first = done = 0.0
+    for fn in fns:
+        start = time.perf_counter()
+        generate_docstring(fn, backend=backend)
+        blocking += time.perf_counter() - start
+
+        start = time.perf_counter()
+        seen = None
+        for event in stream_docstring(fn, backend=backend):
+            if seen is None:
+                seen = time.perf_counter() - start
+        first += seen
+        done += time.perf_counter() - start
+    rows = {
+        "blocking": {"first_ms": blocking / functions * 1000, "done_ms": blocking / functions * 1000},
+        "stream": {"first_ms": first / functions * 1000, "done_ms": done / functions * 1000},
+    }
+    print(f"{functions} functions, {latency * 1000:.0f} ms per reply, {chunk} chars per chunk")
+    print(f"{'mode':9} {'first ms':>9} {'done ms':>9}")
+    for mode, row in rows.items():
+        print(f"{mode:9} {row['first_ms']:9.1f} {row['done_ms']:9.1f}")
+    return {"functions": functions, "modes": rows}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--functions", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.5, help="seconds per fake reply")
+    ap.add_argument("--chunk", type=int, default=4, help="characters per streamed chunk")
+    args = ap.parse_args()
+    run(args.functions, args.latency, args.chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_walk.py
+"""File discovery time: hard-coded skip_dirs vs IgnoreMatcher pruning.
+
+Builds a synthetic project next to a large virtualenv (named `.venv311`, so
+the old skip list does not catch it) plus node_modules and build/ trees
+listed in .gitignore, then times collecting the .py files both ways (best
+of --repeat). Use --path to time an existing tree instead.
+
+Usage:
+    python -m benchmarks.bench_walk [--venv-files N] [--project-files N] [--repeat N]
+    python -m benchmarks.bench_walk --path .
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+from core.parser.ignore import IgnoreMatcher
+from core.parser.python_parser import _collect_py_files
+
+SKIP_DIRS = ["venv", ".venv", "__pycache__", ".git"]
+
+
+def build_tree(root: str, venv_files: int = 5000, project_files: int = 200, per_dir: int = 25) -> None:
+    def write(rel: str) -> None:
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("def f():\n    pass\n")
+
+    for i in range(project_files):
+        write(f"src/pkg{i // per_dir}/mod{i}.py")
+    for i in range(venv_files):
+        write(f".venv311/Lib/site-packages/dist{i // per_dir}/m{i}.py")
+    for i in range(venv_files // 4):
+        write(f"node_modules/dep{i // per_dir}/gyp{i}.py")
+        write(f"build/lib/pkg{i // per_dir}/mod{i}.py")
+    with open(os.path.join(root, ".venv311", "pyvenv.cfg"), "w", encoding="utf-8") as f:
+        f.write("home = /usr/bin\n")
+    with open(os.path.join(root, ".gitignore"), "w", encoding="utf-8") as f:
+        f.write("node_modules/\nbuild/\n*.pyc\n")
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(path: Optional[str] = None, venv_files: int = 5000, project_files: int = 200,
+        repeat: int = 5) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = tmp
+            build_tree(tmp, venv_files, project_files)
+        n_old = len(_collect_py_files(path, True, SKIP_DIRS))
+        n_new = len(_collect_py_files(path, True, SKIP_DIRS, IgnoreMatcher(path, skip_dirs=SKIP_DIRS)))
+        old_ms = _best(lambda: _collect_py_files(path, True, SKIP_DIRS), repeat)
+        new_ms = _best(lambda: _collect_py_files(path, True, SKIP_DIRS, IgnoreMatcher(path, skip_dirs=SKIP_DIRS)),
+                       repeat)
+    print(f"{'walk':22} {'files':>8} {'ms':>10}")
+    print(f"{'skip_dirs only':22} {n_old:8} {old_ms:10.1f}")
+    print(f"{'ignore-aware':22} {n_new:8} {new_ms:10.1f}   ({old_ms / new_ms:.1f}x)")
+    return {"old_files": n_old, "new_files": n_new, "old_ms": old_ms, "new_ms": new_ms}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--path", default=None)
+    ap.add_argument("--venv-files", type=int, default=5000)
+    ap.add_argument("--project-files", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    run(args.path, args.venv_files, args.project_files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
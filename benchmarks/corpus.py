@@ -0,0 +1,85 @@
+# benchmarks/corpus.py
+"""Deterministic synthetic Python corpus for benchmarks.
+
+The same arguments and seed always produce byte-identical files, so timings
+from different runs (and machines) are comparable.
+"""
+import os
+import random
+from typing import List
+
+_TYPES = ["int", "str", "float", "bool", "List[int]", "Dict[str, Any]", "Optional[str]"]
+_BRANCHES = ["if {v} > {i}:", "for _{i} in range({v}):", "while {v} < {i}:", "with open('f{i}') as fh{i}:"]
+
+
+def _signature(rng: random.Random, name: str, n_args: int, annotation_density: float, prefix: str = "") -> str:
+    args = [prefix] if prefix else []
+    for k in range(n_args):
+        arg = f"a{k}"
+        if rng.random() < annotation_density:
+            arg += f": {rng.choice(_TYPES)}"
+        if k == n_args - 1 and rng.random() < 0.3:
+            arg += " = None"
+        args.append(arg)
+    ret = f" -> {rng.choice(_TYPES)}" if rng.random() < annotation_density else ""
+    return f"def {name}({', '.join(args)}){ret}:"
+
+
+def _body(rng: random.Random, indent: str, nesting: int, documented: bool, name: str) -> List[str]:
+    lines = []
+    if documented:
+        lines.append(f'{indent}"""Compute {name} from its arguments."""')
+    lines.append(f"{indent}total = 0")
+    pad = indent
+    for level in range(nesting):
+        lines.append(pad + rng.choice(_BRANCHES).format(v="total", i=level))
+        pad += "    "
+        lines.append(f"{pad}total += {level}")
+    if rng.random() < 0.2:
+        lines.append(f"{indent}if total < 0:")
+        lines.append(f"{indent}    raise ValueError('negative total')")
+    lines.append(f"{indent}return total")
+    return lines
+
+
+def generate_module(rng: random.Random, index: int, functions_per_file: int = 100, nesting: int = 2,
+                    annotation_density: float = 0.5, docstring_ratio: float = 0.5,
+                    class_ratio: float = 0.2) -> str:
+    """Source text of one synthetic module."""
+    out = [f'"""Synthetic module {index}."""', "import os",
+           "from typing import Any, Dict, List, Optional", ""]
+    j = 0
+    while j < functions_per_file:
+        if rng.random() < class_ratio and functions_per_file - j >= 3:
+            out.append(f"class Cls{index}_{j}:")
+            if rng.random() < docstring_ratio:
+                out.append('    """Synthetic class."""')
+            out.append("    limit = 10")
+            for m in range(3):
+                name = f"method_{j}"
+                out.append("    " + _signature(rng, name, rng.randint(0, 3), annotation_density, "self"))
+                out.extend(_body(rng, "        ", nesting, rng.random() < docstring_ratio, name))
+                j += 1
+        else:
+            name = f"fn_{index}_{j}"
+            out.append(_signature(rng, name, rng.randint(0, 4), annotation_density))
+            out.extend(_body(rng, "    ", nesting, rng.random() < docstring_ratio, name))
+            j += 1
+        out.append("")
+    return "\n".join(out)
+
+
+def generate_corpus(root: str, files: int = 1000, functions_per_file: int = 100,
+                    docstring_ratio: float = 0.5, seed: int = 0, nesting: int = 2,
+                    annotation_density: float = 0.5, class_ratio: float = 0.2) -> int:
+    """Write `files` modules under root (100 per package); returns the number of functions and methods."""
+    rng = random.Random(seed)
+    per_dir = 100
+    for i in range(files):
+        d = os.path.join(root, f"pkg{i // per_dir:04d}")
+        os.makedirs(d, exist_ok=True)
+        source = generate_module(rng, i, functions_per_file, nesting, annotation_density,
+                                 docstring_ratio, class_ratio)
+        with open(os.path.join(d, f"mod{i:05d}.py"), "w", encoding="utf-8") as f:
+            f.write(source)
+    return files * functions_per_file
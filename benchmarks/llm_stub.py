@@ -0,0 +1,137 @@
+# benchmarks/llm_stub.py
+"""Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers every POST with a chat completion whose content is valid docstring
+JSON for the function named in the prompt ("Function name: ..."), or a
+JSON array keyed by id for a packed prompt ("[f0] Function name: ..."). Speaks
+HTTP/1.1 keep-alive and counts accepted connections and requests, so a
+benchmark can tell whether the client reuses connections.
+
+`latency` delays every reply; `fail_statuses` makes the first requests
+fail with those statuses in order (e.g. [429, 503]), with a Retry-After
+header when `retry_after` is set. `max_in_flight` records the highest
+number of requests served at once.
+
+    with StubLLMServer(latency=0.01) as server:
+        ... point the client at server.url ...
+        server.connections, server.requests
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+
+from core.docstring_engine.backends import fake_reply
+
+def completion_content(prompt: str) -> str:
+    return fake_reply(prompt)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            n = server.requests
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+            if n <= len(server.fail_statuses):
+                status = server.fail_statuses[n - 1]
+                headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else None
+                self._send(status, {"error": {"message": f"stub failure {status}"}}, headers)
+                return
+            self._reply(request, n)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, request: dict, n: int) -> None:
+        prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+        content = completion_content(prompt)
+        self._send(200, {
+            "id": f"stub-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        })
+
+
+class StubLLMServer:
+    """Threaded stub server on 127.0.0.1 (an ephemeral port unless given)."""
+
+    def __init__(self, latency: float = 0.0, fail_statuses: Iterable[int] = (),
+                 retry_after: Optional[float] = None, port: int = 0):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.lock = threading.Lock()
+        self._httpd.latency = latency
+        self._httpd.connections = 0
+        self._httpd.requests = 0
+        self._httpd.fail_statuses = list(fail_statuses)
+        self._httpd.retry_after = retry_after
+        self._httpd.in_flight = 0
+        self._httpd.max_in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        return self._httpd.connections
+
+    @property
+    def requests(self) -> int:
+        return self._httpd.requests
+
+    @property
+    def max_in_flight(self) -> int:
+        return self._httpd.max_in_flight
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
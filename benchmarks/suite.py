@@ -0,0 +1,142 @@
+# benchmarks/suite.py
+"""Benchmark suite for the parser and reporter on a synthetic corpus.
+
+Times parse_file, parse_path, compute_coverage, compute_complexity and
+write_report (best of --repeat runs), stores the results under
+storage/benchmarks/, and compares them against a saved baseline.
+
+Usage:
+    python -m benchmarks.suite                   # run, compare with baseline
+    python -m benchmarks.suite --save-baseline   # run and make this the baseline
+    python -m benchmarks.suite --files 200 --functions 50 --nesting 3 \
+        --annotation-density 0.8 --docstring-ratio 0.3 --threshold 0.15
+
+Exit status is 1 when any benchmark is slower than baseline * (1 + threshold).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import generate_corpus
+from core.parser.python_parser import parse_file, parse_path
+from core.reporter.coverage_reporter import compute_coverage, write_report
+from core.validator.validator import compute_complexity
+
+RESULTS_DIR = "storage/benchmarks"
+LATEST_PATH = os.path.join(RESULTS_DIR, "latest.json")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.20
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(files: int = 100, functions: int = 50, nesting: int = 2, annotation_density: float = 0.5,
+              docstring_ratio: float = 0.5, seed: int = 0, repeat: int = 3) -> Dict[str, Any]:
+    """Generate the corpus, time every stage and return a results dict (seconds)."""
+    config = {"files": files, "functions": functions, "nesting": nesting,
+              "annotation_density": annotation_density, "docstring_ratio": docstring_ratio,
+              "seed": seed, "repeat": repeat}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = os.path.join(tmp, "corpus")
+        generate_corpus(corpus, files=files, functions_per_file=functions, docstring_ratio=docstring_ratio,
+                        seed=seed, nesting=nesting, annotation_density=annotation_density)
+        paths = sorted(str(p) for p in Path(corpus).rglob("*.py"))
+        sources = [Path(p).read_text(encoding="utf-8") for p in paths]
+        results = parse_path(corpus)
+        report = compute_coverage(results)
+        report_path = os.path.join(tmp, "report.json")
+
+        timings = {
+            "parse_file": _best(lambda: [parse_file(p) for p in paths], repeat) / len(paths),
+            "parse_path": _best(lambda: parse_path(corpus), repeat),
+            "compute_coverage": _best(lambda: compute_coverage(results), repeat),
+            "compute_complexity": _best(lambda: [compute_complexity(s) for s in sources], repeat),
+            "write_report": _best(lambda: write_report(report, report_path), repeat),
+        }
+    return {
+        "config": config,
+        "timings": timings,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(latest: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Return one row per benchmark; `regressed` when slower than baseline by more than threshold."""
+    rows = []
+    for name, seconds in latest["timings"].items():
+        base = baseline.get("timings", {}).get(name)
+        ratio = seconds / base if base else None
+        rows.append({"name": name, "seconds": seconds, "baseline": base, "ratio": ratio,
+                     "regressed": ratio is not None and ratio > 1 + threshold})
+    return rows
+
+
+def _load(path: str) -> Optional[Dict[str, Any]]:
+    p = Path(path)
+    if not p.exists():
+        return None
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def _save(data: Dict[str, Any], path: str) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Parser/reporter benchmark suite.")
+    ap.add_argument("--files", type=int, default=100)
+    ap.add_argument("--functions", type=int, default=50)
+    ap.add_argument("--nesting", type=int, default=2)
+    ap.add_argument("--annotation-density", type=float, default=0.5)
+    ap.add_argument("--docstring-ratio", type=float, default=0.5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="allowed slowdown vs baseline before failing (0.2 = 20%%)")
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--results-dir", default=RESULTS_DIR)
+    args = ap.parse_args(argv)
+
+    latest = run_suite(args.files, args.functions, args.nesting, args.annotation_density,
+                       args.docstring_ratio, args.seed, args.repeat)
+    latest_path = os.path.join(args.results_dir, "latest.json")
+    baseline_path = os.path.join(args.results_dir, "baseline.json")
+    _save(latest, latest_path)
+    if args.save_baseline:
+        _save(latest, baseline_path)
+
+    baseline = _load(baseline_path)
+    if baseline and baseline.get("config") != latest["config"]:
+        print("baseline was recorded with a different corpus config; not comparing", file=sys.stderr)
+        baseline = None
+
+    rows = compare(latest, baseline or {}, args.threshold)
+    print(f"{'benchmark':20} {'seconds':>12} {'baseline':>12} {'ratio':>7}")
+    for r in rows:
+        base = f"{r['baseline']:.6f}" if r["baseline"] else "-"
+        ratio = f"{r['ratio']:.2f}" if r["ratio"] else "-"
+        flag = "  REGRESSION" if r["regressed"] else ""
+        print(f"{r['name']:20} {r['seconds']:12.6f} {base:>12} {ratio:>7}{flag}")
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# core/analysis/context.py
+"""Parsed-module context shared by every analysis of a file.
+
+AnalysisContext reads and parses each file once and hands the same
+ModuleContext (raw bytes, AST, line index, decoded text) to parse_file,
+compute_complexity, compute_code_metrics and the docstring validator. A
+module is re-parsed only when the file's (mtime_ns, size) changes.
+
+Memory is bounded: at most `max_modules` modules are held (least recently
+used are evicted), and release() drops one file or everything explicitly.
+Evicting or releasing only drops the context's reference: a caller still
+holding a ModuleContext keeps a complete module, and its memory (an mmap
+included) is freed with the last reference. stats() reports how many
+parses were avoided.
+"""
+import ast
+import mmap
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from core.parser.python_parser import _read_source, _source_encoding, _source_index, _SourceIndex
+
+DEFAULT_MAX_MODULES = 256
+
+
+class ModuleContext:
+    """One parsed file: bytes, AST and lazily built line index / text."""
+    __slots__ = ("path", "data", "tree", "signature", "_index", "_text")
+
+    def __init__(self, path: str, data: Union[bytes, mmap.mmap], tree: ast.Module,
+                 signature: Optional[Tuple[int, int]] = None):
+        self.path = path
+        self.data = data
+        self.tree = tree
+        self.signature = signature
+        self._index: Optional[_SourceIndex] = None
+        self._text: Optional[str] = None
+
+    @property
+    def index(self) -> _SourceIndex:
+        if self._index is None:
+            self._index = _source_index(self.data)
+        return self._index
+
+    @property
+    def text(self) -> str:
+        """Source decoded with its declared encoding (coding cookie / BOM)."""
+        if self._text is None:
+            self._text = str(self.data, _source_encoding(self.data))
+        return self._text
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class AnalysisContext:
+    """Per-session store of parsed modules that analyzers share."""
+
+    def __init__(self, max_modules: Optional[int] = DEFAULT_MAX_MODULES):
+        self.max_modules = max_modules
+        self._modules: "OrderedDict[str, ModuleContext]" = OrderedDict()
+        self.parses = 0
+        self.reuses = 0
+        self.evictions = 0
+        self.releases = 0
+
+    def __contains__(self, path: str) -> bool:
+        return os.path.abspath(path) in self._modules
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def __enter__(self) -> "AnalysisContext":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def get(self, path: str) -> ModuleContext:
+        """The parsed module for `path`, parsing it only if unseen or changed on disk."""
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        signature = (st.st_mtime_ns, st.st_size)
+        module = self._modules.get(key)
+        if module is not None:
+            if module.signature == signature:
+                self.reuses += 1
+                self._modules.move_to_end(key)
+                return module
+            self._drop(key)
+        data = _read_source(key)
+        try:
+            tree = ast.parse(data)
+        except Exception:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            raise
+        return self._store(key, ModuleContext(path, data, tree, signature))
+
+    def read_text(self, path: str) -> str:
+        """Decoded source of `path`: the resident module's, or read without storing it.
+
+        For analyses that only need the text of many files (e.g. the docstring
+        validator), so they do not cycle every module through the LRU.
+        """
+        if path in self:
+            return self.get(path).text
+        data = _read_source(os.path.abspath(path))
+        try:
+            return str(data, _source_encoding(data))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def add_source(self, path: str, data: bytes) -> ModuleContext:
+        """Register in-memory contents for `path` (e.g. a git blob), replacing any entry."""
+        key = os.path.abspath(path)
+        if key in self._modules:
+            self._drop(key)
+        return self._store(key, ModuleContext(path, data, ast.parse(data)))
+
+    def _store(self, key: str, module: ModuleContext) -> ModuleContext:
+        self.parses += 1
+        self._modules[key] = module
+        if self.max_modules is not None:
+            while len(self._modules) > self.max_modules:
+                self._modules.popitem(last=False)
+                self.evictions += 1
+        return module
+
+    def _drop(self, key: str) -> None:
+        self._modules.pop(key, None)
+
+    def release(self, path: Optional[str] = None) -> None:
+        """Free one file's module, or every module when path is None."""
+        if path is None:
+            self.releases += len(self._modules)
+            self._modules.clear()
+        elif os.path.abspath(path) in self._modules:
+            self.releases += 1
+            self._drop(os.path.abspath(path))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "parses": self.parses,
+            "parses_avoided": self.reuses,
+            "resident_modules": len(self._modules),
+            "resident_bytes": sum(m.size for m in self._modules.values()),
+            "evictions": self.evictions,
+            "releases": self.releases,
+        }
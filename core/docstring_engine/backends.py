@@ -0,0 +1,342 @@
+# core/docstring_engine/backends.py
+"""Interchangeable LLM backends for docstring generation.
+
+Every backend turns a prompt into reply text, blocking or async, one
+prompt or a batch, whole or streamed in chunks (LLMBackend). `name`
+identifies the model in cache keys.
+
+ - GroqBackend: ChatGroq through the pooled ClientManager
+ - LlamaCppBackend: a local GGUF model through langchain's LlamaCpp (the
+   setup of experiments/llm_local.py); one model per path and settings is
+   loaded per process and calls to it are serialized
+ - FakeBackend: deterministic replies with configurable latency and
+   injected failures, for offline tests and throughput runs
+
+get_backend() picks one by name, defaulting to $DOCSTRING_LLM_BACKEND or
+"groq".
+"""
+import abc
+import asyncio
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from typing import (
+    Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, runtime_checkable,
+)
+
+from core.docstring_engine.llm_integration import DEFAULT_MODEL, DEFAULT_TEMPERATURE
+
+BACKEND_ENV = "DOCSTRING_LLM_BACKEND"
+LLAMA_MODEL_ENV = "LLAMA_MODEL_PATH"
+
+
+@runtime_checkable
+class LLMBackend(Protocol):
+    name: str
+    temperature: float
+
+    def complete(self, prompt: str) -> str: ...
+
+    async def acomplete(self, prompt: str) -> str: ...
+
+    def batch(self, prompts: Sequence[str]) -> List[str]: ...
+
+    def stream(self, prompt: str) -> Iterator[str]: ...
+
+    def astream(self, prompt: str) -> AsyncIterator[str]: ...
+
+
+class BackendError(Exception):
+    """A failed backend call; status_code follows HTTP (429, 503, ...) so batch retries apply."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class BaseBackend(abc.ABC):
+    """Defaults built on complete(): async in a worker thread, batch in a loop, a one-chunk stream."""
+    name = "base"
+    temperature = DEFAULT_TEMPERATURE
+
+    @abc.abstractmethod
+    def complete(self, prompt: str) -> str:
+        """Reply text for one prompt."""
+
+    async def acomplete(self, prompt: str) -> str:
+        return await asyncio.to_thread(self.complete, prompt)
+
+    def batch(self, prompts: Sequence[str]) -> List[str]:
+        return [self.complete(p) for p in prompts]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield self.complete(prompt)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        yield await self.acomplete(prompt)
+
+
+def _text(chunk: Any) -> str:
+    """Reply text of a chat message / chunk, or a plain string from a completion model."""
+    return chunk if isinstance(chunk, str) else chunk.content
+
+
+class GroqBackend(BaseBackend):
+    """Groq chat models through the shared, pooled ChatGroq clients."""
+
+    def __init__(self, model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+                 api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.model = model
+        self.temperature = temperature
+        self.api_key = api_key
+        self.base_url = base_url
+        self.name = model
+
+    def _llm(self):
+        from core.docstring_engine.llm_integration import client_manager
+
+        return client_manager().get(self.model, self.temperature, self.api_key, self.base_url)
+
+    @staticmethod
+    def _messages(prompt: str):
+        from langchain_core.messages import HumanMessage
+
+        return [HumanMessage(content=prompt)]
+
+    def complete(self, prompt: str) -> str:
+        llm = self._llm()
+        return _text(llm.invoke(self._messages(prompt)))
+
+    async def acomplete(self, prompt: str) -> str:
+        llm = self._llm()
+        return _text(await llm.ainvoke(self._messages(prompt)))
+
+    def batch(self, prompts: Sequence[str]) -> List[str]:
+        llm = self._llm()
+        return [_text(r) for r in llm.batch([self._messages(p) for p in prompts])]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        llm = self._llm()
+        for chunk in llm.stream(self._messages(prompt)):
+            yield _text(chunk)
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        llm = self._llm()
+        async for chunk in llm.astream(self._messages(prompt)):
+            yield _text(chunk)
+
+
+# (model_path, n_ctx, n_threads, n_gpu_layers, temperature) -> (model, lock serializing its calls)
+_llama_models: Dict[Tuple[Any, ...], Tuple[Any, threading.Lock]] = {}
+_llama_lock = threading.Lock()
+
+
+def _load_llama(model_path: str, n_ctx: int, n_threads: int, n_gpu_layers: int, temperature: float):
+    from langchain_community.llms import LlamaCpp
+
+    return LlamaCpp(model_path=model_path, n_ctx=n_ctx, n_threads=n_threads, n_gpu_layers=n_gpu_layers,
+                    temperature=temperature)
+
+
+class LlamaCppBackend(BaseBackend):
+    """A local GGUF model (llama.cpp); calls are serialized since one model runs one prompt at a time.
+
+    Backends with the same model path and settings share one loaded model
+    and its lock. A streamed reply is generated to the end in a thread of
+    its own, so a caller abandoning the stream cannot keep the model locked.
+
+    model_path: defaults to $LLAMA_MODEL_PATH
+    """
+
+    def __init__(self, model_path: Optional[str] = None, temperature: float = DEFAULT_TEMPERATURE,
+                 n_ctx: int = 8192, n_threads: Optional[int] = None, n_gpu_layers: int = 0):
+        model_path = model_path or os.getenv(LLAMA_MODEL_ENV)
+        if not model_path:
+            raise RuntimeError(f"{LLAMA_MODEL_ENV} not set")
+        self.model_path = model_path
+        self.temperature = temperature
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads or os.cpu_count() or 1
+        self.n_gpu_layers = n_gpu_layers
+        self.name = "llamacpp:" + os.path.basename(model_path)
+
+    def _llm(self) -> Tuple[Any, threading.Lock]:
+        # loading a GGUF model takes seconds and gigabytes: once per path and settings per process
+        key = (self.model_path, self.n_ctx, self.n_threads, self.n_gpu_layers, self.temperature)
+        with _llama_lock:
+            entry = _llama_models.get(key)
+            if entry is None:
+                entry = (_load_llama(*key), threading.Lock())
+                _llama_models[key] = entry
+            return entry
+
+    def complete(self, prompt: str) -> str:
+        llm, lock = self._llm()
+        with lock:
+            return _text(llm.invoke(prompt))
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        llm, lock = self._llm()
+        replies: "queue.Queue[Any]" = queue.Queue()
+        done = object()
+
+        def produce() -> None:
+            try:
+                with lock:
+                    for chunk in llm.stream(prompt):
+                        replies.put(_text(chunk))
+            except Exception as e:
+                replies.put(e)
+            replies.put(done)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            item = replies.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        # run the blocking token stream in a thread and hand chunks over through a queue
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def produce() -> None:
+            try:
+                for chunk in self.stream(prompt):
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = loop.run_in_executor(None, produce)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await worker
+
+
+_FUNCTION_NAME = re.compile(r"Function name: (\w+)")
+_PACKED_NAME = re.compile(r"^\[(\w+)\] Function name: (\w+)", re.M)
+
+
+def fake_reply(prompt: str) -> str:
+    """Valid docstring JSON for the prompt's function(s): an object, or an id-keyed array when packed."""
+    packed = _PACKED_NAME.findall(prompt)
+    if packed:
+        return json.dumps([{"id": fid, "summary": f"Run {name}.", "args": {}, "returns": "DESCRIPTION",
+                            "raises": {}} for fid, name in packed])
+    m = _FUNCTION_NAME.search(prompt)
+    name = m.group(1) if m else "function"
+    return json.dumps({"summary": f"Run {name}.", "args": {}, "returns": "DESCRIPTION", "raises": {}})
+
+
+class FakeBackend(BaseBackend):
+    """Deterministic offline backend.
+
+    latency: seconds per call (spread over the chunks when streaming)
+    fail_statuses: the first calls fail with these statuses, in order
+    failure_rate: later calls fail with `failure_status` at this rate (seeded)
+    chunk_size: characters per streamed chunk
+    """
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, fail_statuses: Iterable[int] = (), failure_rate: float = 0.0,
+                 failure_status: int = 503, chunk_size: int = 8, seed: int = 0,
+                 temperature: float = DEFAULT_TEMPERATURE):
+        self.latency = latency
+        self.fail_statuses = list(fail_statuses)
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.chunk_size = chunk_size
+        self.temperature = temperature
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _begin(self) -> None:
+        """Count the call and raise an injected failure, if due."""
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+            fail = (self.fail_statuses[n - 1] if n <= len(self.fail_statuses)
+                    else self.failure_status if self._rng.random() < self.failure_rate else None)
+            if fail is not None:
+                self.failures += 1
+                raise BackendError(f"injected failure {fail}", status_code=fail)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _chunks(self, text: str) -> List[str]:
+        return [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+
+    def complete(self, prompt: str) -> str:
+        self._begin()
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return fake_reply(prompt)
+        finally:
+            self._end()
+
+    async def acomplete(self, prompt: str) -> str:
+        self._begin()
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return fake_reply(prompt)
+        finally:
+            self._end()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        self._begin()
+        try:
+            chunks = self._chunks(fake_reply(prompt))
+            for chunk in chunks:
+                if self.latency:
+                    time.sleep(self.latency / len(chunks))
+                yield chunk
+        finally:
+            self._end()
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        self._begin()
+        try:
+            chunks = self._chunks(fake_reply(prompt))
+            for chunk in chunks:
+                if self.latency:
+                    await asyncio.sleep(self.latency / len(chunks))
+                yield chunk
+        finally:
+            self._end()
+
+
+BACKENDS = {"groq": GroqBackend, "llamacpp": LlamaCppBackend, "fake": FakeBackend}
+
+
+def get_backend(name: Optional[str] = None, **kwargs: Any) -> LLMBackend:
+    """Backend by name ("groq", "llamacpp", "fake"); default $DOCSTRING_LLM_BACKEND or "groq"."""
+    name = (name or os.getenv(BACKEND_ENV) or "groq").lower()
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend: {name} (expected one of {', '.join(BACKENDS)})") from None
+    return cls(**kwargs)
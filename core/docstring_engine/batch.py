@@ -0,0 +1,394 @@
+# core/docstring_engine/batch.py
+"""Concurrent docstring generation for many functions.
+
+generate_docstrings() keeps at most `max_concurrency` LLM calls in flight,
+paces them with a RateLimiter (token buckets for requests and tokens per
+minute, defaulting to the provider's published limits) and yields each
+result as soon as it completes.
+
+Calls failing with 429 or a 5xx status are retried with exponential
+backoff and full jitter. A Retry-After sent with the error pauses the
+whole limiter for that long, so the other workers back off as well.
+Any other error is reported in the item's result without a retry.
+
+With pack_budget set, several functions share one request (see packing);
+retries and rate limits then apply per packed request. Duplicate functions
+(same fingerprint, see dedup) are generated once and the content adapted
+for the other copies.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.docstring_engine.content_cache import ContentCache, content_key
+from core.docstring_engine.generator import STYLES, render_docstring
+from core.docstring_engine.backends import LLMBackend
+from core.docstring_engine.dedup import adapt_content
+from core.parser.fingerprint import group_duplicates
+from core.docstring_engine.llm_integration import (
+    DEFAULT_MODEL, DEFAULT_TEMPERATURE, acomplete, build_prompt, estimate_tokens, parse_content,
+)
+from core.docstring_engine.packing import MAX_PACK, generate_group, pack
+from core.docstring_engine.source_context import SOURCE_TOKEN_BUDGET
+
+# Groq free tier for llama-3.1-8b-instant; raise both for paid plans
+GROQ_REQUESTS_PER_MINUTE = 30
+GROQ_TOKENS_PER_MINUTE = 6000
+
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_RETRIES = 5
+BASE_DELAY = 0.5
+MAX_DELAY = 30.0
+COMPLETION_TOKENS = 200  # budgeted per request for the model's reply
+
+ContentFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+CompleteFn = Callable[[str], Awaitable[str]]
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity` (the burst size)."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def delay(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens can be taken (0 when available now)."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        amount = min(amount, self.capacity)
+        wait = max(0.0, (amount - self._tokens) / self.rate)
+        return max(wait, self._paused_until - now)
+
+    def take(self, amount: float = 1.0) -> None:
+        self._tokens -= min(amount, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out nothing for `seconds` (e.g. the provider's Retry-After)."""
+        self._tokens = min(self._tokens, 0.0)
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimiter:
+    """Request and token budgets per minute; None disables a budget.
+
+    One limiter can be shared by any number of event loops (each
+    generate_all call runs its own) and threads: budgets are checked and
+    taken under a thread lock, and waiting happens outside it.
+
+    burst: fraction of a minute's budget that may be spent at once
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = GROQ_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: Optional[float] = GROQ_TOKENS_PER_MINUTE,
+                 burst: float = 1 / 6, clock: Callable[[], float] = time.monotonic):
+        self.buckets: List[TokenBucket] = []
+        self.requests = self.tokens = None
+        if requests_per_minute:
+            self.requests = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute * burst), clock)
+            self.buckets.append(self.requests)
+        if tokens_per_minute:
+            self.tokens = TokenBucket(tokens_per_minute / 60, max(1.0, tokens_per_minute * burst), clock)
+            self.buckets.append(self.tokens)
+        self._lock = threading.Lock()
+
+    def delay(self, tokens: float = 0.0) -> float:
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.delay(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.delay(tokens))
+        return max(waits)
+
+    async def acquire(self, tokens: float = 0.0) -> None:
+        """Wait until one request of `tokens` fits both budgets, then take it."""
+        while True:
+            wait = self._try_take(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def wait(self, tokens: float = 0.0) -> None:
+        """Blocking acquire() for callers outside an event loop (e.g. streaming)."""
+        while True:
+            wait = self._try_take(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _try_take(self, tokens: float) -> float:
+        """Take one request of `tokens` if it fits now (returns 0), else the seconds to wait."""
+        if not self.buckets:
+            return 0.0
+        with self._lock:
+            wait = self.delay(tokens)
+            if wait <= 0:
+                if self.requests is not None:
+                    self.requests.take(1)
+                if self.tokens is not None:
+                    self.tokens.take(tokens)
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            for bucket in self.buckets:
+                bucket.pause(seconds)
+
+
+def _status(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a provider error (groq/openai/httpx style), if any."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:  # an HTTP date; fall back to our own backoff
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = _status(exc)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY,
+                  rng: Optional[random.Random] = None) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
+
+
+class _GaveUp(Exception):
+    def __init__(self, error: Exception, attempts: int):
+        super().__init__(str(error))
+        self.error = error
+        self.attempts = attempts
+
+
+async def _with_retries(call: Callable[[], Awaitable[Any]], tokens: int, limiter: RateLimiter,
+                        retries: int, base_delay: float, max_delay: float, rng: random.Random,
+                        stats: Dict[str, int]) -> Tuple[Any, int]:
+    """(result, attempts) of one rate-limited call, retried on 429/5xx; raises _GaveUp."""
+    attempt = 0
+    while True:
+        await limiter.acquire(tokens)
+        stats["requests"] = stats.get("requests", 0) + 1
+        try:
+            return await call(), attempt + 1
+        except Exception as e:
+            if attempt < retries and is_retryable(e):
+                delay = _retry_after(e)
+                if delay is not None:
+                    limiter.pause(delay)
+                else:
+                    delay = backoff_delay(attempt, base_delay, max_delay, rng)
+                attempt += 1
+                stats["retries"] = stats.get("retries", 0) + 1
+                await asyncio.sleep(delay)
+                continue
+            raise _GaveUp(e, attempt + 1)
+
+
+def _result(index: int, fn: Dict[str, Any], style: Optional[str], llm_content: Optional[Dict[str, Any]],
+            error: Optional[Exception], attempts: int, cached: bool = False,
+            prompt_tokens: int = 0) -> Dict[str, Any]:
+    return {"index": index, "fn": fn, "content": llm_content,
+            "docstring": render_docstring(fn, llm_content, style) if error is None and style else None,
+            "error": f"{type(error).__name__}: {error}" if error is not None else None,
+            "attempts": attempts, "cached": cached, "prompt_tokens": prompt_tokens, "shared_with": None}
+
+
+async def generate_docstrings(fns: Iterable[Dict[str, Any]], style: Optional[str] = "google",
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                              limiter: Optional[RateLimiter] = None,
+                              content: Optional[ContentFn] = None,
+                              retries: int = MAX_RETRIES, base_delay: float = BASE_DELAY,
+                              max_delay: float = MAX_DELAY,
+                              seed: Optional[int] = None,
+                              pack_budget: Optional[int] = None, max_pack: int = MAX_PACK,
+                              complete: Optional[CompleteFn] = None,
+                              stats: Optional[Dict[str, int]] = None,
+                              cache: Optional[ContentCache] = None,
+                              model: str = DEFAULT_MODEL,
+                              temperature: float = DEFAULT_TEMPERATURE,
+                              backend: Optional[LLMBackend] = None,
+                              source_budget: int = SOURCE_TOKEN_BUDGET,
+                              dedup: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """Generate docstrings for `fns`, yielding each result as it completes.
+
+    Each result is {"index", "fn", "content", "docstring", "error", "attempts",
+    "cached", "prompt_tokens", "shared_with"}; "index" is the function's
+    position in `fns`, "error" is None on success and "prompt_tokens"
+    estimates the prompt(s) sent for it (shared by the members of a packed
+    request). "shared_with" is the index of the duplicate whose content was
+    adapted, for results yielded right after that duplicate's. With style=None only the content stage runs ("docstring" is
+    None); render later with generator.render_docstrings.
+
+    limiter: shared RateLimiter (default: a new one at the Groq limits)
+    content: async fn -> LLM content dict (default: the single-function prompt)
+    retries: retries per request after a 429/5xx
+    pack_budget: send several functions per request, each request's prompt
+        and replies within this many tokens (see packing); results of one
+        request arrive together and "attempts" counts that request's tries
+    complete: async prompt -> reply text used in packed mode (default: acomplete, or the backend's)
+    stats: filled with "requests", "retries", "cached", "deduplicated" and "prompt_tokens"
+    cache: ContentCache; cached functions are yielded first without a
+        request, and new content is stored under (model, temperature), with
+        packed keys (see content_key) when pack_budget is set
+    backend: LLMBackend serving the default content/complete functions; its
+        name and temperature replace `model` and `temperature`
+    source_budget: tokens of each function's source (fn["source"], see
+        source_context.with_sources) in the single-function prompt; part of
+        the cache key
+    dedup: request content once per fingerprint (see dedup)
+    """
+    if style is not None and style not in STYLES:
+        raise ValueError(f"Unknown style: {style}")
+    fns = list(fns)
+    limiter = limiter if limiter is not None else RateLimiter()
+    stats = stats if stats is not None else {}
+    rng = random.Random(seed)
+    done: asyncio.Queue = asyncio.Queue()
+    if backend is not None:
+        model, temperature = backend.name, backend.temperature
+        send = backend.acomplete
+    else:
+        def send(prompt: str) -> Awaitable[str]:
+            return acomplete(prompt, model, temperature)
+
+    keys: List[str] = []
+    todo = list(range(len(fns)))
+    if cache is not None:
+        keys = [content_key(fn, model, temperature, source_budget=source_budget, packed=bool(pack_budget))
+                for fn in fns]
+        cached = cache.get_many(keys)
+        todo = [i for i in todo if keys[i] not in cached]
+        stats["cached"] = stats.get("cached", 0) + len(fns) - len(todo)
+        for i, key in enumerate(keys):
+            if key in cached:
+                yield _result(i, fns[i], style, cached[key], None, 0, cached=True)
+
+    copies: Dict[int, List[int]] = {}
+    if dedup:
+        groups = group_duplicates([fns[i] for i in todo])
+        copies = {todo[g[0]]: [todo[k] for k in g[1:]] for g in groups if len(g) > 1}
+        if len(groups) < len(todo):
+            stats["deduplicated"] = stats.get("deduplicated", 0) + len(todo) - len(groups)
+        todo = [todo[g[0]] for g in groups]
+
+    def store(indices: List[int], contents: List[Optional[Dict[str, Any]]]) -> None:
+        if cache is not None:
+            cache.put_many({keys[i]: c for i, c in zip(indices, contents)}, model)
+
+    async def retrying(call: Callable[[], Awaitable[Any]], tokens: int) -> Tuple[Any, int]:
+        return await _with_retries(call, tokens, limiter, retries, base_delay, max_delay, rng, stats)
+
+    if pack_budget:
+        complete = complete or send
+        groups = iter([[todo[k] for k in group] for group in pack([fns[i] for i in todo], pack_budget, max_pack)])
+
+        async def worker() -> None:
+            for group in groups:
+                tries = [0]
+                sent = [0]
+
+                async def request(prompt: str, reply_tokens: int) -> str:
+                    tokens = estimate_tokens(prompt)
+                    sent[0] += tokens
+                    stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + tokens
+                    text, attempts = await retrying(lambda: complete(prompt), tokens + reply_tokens)
+                    tries[0] = max(tries[0], attempts)
+                    return text
+
+                members = [fns[i] for i in group]
+                try:
+                    contents = await generate_group(members, request, stats)
+                    store(group, contents)
+                    results = [_result(i, fns[i], style, llm_content, None, tries[0], prompt_tokens=sent[0])
+                               for i, llm_content in zip(group, contents)]
+                except _GaveUp as e:
+                    results = [_result(i, fns[i], style, None, e.error, e.attempts, prompt_tokens=sent[0])
+                               for i in group]
+                except Exception as e:
+                    # a cache write, a bad reply...: fail this group, but always report it
+                    results = [_result(i, fns[i], style, None, e, tries[0], prompt_tokens=sent[0]) for i in group]
+                for result in results:
+                    await done.put(result)
+    else:
+        async def send_one(fn: Dict[str, Any]) -> Dict[str, Any]:
+            return parse_content(await send(build_prompt(fn, source_budget)), fn)
+
+        content = content or send_one
+        pending = iter(todo)
+
+        async def worker() -> None:
+            for index in pending:
+                fn = fns[index]
+                prompt_tokens = attempts = 0
+                try:
+                    prompt_tokens = estimate_tokens(build_prompt(fn, source_budget))
+                    stats["prompt_tokens"] = stats.get("prompt_tokens", 0) + prompt_tokens
+                    llm_content, attempts = await retrying(lambda: content(fn), prompt_tokens + COMPLETION_TOKENS)
+                    store([index], [llm_content])
+                    result = _result(index, fn, style, llm_content, None, attempts, prompt_tokens=prompt_tokens)
+                except _GaveUp as e:
+                    result = _result(index, fn, style, None, e.error, e.attempts, prompt_tokens=prompt_tokens)
+                except Exception as e:
+                    # a cache write, a bad reply...: fail this function, but always report it
+                    result = _result(index, fn, style, None, e, attempts, prompt_tokens=prompt_tokens)
+                await done.put(result)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(max_concurrency, len(todo)))]
+    try:
+        for _ in range(len(todo)):
+            result = await done.get()
+            yield result
+            for i in copies.get(result["index"], ()):
+                llm_content, docstring, error = None, None, result["error"]
+                try:
+                    if result["content"] is not None and result["content"].get("fallback"):
+                        # a placeholder is not worth sharing: the copy gets its own
+                        llm_content = parse_content("", fns[i])
+                    elif result["content"] is not None:
+                        llm_content = adapt_content(result["content"], result["fn"], fns[i])
+                        store([i], [llm_content])
+                    if result["docstring"]:
+                        docstring = render_docstring(fns[i], llm_content, style)
+                except Exception as e:
+                    llm_content, docstring, error = None, None, f"{type(e).__name__}: {e}"
+                yield dict(result, index=i, fn=fns[i], content=llm_content, prompt_tokens=0,
+                           docstring=docstring, error=error, shared_with=result["index"])
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def generate_all(fns: Iterable[Dict[str, Any]], style: Optional[str] = "google",
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 **kwargs: Any) -> List[Dict[str, Any]]:
+    """Blocking generate_docstrings: every result, in input order.
+
+    on_result: called with each result as it completes (progress reporting)
+    """
+    async def collect() -> List[Dict[str, Any]]:
+        results = []
+        async for result in generate_docstrings(fns, style, **kwargs):
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+        return results
+
+    return sorted(asyncio.run(collect()), key=lambda r: r["index"])
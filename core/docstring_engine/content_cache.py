@@ -0,0 +1,232 @@
+# core/docstring_engine/content_cache.py
+"""Persistent cache of LLM docstring content.
+
+Entries are keyed by content_key(): a hash of the function's signature
+(name, arguments, annotations, defaults, return annotation, raises), its
+body hash from the parser, the model name, the temperature, the prompt
+version, the source budget of the prompt and its shape (the
+single-function prompt or a packed one, see packing). An unchanged
+function is therefore served from the cache on every later scan or rerun,
+while editing it, switching models or changing the prompt (or how much
+source it carries) makes a new key.
+
+Content is stored as JSON in a SQLite database under storage/cache/.
+Entries older than `ttl` seconds are misses (and are deleted). Once the
+stored content exceeds `max_bytes`, the least recently used entries are
+evicted.
+
+    python -m core.docstring_engine.content_cache --stats
+    python -m core.docstring_engine.content_cache --purge [--expired]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.docstring_engine.llm_integration import DEFAULT_MODEL, DEFAULT_TEMPERATURE, PROMPT_VERSION
+from core.docstring_engine.source_context import PACKED_SOURCE_TOKENS, SOURCE_TOKEN_BUDGET
+
+DEFAULT_CACHE_PATH = "storage/cache/llm_content.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 30 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_content (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    created INTEGER NOT NULL,
+    last_access INTEGER NOT NULL
+)
+"""
+
+
+def content_key(fn: Dict[str, Any], model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+                prompt_version: str = PROMPT_VERSION, source_budget: int = SOURCE_TOKEN_BUDGET,
+                packed: bool = False) -> str:
+    """Cache key of the LLM content for `fn` (a parse_file function or method dict).
+
+    packed: content from packed requests, whose prompts carry at most
+    PACKED_SOURCE_TOKENS of source whatever `source_budget` says
+    """
+    signature = [
+        fn.get("name"),
+        [[a.get("name"), a.get("annotation")] for a in fn.get("args", [])],
+        list(fn.get("defaults") or []),
+        fn.get("returns"),
+        sorted(fn.get("raises") or []),
+    ]
+    if packed:
+        source_budget = min(source_budget, PACKED_SOURCE_TOKENS)
+    payload = json.dumps([signature, fn.get("body_hash"), model, float(temperature), prompt_version,
+                          source_budget, "packed" if packed else "single"])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ContentCache:
+    """SQLite-backed LLM content cache with TTL and LRU eviction by total size."""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = DEFAULT_TTL):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # shared by Streamlit sessions and the batch generator's callers
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_content_lru ON llm_content(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM llm_content").fetchone()[0]
+
+    def _cutoff(self) -> Optional[int]:
+        return time.time_ns() - int(self.ttl * 1e9) if self.ttl is not None else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached content for `key`, or None if missing or expired."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached content for every key that has a live entry."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Dict[str, Any]] = {}
+        cutoff = self._cutoff()
+        now = time.time_ns()
+        with self._lock:
+            stale = []
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, content, created FROM llm_content WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, content, created in rows:
+                    if cutoff is not None and created < cutoff:
+                        stale.append(key)
+                    else:
+                        found[key] = json.loads(content)
+            if stale:
+                self.expired += len(stale)
+                self._delete(stale)
+            if found:
+                self._conn.executemany("UPDATE llm_content SET last_access = ? WHERE key = ?",
+                                       [(now, k) for k in found])
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, content: Dict[str, Any], model: str = DEFAULT_MODEL) -> None:
+        self.put_many({key: content}, model)
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]], model: str = DEFAULT_MODEL) -> None:
+        """Store content by key; placeholder content from a failed parse is not stored."""
+        now = time.time_ns()
+        rows = []
+        for key, content in entries.items():
+            if content is None or content.get("fallback"):
+                continue
+            payload = json.dumps(content, separators=(",", ":"))
+            rows.append((key, model, payload, len(payload), now, now))
+        if not rows:
+            return
+        with self._lock:
+            for key, *_ in rows:
+                old = self._conn.execute("SELECT nbytes FROM llm_content WHERE key = ?", (key,)).fetchone()
+                if old:
+                    self._total_bytes -= old[0]
+            self._conn.executemany("INSERT OR REPLACE INTO llm_content VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._total_bytes += sum(r[3] for r in rows)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _delete(self, keys: List[str]) -> None:
+        """Caller holds the lock."""
+        for key in keys:
+            row = self._conn.execute("SELECT nbytes FROM llm_content WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM llm_content WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under max_bytes. Caller holds the lock."""
+        rows = self._conn.execute("SELECT key, nbytes FROM llm_content ORDER BY last_access").fetchall()
+        for key, nbytes in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_content WHERE key = ?", (key,))
+            self._total_bytes -= nbytes
+            self.evictions += 1
+
+    def purge(self, expired_only: bool = False) -> int:
+        """Delete expired entries (or every entry); returns how many were removed."""
+        with self._lock:
+            if expired_only:
+                cutoff = self._cutoff()
+                if cutoff is None:
+                    return 0
+                cur = self._conn.execute("DELETE FROM llm_content WHERE created < ?", (cutoff,))
+            else:
+                cur = self._conn.execute("DELETE FROM llm_content")
+            self._conn.commit()
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM llm_content").fetchone()[0]
+            return cur.rowcount
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._delete([key])
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_content").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "expired": self.expired,
+                "entries": entries, "bytes": self._total_bytes}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect or purge the LLM docstring content cache.")
+    ap.add_argument("--db", default=DEFAULT_CACHE_PATH)
+    action = ap.add_mutually_exclusive_group(required=True)
+    action.add_argument("--stats", action="store_true", help="print entry count and size")
+    action.add_argument("--purge", action="store_true", help="delete cached content")
+    ap.add_argument("--expired", action="store_true", help="with --purge, delete only entries past the TTL")
+    ap.add_argument("--ttl", type=float, default=DEFAULT_TTL, help="TTL in seconds used by --expired")
+    args = ap.parse_args(argv)
+
+    cache = ContentCache(args.db, ttl=args.ttl)
+    try:
+        if args.purge:
+            print(f"purged {cache.purge(expired_only=args.expired)} entries from {args.db}")
+        else:
+            stats = cache.stats()
+            print(f"{args.db}: {stats['entries']} entries, {stats['bytes']} bytes")
+    finally:
+        cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
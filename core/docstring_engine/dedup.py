@@ -0,0 +1,68 @@
+# core/docstring_engine/dedup.py
+"""One LLM call per group of duplicate functions.
+
+The parser gives every undocumented function a normalized AST fingerprint
+(see core.parser.fingerprint): copy-pasted helpers, generated adapters and
+the same overload in sibling modules share one even when their layout,
+comments or local and argument names differ. Functions are grouped by it
+(group_duplicates), content is generated for the first function of each
+group only, and adapt_content() carries it over to every other member,
+renaming arguments by position (and the function name where the text
+mentions it).
+"""
+import re
+from typing import Any, Dict, Iterable
+
+# bare (unquoted) mentions are only rewritten for names at least this long:
+# a rename of `x` must not touch every standalone "x" in the prose
+MIN_BARE_NAME = 3
+
+
+def _renames(source: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, str]:
+    renames = {}
+    for a, b in zip(source.get("args", []), target.get("args", [])):
+        if a["name"] != b["name"]:
+            renames[a["name"]] = b["name"]
+    if source.get("name") and target.get("name") and source["name"] != target["name"]:
+        renames[source["name"]] = target["name"]
+    return renames
+
+
+def adapt_content(content: Dict[str, Any], source: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """`content` generated for `source`, rewritten for its duplicate `target`.
+
+    Argument descriptions move to the target's argument at the same
+    position. In any description, the source's argument or function names
+    are replaced where they are backticked or quoted, and as whole words
+    when at least MIN_BARE_NAME characters long.
+    """
+    renames = _renames(source, target)
+    if not renames:
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in content.items()}
+
+    def alternation(names: Iterable[str]) -> str:
+        return "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+
+    regex = r"(?P<quote>[`'\"])(?P<quoted>" + alternation(renames) + r")(?P=quote)"
+    bare = [n for n in renames if len(n) >= MIN_BARE_NAME]
+    if bare:
+        regex += r"|\b(?P<bare>" + alternation(bare) + r")\b"
+    pattern = re.compile(regex)
+
+    def replace(m: "re.Match[str]") -> str:
+        if m.group("quoted"):
+            return m.group("quote") + renames[m.group("quoted")] + m.group("quote")
+        return renames[m.group("bare")]
+
+    def sub(text: Any) -> Any:
+        return pattern.sub(replace, text) if isinstance(text, str) else text
+
+    adapted = {}
+    for key, value in content.items():
+        if key == "args" and isinstance(value, dict):
+            adapted[key] = {renames.get(name, name): sub(desc) for name, desc in value.items()}
+        elif isinstance(value, dict):
+            adapted[key] = {name: sub(desc) for name, desc in value.items()}
+        else:
+            adapted[key] = sub(value)
+    return adapted
@@ -102,6 +102,8 @@ Generates style-consistent docstrings using:
 from typing import Dict, List, Optional
 from core.docstring_engine.llm_integration import generate_docstring_content
 
+STYLES = ("google", "numpy", "rest")
+
 
 # -------------------------------------------------
 # Helpers
@@ -224,24 +226,43 @@ def generate_rest_docstring(fn: Dict, llm: Dict) -> str:
 # -------------------------------------------------
 # Main entry
 # -------------------------------------------------
-def generate_docstring(fn: Dict, style: str = "google") -> str:
-    """
-    Generate docstring using:
-    - LLM for meaning
-    - Code for formatting
-    """
+_RENDERERS = {
+    "google": generate_google_docstring,
+    "numpy": generate_numpy_docstring,
+    "rest": generate_rest_docstring,
+}
+
+
+def _renderer(style: str):
+    try:
+        return _RENDERERS[style]
+    except KeyError:
+        raise ValueError(f"Unknown style: {style}") from None
+
 
-    llm_content = generate_docstring_content(fn)
+def render_docstring(fn: Dict, llm_content: Dict, style: str = "google") -> str:
+    """Format LLM content for `fn` in the given style (no LLM call)."""
+    return _renderer(style)(fn, llm_content)
 
-    if style == "google":
-        return generate_google_docstring(fn, llm_content)
-    elif style == "numpy":
-        return generate_numpy_docstring(fn, llm_content)
-    elif style == "rest":
-        return generate_rest_docstring(fn, llm_content)
-    else:
-        raise ValueError(f"Unknown style: {style}")
 
+def render_docstrings(fns: List[Dict], contents: List[Dict], style: str = "google") -> List[str]:
+    """Bulk render stage: one docstring per (fn, content) pair, all in `style`.
 
+    Pure formatting, so switching styles re-renders without any LLM call.
+    """
+    render = _renderer(style)
+    return [render(fn, content) for fn, content in zip(fns, contents)]
+
+
+def generate_docstring(fn: Dict, style: str = "google", cache=None, backend=None) -> str:
+    """
+    Generate docstring using:
+    - LLM for meaning (content stage, served from `cache`, a ContentCache, when possible;
+      `backend` selects the model, see backends)
+    - Code for formatting (render stage)
+    """
 
+    render = _renderer(style)
+    llm_content = generate_docstring_content(fn, cache=cache, backend=backend)
 
+    return render(fn, llm_content)
@@ -5,44 +5,158 @@ Responsibilities:
 - Generate semantic docstring content ONLY
 - Return structured JSON
 - Never format docstrings
+
+Chat clients are built once per (model, temperature, API key) by a
+process-wide ClientManager and shared by every thread and Streamlit
+session. All of them send through one httpx.Client whose bounded pool
+keeps connections to the provider alive between calls.
 """
 
+import hashlib
 import os
 import json
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage
+import threading
+from typing import Any, Dict, Optional, Tuple
 
-load_dotenv()
+# estimate_tokens is re-exported for the prompt packer and streaming
+from core.docstring_engine.source_context import SOURCE_TOKEN_BUDGET, estimate_tokens, source_excerpt  # noqa: F401
 
+try:
+    from dotenv import load_dotenv
+except ImportError:  # python-dotenv is optional; GROQ_API_KEY may come from the environment
+    load_dotenv = None
 
-def generate_docstring_content(fn: dict) -> dict:
-    """
-    Generate structured docstring content using LLM.
+if load_dotenv is not None:
+    load_dotenv()
 
-    Returns dict:
-    {
-        "summary": str,
-        "args": {arg_name: description},
-        "returns": str,
-        "raises": {ExceptionName: description}
-    }
+DEFAULT_MODEL = "llama-3.1-8b-instant"  # openai/gpt-oss-120b, llama-3.1-8b-instant
+DEFAULT_TEMPERATURE = 0.3
+
+# bump whenever the prompts or RULES change, so cached content is regenerated
+PROMPT_VERSION = "2"
+
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 30.0
+
+
+class ClientManager:
+    """Thread-safe cache of chat clients sharing one bounded HTTP connection pool.
+
+    max_connections: open connections allowed at once across all clients
+    max_keepalive: idle connections kept alive for reuse
+    keepalive_expiry: seconds an idle connection is kept
     """
 
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise RuntimeError("GROQ_API_KEY not set")
+    def __init__(self, max_connections: int = MAX_CONNECTIONS,
+                 max_keepalive: int = MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = KEEPALIVE_EXPIRY):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, float, str, Optional[str]], Any] = {}
+        self._http = None
+        self.created = 0
+        self.reused = 0
+
+    def http_client(self):
+        """The shared httpx.Client (built on first use), or None without httpx."""
+        with self._lock:
+            return self._http_client()
+
+    def _http_client(self):
+        if self._http is None:
+            try:
+                import httpx
+            except ImportError:
+                return None
+            self._http = httpx.Client(limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ))
+        return self._http
+
+    def get(self, model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+            api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """The ChatGroq client for these settings, built on first request.
+
+        api_key defaults to GROQ_API_KEY; base_url overrides the provider
+        endpoint (a proxy or a local stub server).
+        """
+        api_key = api_key or os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise RuntimeError("GROQ_API_KEY not set")
+        # the key is stored hashed so it never appears in the cache's keys
+        key = (model, float(temperature), hashlib.sha256(api_key.encode()).hexdigest(), base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                return client
+            from langchain_groq import ChatGroq
+
+            kwargs: Dict[str, Any] = {"model": model, "temperature": temperature, "api_key": api_key}
+            if base_url is not None:
+                kwargs["base_url"] = base_url
+            http = self._http_client()
+            if http is not None:
+                kwargs["http_client"] = http
+            client = ChatGroq(**kwargs)
+            self._clients[key] = client
+            self.created += 1
+            return client
+
+    def close(self) -> None:
+        """Drop every client and close the pooled connections."""
+        with self._lock:
+            self._clients.clear()
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"clients": len(self._clients), "created": self.created, "reused": self.reused}
+
+
+_manager = ClientManager()
+
+
+def client_manager() -> ClientManager:
+    """The process-wide ClientManager."""
+    return _manager
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE,
+            api_key: Optional[str] = None):
+    """Shared chat client for (model, temperature, api_key)."""
+    return _manager.get(model, temperature, api_key)
+
+
+RULES = """Rules:
+- The summary MUST be written in imperative mood
+- Start with the base verb (e.g., Add, Calculate, Normalize, Convert, Fetch, Validate)
+- Do NOT use third-person verbs (no Adds, Calculates, Returns)
+- If the summary violates this rule, rewrite it internally before responding
+- Include "raises" ONLY if exceptions actually occur
+- If no exceptions occur, return "raises": {}
+- Do NOT invent exceptions
+- Do NOT include markdown
+- Do NOT include triple quotes
+- JSON must be strictly valid
+- Be concise and professional
+"""
 
-    llm = ChatGroq(
-        model="llama-3.1-8b-instant", # openai/gpt-oss-120b, llama-3.1-8b-instant
-        temperature=0.3,
-        api_key=api_key
-    )
 
+def build_prompt(fn: dict, source_budget: int = SOURCE_TOKEN_BUDGET) -> str:
+    """The single-function prompt sent for `fn`, with up to `source_budget` tokens of its source."""
     arg_names = [a["name"] for a in fn.get("args", [])]
     raises = fn.get("raises", [])
+    excerpt = source_excerpt(fn, source_budget)
+    source = f"Source:\n{excerpt}\n" if excerpt else ""
 
-    prompt = f"""
+    return f"""
 Return ONLY valid JSON in this exact format:
 
 {{
@@ -56,40 +170,88 @@ Return ONLY valid JSON in this exact format:
   }}
 }}
 
-Rules:
-- The summary MUST be written in imperative mood
-- Start with the base verb (e.g., Add, Calculate, Normalize, Convert, Fetch, Validate)
-- Do NOT use third-person verbs (no Adds, Calculates, Returns)
-- If the summary violates this rule, rewrite it internally before responding
-- Include "raises" ONLY if exceptions actually occur
-- If no exceptions occur, return "raises": {{}}
-- Do NOT invent exceptions
-- Do NOT include markdown
-- Do NOT include triple quotes
-- JSON must be strictly valid
-- Be concise and professional
-
+{RULES}
 
 Function name: {fn["name"]}
 Arguments: {arg_names}
 Return type: {fn.get("returns")}
 Known raises: {raises}
-"""
+{source}"""
 
-    response = llm.invoke([HumanMessage(content=prompt)])
 
+def parse_content(text: str, fn: dict) -> dict:
+    """Decode the model's JSON reply, falling back to placeholders (marked "fallback")."""
     try:
-        return json.loads(response.content)
+        return json.loads(text)
     except json.JSONDecodeError:
         # 🔒 Safe fallback (single place only)
         return {
             "summary": f"Short description of `{fn['name']}`.",
-            "args": {a: "DESCRIPTION" for a in arg_names},
+            "args": {a["name"]: "DESCRIPTION" for a in fn.get("args", [])},
             "returns": "DESCRIPTION",
-            "raises": {}
+            "raises": {},
+            "fallback": True
         }
 
 
+def complete(prompt: str, model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE) -> str:
+    """Send one prompt and return the reply text."""
+    llm = get_llm(model, temperature)
+
+    from langchain_core.messages import HumanMessage
+
+    return llm.invoke([HumanMessage(content=prompt)]).content
+
+
+async def acomplete(prompt: str, model: str = DEFAULT_MODEL, temperature: float = DEFAULT_TEMPERATURE) -> str:
+    """Async complete()."""
+    llm = get_llm(model, temperature)
+
+    from langchain_core.messages import HumanMessage
+
+    response = await llm.ainvoke([HumanMessage(content=prompt)])
+    return response.content
+
+
+def generate_docstring_content(fn: dict, model: str = DEFAULT_MODEL,
+                               temperature: float = DEFAULT_TEMPERATURE, cache=None, backend=None) -> dict:
+    """
+    Generate structured docstring content using LLM.
+
+    With a ContentCache, content cached for an unchanged function is
+    returned without calling the LLM. `backend` (see backends) replaces
+    the default Groq client; its name and temperature then key the cache.
+
+    Returns dict:
+    {
+        "summary": str,
+        "args": {arg_name: description},
+        "returns": str,
+        "raises": {ExceptionName: description}
+    }
+    """
+
+    if backend is not None:
+        model, temperature = backend.name, backend.temperature
+        send = backend.complete
+    else:
+        def send(prompt: str) -> str:
+            return complete(prompt, model, temperature)
+
+    if cache is not None:
+        from core.docstring_engine.content_cache import content_key
+
+        key = content_key(fn, model, temperature)
+        content = cache.get(key)
+        if content is None:
+            content = parse_content(send(build_prompt(fn)), fn)
+            cache.put(key, content, model)
+        return content
 
+    return parse_content(send(build_prompt(fn)), fn)
 
 
+async def agenerate_docstring_content(fn: dict, model: str = DEFAULT_MODEL,
+                                      temperature: float = DEFAULT_TEMPERATURE) -> dict:
+    """Async generate_docstring_content (same prompt, same fallback)."""
+    return parse_content(await acomplete(build_prompt(fn), model, temperature), fn)
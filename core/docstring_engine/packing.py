@@ -0,0 +1,190 @@
+# core/docstring_engine/packing.py
+"""Several functions per LLM request.
+
+The single-function prompt repeats the whole instruction block for every
+function, so most of its tokens are rules. Here pack() groups functions
+under a token budget, build_packed_prompt() sends the rules once followed
+by one entry per function tagged with an id ("f0", "f1", ...) - a line
+with its signature, then a short excerpt of its source - and the model
+answers with a JSON array of objects carrying those ids.
+
+parse_packed() salvages every well-formed object from a partly broken
+reply. generate_group() re-requests only the items that came back missing
+or malformed. If nothing at all could be read, the group is split in half
+so that one troublesome function cannot keep failing the others. A single
+function that fails is sent with the ordinary single-function prompt,
+whose parser always yields content.
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+from core.docstring_engine.llm_integration import RULES, build_prompt, estimate_tokens, parse_content
+from core.docstring_engine.source_context import PACKED_SOURCE_TOKENS, source_excerpt
+
+PACK_TOKEN_BUDGET = 3000
+MAX_PACK = 20
+REPLY_TOKENS_PER_FUNCTION = 120
+
+_HEADER = """Return ONLY a valid JSON array with one object per function listed below, in this exact format:
+
+[
+  {
+    "id": "function id, e.g. f0",
+    "summary": "1–2 line description of what the function does",
+    "args": {"arg_name": "description"},
+    "returns": "description of the return value",
+    "raises": {"ExceptionName": "reason"}
+  }
+]
+
+"""
+
+RequestFn = Callable[[str, int], Awaitable[str]]
+
+
+def describe(fid: str, fn: Dict[str, Any]) -> str:
+    """One prompt line for `fn`, followed by its source (indented, PACKED_SOURCE_TOKENS at most) if known."""
+    arg_names = [a["name"] for a in fn.get("args", [])]
+    line = (f"[{fid}] Function name: {fn['name']}; Arguments: {arg_names}; "
+            f"Return type: {fn.get('returns')}; Known raises: {fn.get('raises', [])}")
+    excerpt = source_excerpt(fn, PACKED_SOURCE_TOKENS)
+    if excerpt:
+        line += "\n" + "\n".join("    " + s for s in excerpt.splitlines())
+    return line
+
+
+def build_packed_prompt(fns: Sequence[Dict[str, Any]]) -> str:
+    """Rules once, then one tagged entry per function (ids f0, f1, ... in order)."""
+    lines = [describe(f"f{i}", fn) for i, fn in enumerate(fns)]
+    return _HEADER + RULES + "- Answer every function id exactly once\n\n\nFunctions:\n" + "\n".join(lines) + "\n"
+
+
+_OVERHEAD_TOKENS = estimate_tokens(build_packed_prompt([]))
+
+
+def pack(fns: Sequence[Dict[str, Any]], budget: int = PACK_TOKEN_BUDGET,
+         max_items: int = MAX_PACK) -> List[List[int]]:
+    """Greedy groups of indices into `fns` whose prompt plus replies fit `budget` tokens."""
+    groups: List[List[int]] = []
+    current: List[int] = []
+    used = _OVERHEAD_TOKENS
+    for i, fn in enumerate(fns):
+        cost = estimate_tokens(describe(f"f{len(current)}", fn)) + REPLY_TOKENS_PER_FUNCTION
+        if current and (used + cost > budget or len(current) >= max_items):
+            groups.append(current)
+            current, used = [], _OVERHEAD_TOKENS
+        current.append(i)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _items(text: str) -> Iterable[Any]:
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return [data]
+    # broken reply (truncated, fenced, a bad comma...): keep every object that decodes
+    decoder = json.JSONDecoder()
+    found = []
+    pos = text.find("{")
+    while pos >= 0:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            pos = text.find("{", pos + 1)
+            continue
+        if isinstance(obj, dict) and "id" in obj:
+            found.append(obj)
+            pos = text.find("{", end)
+        else:
+            pos = text.find("{", pos + 1)
+    return found
+
+
+def parse_packed(text: str, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Content of every well-formed item in a packed reply, by id.
+
+    An item counts when it is an object with a known id and a string
+    summary; ids without such an item are left out (they failed).
+    """
+    ids = set(ids)
+    parsed: Dict[str, Dict[str, Any]] = {}
+    for item in _items(text):
+        if not isinstance(item, dict):
+            continue
+        fid = str(item.get("id"))
+        if fid not in ids or fid in parsed or not isinstance(item.get("summary"), str):
+            continue
+        args, raises = item.get("args"), item.get("raises")
+        parsed[fid] = {
+            "summary": item["summary"],
+            "args": args if isinstance(args, dict) else {},
+            "returns": item.get("returns") if isinstance(item.get("returns"), str) else "",
+            "raises": raises if isinstance(raises, dict) else {},
+        }
+    return parsed
+
+
+async def generate_group(fns: Sequence[Dict[str, Any]], request: RequestFn,
+                         stats: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """LLM content for every function of one group, in order.
+
+    request: async (prompt, reply_tokens) -> reply text
+    stats: counters updated in place ("packed_requests", "single_requests", "failed_items")
+    """
+    stats = stats if stats is not None else {}
+    if len(fns) == 1:
+        stats["single_requests"] = stats.get("single_requests", 0) + 1
+        return [parse_content(await request(build_prompt(fns[0]), REPLY_TOKENS_PER_FUNCTION), fns[0])]
+    stats["packed_requests"] = stats.get("packed_requests", 0) + 1
+    text = await request(build_packed_prompt(fns), REPLY_TOKENS_PER_FUNCTION * len(fns))
+    parsed = parse_packed(text, (f"f{i}" for i in range(len(fns))))
+    failed = [i for i in range(len(fns)) if f"f{i}" not in parsed]
+    contents: List[Optional[Dict[str, Any]]] = [parsed.get(f"f{i}") for i in range(len(fns))]
+    if failed:
+        stats["failed_items"] = stats.get("failed_items", 0) + len(failed)
+        if len(failed) == len(fns):
+            half = len(fns) // 2
+            retry_groups = [failed[:half], failed[half:]]
+        else:
+            retry_groups = [failed]
+        for group in retry_groups:
+            for i, content in zip(group, await generate_group([fns[i] for i in group], request, stats)):
+                contents[i] = content
+    return contents
+
+
+def generate_packed(fns: Sequence[Dict[str, Any]], complete: Callable[[str], str],
+                    budget: int = PACK_TOKEN_BUDGET, max_items: int = MAX_PACK,
+                    stats: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """Blocking: content for all `fns` (in order) using packed requests.
+
+    complete: prompt -> reply text (e.g. llm_integration.complete)
+    stats: filled with "functions", "requests" and "prompt_tokens" (estimated)
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("functions", 0)
+    stats.setdefault("requests", 0)
+    stats.setdefault("prompt_tokens", 0)
+
+    async def request(prompt: str, reply_tokens: int) -> str:
+        stats["requests"] += 1
+        stats["prompt_tokens"] += estimate_tokens(prompt)
+        return complete(prompt)
+
+    async def run() -> List[Dict[str, Any]]:
+        contents: List[Dict[str, Any]] = [None] * len(fns)
+        for group in pack(fns, budget, max_items):
+            for i, content in zip(group, await generate_group([fns[i] for i in group], request, stats)):
+                contents[i] = content
+        return contents
+
+    stats["functions"] += len(fns)
+    return asyncio.run(run())
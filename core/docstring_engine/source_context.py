@@ -0,0 +1,191 @@
+# core/docstring_engine/source_context.py
+"""Source context for docstring prompts, within a token budget.
+
+A prompt carrying only the signature leaves the model guessing what the
+function does. source_excerpt() adds the function's own source, compacted
+first (comments, blank lines and any existing docstring removed, long
+string literals shortened) so the budget buys code rather than prose. A
+body still over budget is truncated: the signature is always kept, then
+the return / raise / yield lines, then as many lines from the start and
+the end of the body as fit; each omitted run becomes one marker line.
+
+Token counts are estimated offline (estimate_tokens), not by a tokenizer.
+The parser does not keep source text, and its results (compact models
+included) are read-only: read_sources() collects each function's lines in
+a side map keyed by (path, lineno), and with_sources() gives the functions
+back as new dicts carrying "source" for the prompt builders.
+"""
+import io
+import re
+import textwrap
+import tokenize
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SOURCE_TOKEN_BUDGET = 600
+PACKED_SOURCE_TOKENS = 150
+LONG_LITERAL = 40
+_MARKER_RESERVE = 12
+
+_KEY_LINE = re.compile(r"\s*(return|raise|yield)\b")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough offline token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _edits(source: str) -> List[Tuple[Tuple[int, int], Tuple[int, int], str]]:
+    """(start, end, replacement) for comments, docstrings and long literals."""
+    edits = []
+    at_statement = True
+    pending: List[tokenize.TokenInfo] = []  # strings opening the current statement
+    for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+        if tok.type in (tokenize.COMMENT, tokenize.NL):
+            if tok.type == tokenize.COMMENT:
+                edits.append((tok.start, tok.end, ""))
+            continue
+        if tok.type == tokenize.STRING and at_statement:
+            pending.append(tok)
+            continue
+        if pending:
+            if tok.type in (tokenize.NEWLINE, tokenize.ENDMARKER):
+                # a bare string statement: a docstring or a string used as a comment
+                edits.extend((p.start, p.end, "") for p in pending)
+            else:
+                edits.extend((p.start, p.end, '"..."') for p in pending if len(p.string) > LONG_LITERAL)
+            pending = []
+        if tok.type == tokenize.STRING and len(tok.string) > LONG_LITERAL:
+            edits.append((tok.start, tok.end, '"..."'))
+        at_statement = tok.type in (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT)
+    return edits
+
+
+def compact_source(source: str) -> str:
+    """`source` without comments, docstrings or blank lines, long literals shortened."""
+    source = textwrap.dedent(source)
+    try:
+        edits = _edits(source)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        edits = []
+    lines = source.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    for (srow, scol), (erow, ecol), new in reversed(edits):
+        start, end = offsets[srow - 1] + scol, offsets[erow - 1] + ecol
+        source = source[:start] + new + source[end:]
+    return "\n".join(line.rstrip() for line in source.splitlines() if line.strip())
+
+
+def _signature_end(lines: List[str]) -> int:
+    """Index of the line closing the `def` header."""
+    depth = 0
+    for i, line in enumerate(lines):
+        depth += line.count("(") + line.count("[") - line.count(")") - line.count("]")
+        if depth <= 0 and line.rstrip().endswith(":"):
+            return i
+    return 0
+
+
+def _render(lines: List[str], keep: Iterable[int]) -> str:
+    keep = sorted(keep)
+    out = []
+    prev = -1
+    for i in keep + [len(lines)]:
+        if i - prev > 1:
+            first = lines[prev + 1]
+            indent = first[:len(first) - len(first.lstrip())]
+            out.append(f"{indent}# ... {i - prev - 1} lines omitted")
+        if i < len(lines):
+            out.append(lines[i])
+        prev = i
+    return "\n".join(out)
+
+
+def truncate_source(source: str, budget: int) -> str:
+    """`source` cut to about `budget` tokens, keeping the signature and key lines."""
+    if estimate_tokens(source) <= budget:
+        return source
+    lines = source.splitlines()
+    keep = set(range(_signature_end(lines) + 1))
+    used = sum(estimate_tokens(lines[i]) for i in keep)
+    limit = budget - _MARKER_RESERVE
+
+    body = [i for i in range(len(lines)) if i not in keep]
+    key = [i for i in body if _KEY_LINE.match(lines[i])]
+    # then alternate from the top and the bottom of the body
+    ends = []
+    lo, hi = 0, len(body) - 1
+    while lo <= hi:
+        ends.append(body[lo])
+        if lo != hi:
+            ends.append(body[hi])
+        lo, hi = lo + 1, hi - 1
+
+    for i in key + ends:
+        if i in keep:
+            continue
+        cost = estimate_tokens(lines[i])
+        if used + cost > limit:
+            if i in key:
+                continue
+            break
+        keep.add(i)
+        used += cost
+    text = _render(lines, keep)
+    # markers can still tip it over: drop body lines until it fits
+    extra = sorted(keep - set(range(_signature_end(lines) + 1)), key=lambda i: (i in key, abs(i - len(lines) // 2)))
+    while estimate_tokens(text) > budget and extra:
+        keep.discard(extra.pop(0))
+        text = _render(lines, keep)
+    return text
+
+
+def source_excerpt(fn: Dict[str, Any], budget: int = SOURCE_TOKEN_BUDGET) -> Optional[str]:
+    """Compacted, truncated fn["source"], or None without source or budget."""
+    source = fn.get("source")
+    if not source or budget <= 0:
+        return None
+    return truncate_source(compact_source(source), budget)
+
+
+def read_sources(items: Iterable[Tuple[str, Dict[str, Any]]], context=None) -> Dict[Tuple[str, int], str]:
+    """Source lines of each (path, fn), keyed by (path, fn["lineno"]).
+
+    context: an AnalysisContext to read the file from (otherwise it is read here)
+    """
+    texts: Dict[str, Optional[List[str]]] = {}
+    sources: Dict[Tuple[str, int], str] = {}
+    for path, fn in items:
+        lineno = fn.get("lineno")
+        if not lineno:
+            continue
+        if path not in texts:
+            try:
+                if context is not None:
+                    text = context.get(path).text
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        text = f.read()
+                texts[path] = text.splitlines()
+            except (OSError, UnicodeDecodeError, SyntaxError):
+                texts[path] = None
+        lines = texts[path]
+        if lines is not None:
+            sources[(path, lineno)] = "\n".join(lines[lineno - 1:fn.get("end_lineno") or lineno])
+    return sources
+
+
+def with_sources(items: Iterable[Tuple[str, Dict[str, Any]]], context=None) -> List[Dict[str, Any]]:
+    """Each fn of (path, fn) as a new dict with its "source" (see read_sources).
+
+    The parser's function dicts or models are not modified; a function
+    that already carries "source" or whose file cannot be read is copied as is.
+    """
+    items = list(items)
+    sources = read_sources([(path, fn) for path, fn in items if "source" not in fn], context)
+    out = []
+    for path, fn in items:
+        source = sources.get((path, fn.get("lineno")))
+        out.append(dict(fn.items(), source=source) if source is not None else dict(fn.items()))
+    return out
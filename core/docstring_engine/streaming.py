@@ -0,0 +1,234 @@
+# core/docstring_engine/streaming.py
+"""Streaming docstring generation.
+
+The model's JSON reply is parsed while it arrives (ContentStreamParser), so
+the summary, argument and return descriptions can be shown token by token
+instead of after the whole response. stream_docstring() yields a partial
+rendering after every chunk that changed the content and, once the stream
+ends, the final docstring rendered from the fully parsed reply (the same
+parse_content result and fallback as the blocking path).
+
+Like the batch path, requests are paced by an optional RateLimiter and a
+429/5xx is retried with backoff, as long as no chunk has arrived yet; any
+other error (or one mid-stream) is raised to the caller.
+"""
+import copy
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.docstring_engine.backends import GroqBackend, LLMBackend
+from core.docstring_engine.batch import (
+    BASE_DELAY, COMPLETION_TOKENS, MAX_DELAY, MAX_RETRIES, RateLimiter, _retry_after, backoff_delay, is_retryable,
+)
+from core.docstring_engine.content_cache import content_key
+from core.docstring_engine.generator import _renderer
+from core.docstring_engine.llm_integration import build_prompt, estimate_tokens, parse_content
+from core.docstring_engine.source_context import SOURCE_TOKEN_BUDGET
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _join(chars: List[str]) -> str:
+    # \uXXXX escapes arrive one UTF-16 unit at a time; pair up surrogates
+    text = "".join(chars)
+    try:
+        return text.encode("utf-16", "surrogatepass").decode("utf-16")
+    except UnicodeDecodeError:
+        return text.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+
+class ContentStreamParser:
+    """Incremental parser for a JSON object reply received in chunks.
+
+    `content` holds the object as far as it has arrived: finished values,
+    plus the string currently being received, cut at the last chunk. Text
+    before the opening brace (a markdown fence, a preamble) is skipped and
+    `done` is set once the top-level object closes. Each character is
+    scanned once, so feeding a reply costs O(length) overall.
+    """
+
+    def __init__(self):
+        self.content: Dict[str, Any] = {}
+        self.done = False
+        self._started = False
+        self._stack: List[Any] = []  # open dicts / lists
+        self._keys: List[Optional[str]] = []  # current key of each open container
+        self._expect_key = False
+        self._in_string = False
+        self._is_key = False
+        self._target: Optional[Tuple[Any, Any]] = None  # where the value string goes
+        self._chars: List[str] = []
+        self._flushed = 0  # characters of the open value string already in `content`
+        self._escape: Optional[str] = None  # "" right after a backslash, "u..." inside \uXXXX
+        self._literal: List[str] = []
+
+    def _place(self, value: Any) -> Tuple[Any, Any]:
+        container = self._stack[-1]
+        if isinstance(container, dict):
+            key = self._keys[-1]
+            container[key] = value
+            return container, key
+        container.append(value)
+        return container, len(container) - 1
+
+    def _end_literal(self) -> bool:
+        if not self._literal:
+            return False
+        text = "".join(self._literal)
+        self._literal = []
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            value = None
+        self._place(value)
+        return True
+
+    def _string_char(self, ch: str) -> bool:
+        """Consume one character inside a string; True if it closed the string."""
+        if self._escape is not None:
+            if self._escape == "":
+                if ch == "u":
+                    self._escape = "u"
+                    return False
+                self._chars.append(_ESCAPES.get(ch, ch))
+            else:
+                self._escape += ch
+                if len(self._escape) < 5:
+                    return False
+                try:
+                    self._chars.append(chr(int(self._escape[1:], 16)))
+                except ValueError:
+                    pass
+            self._escape = None
+        elif ch == "\\":
+            self._escape = ""
+        elif ch == '"':
+            self._in_string = False
+            text = _join(self._chars)
+            if self._is_key:
+                self._keys[-1] = text
+                self._expect_key = False
+            else:
+                container, key = self._target
+                container[key] = text
+            return True
+        else:
+            self._chars.append(ch)
+        return False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume the next chunk of reply text; True if `content` changed."""
+        changed = False
+        for ch in chunk:
+            if self.done:
+                break
+            if self._in_string:
+                changed |= self._string_char(ch) and not self._is_key
+                continue
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._stack.append(self.content)
+                    self._keys.append(None)
+                    self._expect_key = True
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._chars = []
+                self._flushed = 0
+                self._is_key = self._expect_key
+                if not self._is_key:
+                    self._target = self._place("")
+                    changed = True
+            elif ch in "{[":
+                value: Any = {} if ch == "{" else []
+                self._place(value)
+                self._stack.append(value)
+                self._keys.append(None)
+                self._expect_key = ch == "{"
+                changed = True
+            elif ch in "}]":
+                changed |= self._end_literal()
+                self._stack.pop()
+                self._keys.pop()
+                self._expect_key = False
+                if not self._stack:
+                    self.done = True
+            elif ch == ",":
+                changed |= self._end_literal()
+                self._expect_key = isinstance(self._stack[-1], dict)
+            elif ch != ":" and not ch.isspace():
+                self._literal.append(ch)
+        if self._in_string and not self._is_key and len(self._chars) > self._flushed:
+            container, key = self._target
+            container[key] = _join(self._chars)
+            self._flushed = len(self._chars)
+            changed = True
+        return changed
+
+
+def _chunks(backend: LLMBackend, prompt: str, limiter: Optional[RateLimiter], retries: int,
+            base_delay: float, max_delay: float) -> Iterator[str]:
+    """backend.stream(prompt), rate-limited and retried on 429/5xx before the first chunk."""
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.wait(estimate_tokens(prompt) + COMPLETION_TOKENS)
+        received = False
+        try:
+            for chunk in backend.stream(prompt):
+                received = True
+                yield chunk
+            return
+        except Exception as e:
+            if received or attempt >= retries or not is_retryable(e):
+                raise
+            delay = _retry_after(e)
+            if delay is not None and limiter is not None:
+                limiter.pause(delay)
+            time.sleep(delay if delay is not None else backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
+
+
+def stream_docstring(fn: Dict[str, Any], style: str = "google", backend: Optional[LLMBackend] = None,
+                     cache=None, source_budget: int = SOURCE_TOKEN_BUDGET, limiter: Optional[RateLimiter] = None,
+                     retries: int = MAX_RETRIES, base_delay: float = BASE_DELAY,
+                     max_delay: float = MAX_DELAY) -> Iterator[Dict[str, Any]]:
+    """Generate the docstring for `fn`, yielding it as the reply streams in.
+
+    Yields {"content", "docstring", "done", "prompt_tokens"}: partial
+    content and its rendering whenever a chunk adds to the summary, args,
+    returns or raises, then one final event ("done": True) with the parsed
+    content. "prompt_tokens" estimates the prompt sent (0 when cached).
+    With a ContentCache, cached content is yielded at once and new content
+    is stored. backend: defaults to GroqBackend(). limiter: shared
+    RateLimiter (none by default); retries: retries of a 429/5xx failing
+    the request before any output. Raises the backend's error otherwise.
+    """
+    render = _renderer(style)
+    backend = backend if backend is not None else GroqBackend()
+
+    key = None
+    if cache is not None:
+        key = content_key(fn, backend.name, backend.temperature, source_budget=source_budget)
+        content = cache.get(key)
+        if content is not None:
+            yield {"content": content, "docstring": render(fn, content), "done": True, "prompt_tokens": 0}
+            return
+
+    prompt = build_prompt(fn, source_budget)
+    prompt_tokens = estimate_tokens(prompt)
+    parser = ContentStreamParser()
+    chunks = []
+    for chunk in _chunks(backend, prompt, limiter, retries, base_delay, max_delay):
+        chunks.append(chunk)
+        if parser.feed(chunk) and parser.content.get("summary"):
+            partial = copy.deepcopy(parser.content)
+            yield {"content": partial, "docstring": render(fn, partial), "done": False,
+                   "prompt_tokens": prompt_tokens}
+
+    content = parse_content("".join(chunks), fn)
+    if cache is not None:
+        cache.put(key, content, backend.name)
+    yield {"content": content, "docstring": render(fn, content), "done": True, "prompt_tokens": prompt_tokens}
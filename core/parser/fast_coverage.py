@@ -0,0 +1,121 @@
+# core/parser/fast_coverage.py
+"""Coverage-only scan mode.
+
+Answers `has_docstring` for modules, top-level functions, classes and their
+methods, and nothing else: no complexity, nesting, raises, annotations or
+imports. The fingerprint of each undocumented function (the report's dedup
+counts) walks its whole body, so it is only computed with fingerprints=True
+(--dedup). Output is the subset of parse_file's shape that compute_coverage
+reads, so it can be fed straight into it with identical numbers.
+
+The module is still parsed with ast.parse (C), but only module and class
+bodies are visited. On CPython 3.11 the pure-Python tokenize module is
+slower than ast.parse on the same file, so a tokenizer pass would cost more
+than this, not less.
+
+Usable as a pre-commit check:
+    python -m core.parser.fast_coverage [paths ...] [--fail-under PCT]
+"""
+import argparse
+import ast
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.parser.fingerprint import fingerprint
+from core.parser.ignore import IgnoreMatcher
+from core.parser.python_parser import _error_record, _iter_py_files
+
+
+def _item(node: ast.AST, kind: str, fingerprints: bool = False) -> Dict[str, Any]:
+    item = {
+        "type": kind,
+        "name": node.name,
+        "lineno": node.lineno,
+        "has_docstring": bool(ast.get_docstring(node)),
+    }
+    if fingerprints and kind != "class" and not item["has_docstring"]:
+        item["fingerprint"] = fingerprint(node)
+    return item
+
+
+def parse_file_coverage(path: str, fingerprints: bool = False) -> Dict[str, Any]:
+    """Docstring presence for one file, in parse_file's shape (coverage keys only).
+
+    fingerprints: also fingerprint the undocumented functions (see dedup)
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read())
+    functions = []
+    classes = []
+    for n in tree.body:
+        if isinstance(n, ast.FunctionDef):
+            functions.append(_item(n, "function", fingerprints))
+        elif isinstance(n, ast.ClassDef):
+            cls = _item(n, "class")
+            cls["methods"] = [_item(m, "method", fingerprints) for m in n.body if isinstance(m, ast.FunctionDef)]
+            classes.append(cls)
+    return {
+        "path": path,
+        "functions": functions,
+        "classes": classes,
+        "module_docstring": bool(ast.get_docstring(tree)),
+    }
+
+
+def iter_coverage_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None,
+                       errors: Optional[List[Dict[str, Any]]] = None,
+                       ignore_files: bool = True, fingerprints: bool = False) -> Iterator[Dict[str, Any]]:
+    """Coverage-only counterpart of iter_parse_path (same file selection and order)."""
+    if skip_dirs is None:
+        skip_dirs = ["venv", ".venv", "__pycache__", ".git"]
+    if os.path.isfile(path) and path.endswith(".py"):
+        yield parse_file_coverage(path, fingerprints)
+        return
+    ignore = IgnoreMatcher(path, skip_dirs=skip_dirs) if ignore_files else None
+    for fp in _iter_py_files(path, recursive, skip_dirs, ignore):
+        try:
+            yield parse_file_coverage(fp, fingerprints)
+        except Exception as e:
+            if errors is not None:
+                errors.append(_error_record(fp, e))
+
+
+def coverage_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None,
+                  errors: Optional[List[Dict[str, Any]]] = None,
+                  ignore_files: bool = True, fingerprints: bool = False) -> List[Dict[str, Any]]:
+    return list(iter_coverage_path(path, recursive, skip_dirs, errors, ignore_files, fingerprints))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from core.reporter.coverage_reporter import CoverageAggregator
+
+    ap = argparse.ArgumentParser(description="Fast docstring coverage check.")
+    ap.add_argument("paths", nargs="*", default=["."])
+    ap.add_argument("--fail-under", type=float, default=0.0,
+                    help="exit with status 1 when coverage is below this percentage")
+    ap.add_argument("--dedup", action="store_true",
+                    help="also count duplicate undocumented functions (slower: fingerprints every body)")
+    args = ap.parse_args(argv)
+
+    agg = CoverageAggregator()
+    errors: List[Dict[str, Any]] = []
+    for p in args.paths:
+        for r in iter_coverage_path(p, errors=errors, fingerprints=args.dedup):
+            agg.add(r)
+    summary = agg.summary
+    for e in errors:
+        print(f"{e['path']}: {e['error']}: {e['message']}", file=sys.stderr)
+    print(f"docstring coverage: {summary['coverage_percent']}% "
+          f"({summary['total_docs']}/{summary['total_items']})")
+    dedup = summary.get("dedup")
+    if dedup and dedup["undocumented"]:
+        print(f"undocumented functions: {dedup['undocumented']}, {dedup['unique']} unique "
+              f"(dedup ratio {dedup['dedup_ratio']:.0%})")
+    if errors or summary["coverage_percent"] < args.fail_under:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
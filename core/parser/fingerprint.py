@@ -0,0 +1,107 @@
+# core/parser/fingerprint.py
+"""Normalized AST fingerprints of functions, and duplicate counts over them.
+
+The parser gives every undocumented function a fingerprint(): copy-pasted
+helpers, generated adapters and the same overload in sibling modules share
+one even when their layout, comments or local and argument names differ.
+group_duplicates() and dedup_summary() work on those fingerprints; the
+coverage report counts with them and the docstring engine generates
+content once per group (see core.docstring_engine.dedup).
+"""
+import ast
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# fields holding names that are placeholders when bound inside the function
+_NAME_FIELDS = {ast.Name: "id", ast.arg: "arg", ast.ExceptHandler: "name", ast.FunctionDef: "name",
+                ast.AsyncFunctionDef: "name", ast.ClassDef: "name"}
+_UNHASHED_FIELDS = {"type_comment", "kind", "ctx"}
+_hashed_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+def fingerprint(fn: ast.FunctionDef) -> str:
+    """Digest of `fn`'s normalized AST.
+
+    Whitespace and comments never reach the AST. The function's own name and
+    docstring are left out, and every name bound inside it (arguments,
+    locals, loop and exception variables, nested defs) is replaced by a
+    placeholder numbered in order of first use, so copies that differ only
+    in those share a fingerprint. Globals, attributes, keywords, literals and
+    annotations count. One recursive pass; names are resolved at the end.
+    """
+    parts: List[str] = []
+    slots: List[Tuple[int, str]] = []  # (index in parts, name) of every name field
+    bound = set()
+    declared = set()
+    append = parts.append
+
+    def visit(node: ast.AST) -> None:
+        cls = type(node)
+        fields = _hashed_fields.get(cls)
+        if fields is None:
+            fields = _hashed_fields[cls] = tuple(f for f in cls._fields if f not in _UNHASHED_FIELDS)
+        append(cls.__name__)
+        name_field = _NAME_FIELDS.get(cls)
+        if cls is ast.Global or cls is ast.Nonlocal:
+            declared.update(node.names)
+        for field in fields:
+            value = getattr(node, field, None)
+            if field == name_field and value is not None:
+                if cls is not ast.Name or not isinstance(node.ctx, ast.Load):
+                    bound.add(value)
+                slots.append((len(parts), value))
+                append(value)
+            elif isinstance(value, ast.AST):
+                visit(value)
+            elif isinstance(value, list):
+                append("[")
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+                    else:
+                        append(repr(item))
+                append("]")
+            else:
+                append(repr(value))
+
+    for decorator in fn.decorator_list:
+        visit(decorator)
+    visit(fn.args)
+    if fn.returns is not None:
+        visit(fn.returns)
+    for stmt in fn.body[1:] if ast.get_docstring(fn, clean=False) is not None else fn.body:
+        visit(stmt)
+
+    placeholders: Dict[str, str] = {}
+    local = bound - declared
+    for index, name in slots:
+        if name in local:
+            parts[index] = placeholders.setdefault(name, f"_{len(placeholders)}")
+    return hashlib.blake2b("\x00".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def group_duplicates(fns: Sequence[Dict[str, Any]]) -> List[List[int]]:
+    """Indices into `fns` grouped by fingerprint, in first-seen order.
+
+    A function without a fingerprint is a group of its own.
+    """
+    groups: Dict[Any, List[int]] = {}
+    for i, fn in enumerate(fns):
+        groups.setdefault(fn.get("fingerprint") or ("#", i), []).append(i)
+    return list(groups.values())
+
+
+def dedup_summary(fingerprints: Union[Counter, Iterable[Optional[str]]]) -> Dict[str, Any]:
+    """Counts for a set of undocumented functions.
+
+    fingerprints: one per function, or a Counter of them (None counts the
+    functions without a fingerprint, each unique)
+    dedup_ratio: the share of LLM calls saved by generating once per
+    fingerprint (0.0 without duplicates)
+    """
+    counts = fingerprints if isinstance(fingerprints, Counter) else Counter(fingerprints)
+    total = sum(counts.values())
+    unique = len(counts) - (None in counts) + counts[None]
+    return {"undocumented": total, "unique": unique,
+            "dedup_ratio": round(1 - unique / total, 4) if total else 0.0}
@@ -0,0 +1,246 @@
+# core/parser/git_scope.py
+"""Scan only what a git change touches.
+
+Diffs the working tree against a base revision (its merge-base with HEAD,
+as a pull request would), or the staged index against HEAD, parses only the
+changed .py files and keeps only the functions, classes and methods whose
+line spans intersect the changed hunks. Results have parse_file's shape, so
+compute_coverage works on them unchanged.
+
+Usable as a pre-commit check:
+    python -m core.parser.git_scope --staged [--fail-under PCT] [--max-complexity N]
+    python -m core.parser.git_scope --base origin/main
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.parser.ignore import IgnoreMatcher
+from core.parser.python_parser import _error_record, _is_source_name, parse_file, parse_source
+
+DEFAULT_SKIP_DIRS = ["venv", ".venv", "__pycache__", ".git"]
+
+_HUNK = re.compile(rb"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+# escapes git uses in quoted path names (see core.quotePath in git-config(1))
+_C_ESCAPE = re.compile(rb"\\([0-7]{3}|.)", re.S)
+_C_CHARS = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r"}
+
+Hunks = List[Tuple[int, int]]
+
+
+def _git(repo: str, *args: str, stdin: Optional[bytes] = None) -> bytes:
+    proc = subprocess.run(["git", "-C", repo, *args], input=stdin, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {proc.stderr.decode(errors='replace').strip()}")
+    return proc.stdout
+
+
+def _is_scanned(rel_path: str, skip_dirs: List[str]) -> bool:
+    # same file selection as parse_path
+    parts = rel_path.split("/")
+    return (_is_source_name(parts[-1])
+            and not any(p in skip_dirs for p in parts[:-1]))
+
+
+def _unquote(name: bytes) -> bytes:
+    """Undo git's C-style quoting of a path (the quotes already stripped)."""
+    def escape(m: "re.Match[bytes]") -> bytes:
+        code = m.group(1)
+        if len(code) == 3:
+            return bytes([int(code, 8)])
+        return _C_CHARS.get(code, code)
+
+    return _C_ESCAPE.sub(escape, name)
+
+
+def _parse_diff(diff: bytes) -> Dict[str, Hunks]:
+    """Map each new-side path of a --unified=0 diff to its changed line ranges.
+
+    A pure deletion has no new lines; it is recorded as the two lines around
+    the gap so the enclosing function still counts as touched. Paths may
+    carry git's trailing tab (names with spaces) or be C-quoted.
+    """
+    hunks: Dict[str, Hunks] = {}
+    current: Optional[Hunks] = None
+    for line in diff.splitlines():
+        if line.startswith(b"+++ "):
+            # git ends the header with a tab when the path contains a space
+            name = line[4:].rstrip(b"\r").rstrip(b"\t")
+            if name == b"/dev/null":
+                current = None
+                continue
+            if name.startswith(b'"') and name.endswith(b'"'):
+                # quoted form for control characters, quotes or backslashes (C-style escapes)
+                name = _unquote(name[1:-1])
+            current = hunks.setdefault(os.fsdecode(name[2:]), [])
+        elif current is not None and line.startswith(b"@@"):
+            m = _HUNK.match(line)
+            if not m:
+                continue
+            start = int(m.group(1))
+            count = int(m.group(2)) if m.group(2) is not None else 1
+            if count:
+                current.append((start, start + count - 1))
+            else:
+                current.append((max(start, 1), start + 1))
+    return hunks
+
+
+def changed_hunks(base: Optional[str] = None, staged: bool = False, repo: str = ".",
+                  skip_dirs: Optional[List[str]] = None) -> Dict[str, Hunks]:
+    """Changed .py files (paths relative to the repo root) and their changed line ranges.
+
+    staged: index vs HEAD (what the next commit contains)
+    base: working tree vs merge-base(base, HEAD)
+    neither: working tree vs HEAD
+
+    In the working-tree modes, untracked (not ignored) .py files count as
+    changed from their first line to their last.
+    """
+    if skip_dirs is None:
+        skip_dirs = DEFAULT_SKIP_DIRS
+    args = ["-c", "core.quotePath=false", "diff", "--unified=0", "--no-color", "--no-ext-diff",
+            "--src-prefix=a/", "--dst-prefix=b/", "--diff-filter=d"]
+    if staged:
+        args.append("--cached")
+    elif base:
+        args.append(_git(repo, "merge-base", base, "HEAD").decode().strip())
+    else:
+        args.append("HEAD")
+    diff = _git(repo, *args, "--", "*.py")
+    hunks = _parse_diff(diff)
+    if not staged:
+        untracked = _git(repo, "ls-files", "-z", "--full-name", "--others", "--exclude-standard", "--", "*.py")
+        for name in untracked.split(b"\0"):
+            if name:
+                hunks[os.fsdecode(name)] = [(1, _line_count(os.path.join(repo, os.fsdecode(name))))]
+    ignore = IgnoreMatcher(repo, skip_dirs=skip_dirs)
+    return {p: h for p, h in hunks.items()
+            if h and _is_scanned(p, skip_dirs) and not ignore.is_ignored(os.path.join(repo, p))}
+
+
+def _line_count(path: str) -> int:
+    try:
+        with open(path, "rb") as fh:
+            return max(1, len(fh.read().splitlines()))
+    except OSError:
+        return 1
+
+
+def _staged_blobs(repo: str, rel_paths: List[str]) -> Dict[str, bytes]:
+    """Index contents of `rel_paths`, fetched with a single git cat-file call."""
+    out = _git(repo, "cat-file", "--batch", stdin="".join(f":{p}\n" for p in rel_paths).encode())
+    blobs = {}
+    pos = 0
+    for p in rel_paths:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        blobs[p] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+def _touches(item: Dict[str, Any], hunks: Hunks) -> bool:
+    start = item.get("lineno")
+    end = item.get("end_lineno") or start
+    return any(lo <= end and hi >= start for lo, hi in hunks)
+
+
+def filter_touched(result: Dict[str, Any], hunks: Hunks) -> Dict[str, Any]:
+    """Copy of a parse_file result keeping only items that intersect `hunks`."""
+    classes = []
+    for c in result.get("classes", []):
+        if _touches(c, hunks):
+            classes.append(dict(c, methods=[m for m in c.get("methods", []) if _touches(m, hunks)]))
+    return dict(result,
+                functions=[f for f in result.get("functions", []) if _touches(f, hunks)],
+                classes=classes,
+                hunks=hunks)
+
+
+def scan_changes(base: Optional[str] = None, staged: bool = False, repo: str = ".",
+                 skip_dirs: Optional[List[str]] = None,
+                 errors: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """parse_file results for changed files, narrowed to the touched items.
+
+    Only the changed files are read and parsed. With staged=True the content
+    comes from the index rather than the working tree.
+    """
+    root = _git(repo, "rev-parse", "--show-toplevel").decode().strip()
+    hunks = changed_hunks(base, staged, root, skip_dirs)
+    rel_paths = sorted(hunks)
+    blobs = _staged_blobs(root, rel_paths) if staged and rel_paths else {}
+    results = []
+    for rel in rel_paths:
+        fp = os.path.join(root, rel)
+        try:
+            result = parse_source(blobs[rel], fp) if staged else parse_file(fp)
+        except Exception as e:
+            if errors is not None:
+                errors.append(_error_record(fp, e))
+            continue
+        results.append(filter_touched(result, hunks[rel]))
+    return results
+
+
+def touched_complexity(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Complexity of every touched function and method, most complex first."""
+    rows = []
+    for r in results:
+        for f in r.get("functions", []):
+            rows.append({"path": r["path"], "name": f["name"], "lineno": f["lineno"],
+                         "complexity": f.get("complexity", 0)})
+        for c in r.get("classes", []):
+            for m in c.get("methods", []):
+                rows.append({"path": r["path"], "name": f"{c['name']}.{m['name']}", "lineno": m["lineno"],
+                             "complexity": m.get("complexity", 0)})
+    return sorted(rows, key=lambda row: -row["complexity"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from core.reporter.coverage_reporter import compute_coverage
+
+    ap = argparse.ArgumentParser(description="Docstring coverage and complexity for changed code only.")
+    scope = ap.add_mutually_exclusive_group()
+    scope.add_argument("--base", help="compare the working tree with the merge-base of this revision and HEAD")
+    scope.add_argument("--staged", action="store_true", help="check the staged index (pre-commit)")
+    ap.add_argument("--repo", default=".")
+    ap.add_argument("--fail-under", type=float, default=0.0,
+                    help="exit with status 1 when coverage of touched items is below this percentage")
+    ap.add_argument("--max-complexity", type=int, default=None,
+                    help="exit with status 1 when a touched function is more complex than this")
+    args = ap.parse_args(argv)
+
+    errors: List[Dict[str, Any]] = []
+    results = scan_changes(args.base, args.staged, args.repo, errors=errors)
+    report = compute_coverage(results)
+    complexity = touched_complexity(results)
+
+    for e in errors:
+        print(f"{e['path']}: {e['error']}: {e['message']}", file=sys.stderr)
+    for path, entry in report["files"].items():
+        for item in entry["items"]:
+            if not item["has_doc"]:
+                name = f"{item['class']}.{item['name']}" if item.get("class") else item["name"]
+                print(f"{path}:{item['lineno']}: missing docstring: {name}")
+    too_complex = [row for row in complexity
+                   if args.max_complexity is not None and row["complexity"] > args.max_complexity]
+    for row in too_complex:
+        print(f"{row['path']}:{row['lineno']}: complexity {row['complexity']}: {row['name']}")
+    summary = report["summary"]
+    print(f"{len(results)} changed files, docstring coverage of touched items: "
+          f"{summary['coverage_percent']}% ({summary['total_docs']}/{summary['total_items']})")
+    if errors or too_complex or summary["coverage_percent"] < args.fail_under:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
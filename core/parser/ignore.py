@@ -0,0 +1,275 @@
+# core/parser/ignore.py
+"""Ignore rules for tree walks: .gitignore files, pyproject globs, virtualenvs.
+
+IgnoreMatcher decides, per directory entry, whether a scan should skip it.
+A directory that is skipped is pruned before os.walk descends into it, so
+nothing below an ignored virtualenv, node_modules or build tree is listed.
+
+Sources, highest priority first:
+ - [tool.code-reviewer] in the nearest pyproject.toml: `exclude` globs
+   (gitignore syntax, relative to the pyproject directory) and `include`
+   globs that scanned files must match
+ - .gitignore files, from the scan root's enclosing git worktree down to
+   each walked directory; deeper files override shallower ones and the last
+   matching line in a file wins, as in git
+ - any directory holding a pyvenv.cfg (a virtualenv, ignored or not)
+
+Each .gitignore is compiled once into regexes; a file without negated
+patterns is a single alternation per match target.
+"""
+import fnmatch
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+CONFIG_TABLE = "code-reviewer"
+
+
+def _translate(pattern: str) -> str:
+    """Regex (no anchors) for one gitignore glob; '*' and '?' stop at '/'."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**":
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")            # trailing "/**": everything inside
+                        i += 2
+                    else:
+                        out.append("(?:.*/)?")      # "**/": zero or more directories
+                        i += 3
+                    continue
+            out.append("[^/]*")
+            while i < n and pattern[i] == "*":
+                i += 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 2 if pattern[i + 1:i + 2] in ("!", "]") else i + 1)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class _Rule:
+    __slots__ = ("regex", "anchored", "dir_only", "negate")
+
+    def __init__(self, regex: str, anchored: bool, dir_only: bool, negate: bool):
+        self.regex = re.compile(regex)
+        self.anchored = anchored
+        self.dir_only = dir_only
+        self.negate = negate
+
+
+def _parse_line(line: str) -> Optional[Tuple[str, bool, bool, bool]]:
+    """(regex, anchored, dir_only, negate) for one gitignore line, or None."""
+    line = line.rstrip("\n").rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    # trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    return _translate(line), anchored, dir_only, negate
+
+
+class RuleSet:
+    """Compiled patterns of one .gitignore file (or exclude list) rooted at `base`."""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        self.base = base
+        rules = [r for r in (_parse_line(line) for line in lines) if r is not None]
+        self.rules = [_Rule(*r) for r in rules]
+        self._fast = None
+        if self.rules and not any(r.negate for r in self.rules):
+            # no negations: any match ignores, so one alternation per target
+            def combine(select):
+                parts = [r[0] for r in rules if select(r)]
+                return re.compile("|".join(f"(?:{p})" for p in parts)) if parts else None
+            self._fast = (
+                combine(lambda r: not r[1] and not r[2]), combine(lambda r: r[1] and not r[2]),
+                combine(lambda r: not r[1]), combine(lambda r: r[1]),
+            )
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["RuleSet"]:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                rules = cls(os.path.dirname(path), f)
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a negation, None if no rule matches.
+
+        rel: '/'-separated path relative to `base`
+        """
+        name = rel.rsplit("/", 1)[-1]
+        if self._fast is not None:
+            name_any, path_any, name_dir, path_dir = self._fast
+            if is_dir:
+                name_rx, path_rx = name_dir, path_dir
+            else:
+                name_rx, path_rx = name_any, path_any
+            if (name_rx is not None and name_rx.fullmatch(name)) or (path_rx is not None and path_rx.fullmatch(rel)):
+                return True
+            return None
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(rel if rule.anchored else name):
+                return not rule.negate
+        return None
+
+
+def _find_up(start: str, name: str, stop: Optional[str]) -> Optional[str]:
+    d = start
+    while True:
+        candidate = os.path.join(d, name)
+        if os.path.exists(candidate):
+            return candidate
+        parent = os.path.dirname(d)
+        if d == stop or parent == d:
+            return None
+        d = parent
+
+
+def load_config(root: str) -> Dict[str, List[str]]:
+    """include/exclude globs from [tool.code-reviewer] in the nearest pyproject.toml."""
+    path = _find_up(root, "pyproject.toml", None)
+    if path is None or tomllib is None:
+        return {"base": root, "include": [], "exclude": []}
+    try:
+        with open(path, "rb") as f:
+            table = tomllib.load(f).get("tool", {}).get(CONFIG_TABLE, {})
+    except (OSError, tomllib.TOMLDecodeError):
+        table = {}
+    return {"base": os.path.dirname(path), "include": list(table.get("include", [])),
+            "exclude": list(table.get("exclude", []))}
+
+
+class IgnoreMatcher:
+    """Skip decisions for paths under `root`.
+
+    gitignore: honour .gitignore files
+    pyproject: honour [tool.code-reviewer] include/exclude globs
+    skip_dirs: directory names always skipped (the old hard-coded list)
+    """
+
+    def __init__(self, root: str, gitignore: bool = True, pyproject: bool = True,
+                 skip_dirs: Iterable[str] = ()):
+        self.root = os.path.abspath(root)
+        self.gitignore = gitignore
+        self.skip_dirs = set(skip_dirs)
+        self._levels: Dict[str, Optional[RuleSet]] = {}
+        self._dirs: Dict[str, bool] = {}
+        self._chains: Dict[str, List[RuleSet]] = {}
+        self.excludes: Optional[RuleSet] = None
+        self.include: List[str] = []
+        self._base = self.root
+        if pyproject:
+            config = load_config(self.root)
+            self._base = config["base"]
+            if config["exclude"]:
+                self.excludes = RuleSet(self._base, config["exclude"])
+            self.include = config["include"]
+        top = self.root if os.path.isdir(self.root) else os.path.dirname(self.root)
+        git_dir = _find_up(top, ".git", None) if gitignore else None
+        self._top = os.path.dirname(git_dir) if git_dir else top
+
+    def _rules(self, directory: str) -> Optional[RuleSet]:
+        if directory not in self._levels:
+            self._levels[directory] = RuleSet.from_file(os.path.join(directory, ".gitignore")) if self.gitignore else None
+        return self._levels[directory]
+
+    def _chain(self, directory: str) -> List[RuleSet]:
+        """Rule sets that apply inside `directory`, deepest first."""
+        chain = self._chains.get(directory)
+        if chain is None:
+            rules = self._rules(directory)
+            chain = [rules] if rules is not None else []
+            parent = os.path.dirname(directory)
+            if directory != self._top and directory.startswith(self._top) and parent != directory:
+                chain = chain + self._chain(parent)
+            self._chains[directory] = chain
+        return chain
+
+    def _ignored(self, path: str, is_dir: bool) -> bool:
+        if self.excludes is not None and path.startswith(self._base + os.sep):
+            rel = os.path.relpath(path, self._base).replace(os.sep, "/")
+            if self.excludes.match(rel, is_dir):
+                return True
+        for rules in self._chain(os.path.dirname(path)):
+            rel = os.path.relpath(path, rules.base).replace(os.sep, "/")
+            decision = rules.match(rel, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def skip_dir(self, path: str) -> bool:
+        """Whether os.walk should not descend into `path`."""
+        path = os.path.abspath(path)
+        cached = self._dirs.get(path)
+        if cached is None:
+            cached = (os.path.basename(path) in self.skip_dirs
+                      or os.path.exists(os.path.join(path, "pyvenv.cfg"))
+                      or self._ignored(path, True))
+            self._dirs[path] = cached
+        return cached
+
+    def skip_file(self, path: str) -> bool:
+        path = os.path.abspath(path)
+        if self.include:
+            rel = os.path.relpath(path, self._base).replace(os.sep, "/")
+            if not any(fnmatch.fnmatchcase(rel, g) for g in self.include):
+                return True
+        return self._ignored(path, False)
+
+    def is_ignored(self, path: str) -> bool:
+        """Full check for an arbitrary path: any ignored ancestor directory below root counts."""
+        path = os.path.abspath(path)
+        d = os.path.dirname(path)
+        while d.startswith(self.root + os.sep):
+            if self.skip_dir(d):
+                return True
+            d = os.path.dirname(d)
+        return self.skip_dir(path) if os.path.isdir(path) else self.skip_file(path)
+
+    def prune(self, dirpath: str, dirs: List[str]) -> None:
+        """Filter os.walk's `dirs` in place."""
+        dirs[:] = [d for d in dirs if not self.skip_dir(os.path.join(dirpath, d))]
@@ -0,0 +1,264 @@
+# core/parser/import_graph.py
+"""Project-wide module dependency graph built from parse results.
+
+Each scanned file is a module named after its path relative to the
+directory holding its outermost package, i.e. the nearest ancestor without
+an __init__.py ("core/parser/watcher.py" -> "core.parser.watcher"), so
+absolute imports resolve when only a subdirectory is scanned; files outside
+any package are named relative to the scan root. The dotted names
+in a result's "imports" are resolved to the longest known module prefix
+("core.parser.watcher.ScanWatcher" -> core/parser/watcher.py); relative
+imports are resolved against the importing module's package. Imports that
+match no scanned module (stdlib, third party) are ignored.
+
+The graph updates one file at a time. A file's public signature (names,
+arguments, annotations, defaults and return annotations of its public
+functions, classes and methods) is fingerprinted, and update_file() returns
+the files that import it, directly or through other modules (a package
+__init__ re-exporting it, say), only when that fingerprint changes, so
+callers can invalidate cached docstrings or reviews for just the affected
+set.
+"""
+import hashlib
+import os
+from typing import Any, Dict, Iterable, List, Set
+
+
+def _import_root(path: str, root: str) -> str:
+    """Directory above the outermost package containing `path`, or `root` outside any package."""
+    directory = os.path.dirname(os.path.abspath(path))
+    base = None
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        base = directory = parent
+    return base if base is not None else root
+
+
+def module_name(path: str, root: str) -> str:
+    """Dotted module name of `path` (see the module docstring; a package __init__ names the package)."""
+    rel = os.path.relpath(os.path.abspath(path), os.path.abspath(_import_root(path, root)))
+    parts = rel[:-3].split(os.sep) if rel.endswith(".py") else rel.split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(p for p in parts if p and p != ".")
+
+
+def _prefixes(name: str) -> List[str]:
+    """'a.b.c' -> ['a.b.c', 'a.b', 'a'] (longest first)."""
+    parts = name.split(".")
+    return [".".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+def signature_fingerprint(result: Dict[str, Any]) -> str:
+    """Hash of the public API of one parse_file result."""
+    parts: List[str] = []
+
+    def callable_sig(fn: Dict[str, Any]) -> str:
+        args = ",".join(f"{a.get('name')}:{a.get('annotation')}" for a in fn.get("args", []))
+        defaults = ",".join(map(str, fn.get("defaults") or []))
+        return f"{fn.get('name')}({args})[{defaults}]->{fn.get('returns')}"
+
+    for f in result.get("functions", []):
+        if not f["name"].startswith("_"):
+            parts.append("def " + callable_sig(f))
+    for c in result.get("classes", []):
+        if c["name"].startswith("_"):
+            continue
+        parts.append(f"class {c['name']}")
+        for m in c.get("methods", []):
+            if not m["name"].startswith("_") or m["name"] == "__init__":
+                parts.append(f"  def {callable_sig(m)}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ImportGraph:
+    """Module dependency graph over a scanned tree, updated per file."""
+
+    def __init__(self, root: str, results: Iterable[Dict[str, Any]] = ()):
+        self.root = root
+        self.reset(results)
+
+    def reset(self, results: Iterable[Dict[str, Any]] = ()) -> None:
+        """Rebuild the graph from a full set of parse results."""
+        self._modules: Dict[str, str] = {}          # module name -> path
+        self._names: Dict[str, str] = {}            # path -> module name
+        self._imports: Dict[str, List[str]] = {}    # path -> absolute imported names
+        self._wanted: Dict[str, Set[str]] = {}      # name prefix -> paths importing it
+        self._signatures: Dict[str, str] = {}
+        self.deps: Dict[str, Set[str]] = {}         # path -> paths it imports
+        self.rdeps: Dict[str, Set[str]] = {}        # path -> paths importing it
+        results = list(results)
+        for r in results:
+            self._register(r)
+        for r in results:
+            self._resolve(str(r["path"]))
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _absolute(self, name: str, module: str, is_package: bool) -> str:
+        """Resolve a relative import ('..x.y') against `module`'s package."""
+        if not name.startswith("."):
+            return name
+        level = len(name) - len(name.lstrip("."))
+        package = module.split(".") if is_package else module.split(".")[:-1]
+        if level > 1:
+            package = package[:len(package) - (level - 1)]
+        rest = name[level:]
+        return ".".join(package + ([rest] if rest else []))
+
+    def _register(self, result: Dict[str, Any]) -> None:
+        path = str(result["path"])
+        name = module_name(path, self.root)
+        self._names[path] = name
+        self._modules[name] = path
+        is_package = os.path.basename(path) == "__init__.py"
+        imports = [self._absolute(i, name, is_package) for i in result.get("imports", [])]
+        self._imports[path] = imports
+        for imp in imports:
+            for prefix in _prefixes(imp):
+                self._wanted.setdefault(prefix, set()).add(path)
+        self._signatures[path] = signature_fingerprint(result)
+        self.deps.setdefault(path, set())
+        self.rdeps.setdefault(path, set())
+
+    def _resolve(self, path: str) -> None:
+        """Recompute the outgoing edges of `path`."""
+        for old in self.deps.get(path, ()):
+            self.rdeps.get(old, set()).discard(path)
+        targets = set()
+        for imp in self._imports.get(path, ()):
+            for prefix in _prefixes(imp):
+                target = self._modules.get(prefix)
+                if target is not None:
+                    if target != path:
+                        targets.add(target)
+                    break
+        self.deps[path] = targets
+        for t in targets:
+            self.rdeps.setdefault(t, set()).add(path)
+
+    def _unregister(self, path: str) -> None:
+        name = self._names.pop(path)
+        if self._modules.get(name) == path:
+            del self._modules[name]
+        for imp in self._imports.pop(path, ()):
+            for prefix in _prefixes(imp):
+                wanted = self._wanted.get(prefix)
+                if wanted is not None:
+                    wanted.discard(path)
+                    if not wanted:
+                        del self._wanted[prefix]
+        for t in self.deps.pop(path, ()):
+            self.rdeps.get(t, set()).discard(path)
+        self._signatures.pop(path, None)
+
+    def update_file(self, result: Dict[str, Any]) -> Set[str]:
+        """Add or replace one file; returns the importers whose caches are now stale.
+
+        That is every file importing it, directly or transitively, when it
+        is new or its public signature changed, and nothing for body-only
+        edits.
+        """
+        path = str(result["path"])
+        known = path in self._names
+        old_signature = self._signatures.get(path)
+        importers = set(self.rdeps.get(path, ()))
+        if known:
+            self._unregister(path)
+        self._register(result)
+        self._resolve(path)
+        if not known:
+            # files whose imports now resolve to the new module
+            for other in self._wanted.get(self._names[path], set()) - {path}:
+                self._resolve(other)
+        if known and self._signatures[path] == old_signature:
+            return set()
+        return self._closure(importers | self.rdeps[path]) - {path}
+
+    def remove_file(self, path: str) -> Set[str]:
+        """Drop a deleted file; returns the files that imported it, directly or transitively."""
+        if path not in self._names:
+            return set()
+        importers = set(self.rdeps.pop(path, ()))
+        name = self._names[path]
+        self._unregister(path)
+        for other in importers | self._wanted.get(name, set()):
+            if other in self._names:
+                self._resolve(other)
+        return self._closure(importers) - {path}
+
+    def _closure(self, paths: Set[str]) -> Set[str]:
+        """`paths` and every file importing one of them, to a fixpoint."""
+        seen = set(paths)
+        stack = list(paths)
+        while stack:
+            for importer in self.rdeps.get(stack.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    stack.append(importer)
+        return seen
+
+    def dependents(self, path: str, transitive: bool = False) -> Set[str]:
+        """Files importing `path` (and, if transitive, everything importing those)."""
+        importers = set(self.rdeps.get(path, ()))
+        if not transitive:
+            return importers
+        return self._closure(importers) - {path}
+
+    def cycles(self) -> List[List[str]]:
+        """Import cycles: strongly connected components with more than one file (Tarjan)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        found: List[List[str]] = []
+        counter = 0
+        for start in sorted(self.deps):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(self.deps[start])))]
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.deps.get(child, ())))))
+                    elif child in on_stack:
+                        low[node] = min(low[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        found.append(sorted(component))
+        return sorted(found)
+
+    def invalidate(self, paths: Iterable[str], caches: Iterable[Any]) -> None:
+        """Call cache.invalidate(path) for every path on every cache."""
+        paths = list(paths)
+        for cache in caches:
+            for p in paths:
+                cache.invalidate(p)
@@ -0,0 +1,221 @@
+# core/parser/models.py
+"""Compact, slotted representation of parse_file results.
+
+parse_file returns nested dicts that repeat every key per function and copy
+`class_attributes` into each method. These classes hold the same data with
+__slots__, tuples and interned strings, and methods share their class's
+attribute tuple.
+
+They also answer the read-only dict protocol (r["path"], r.get("functions"),
+"args" in fn, ...) with the original keys, so compute_coverage,
+build_export_rows and main_app can consume them unchanged. to_dict() gives
+back the exact parse_file shape.
+"""
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+
+
+def _intern(s: Optional[str]) -> Optional[str]:
+    return sys.intern(s) if isinstance(s, str) else s
+
+
+class _DictView:
+    """Read-only mapping access over the slots named in _KEYS."""
+    __slots__ = ()
+    _KEYS: Tuple[str, ...] = ()
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self._KEYS
+
+    def _value(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys():
+            raise KeyError(key)
+        return self._value(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._keys():
+            return default
+        return self._value(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._keys()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((k, self._value(k)) for k in self._keys())
+
+
+@dataclass(slots=True, eq=True)
+class ArgInfo(_DictView):
+    _KEYS = ("name", "annotation")
+
+    name: str
+    annotation: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "annotation": self.annotation}
+
+
+@dataclass(slots=True, eq=True)
+class FunctionInfo(_DictView):
+    """A top-level function or a method (type == "method")."""
+    _FUNCTION_KEYS = ("type", "name", "lineno", "end_lineno", "args", "defaults", "returns",
+                      "has_docstring", "complexity", "nesting_depth", "raises", "yields", "indent", "body_hash",
+                      "fingerprint")
+    _METHOD_KEYS = ("type", "name", "lineno", "end_lineno", "args", "returns", "has_docstring",
+                    "complexity", "nesting_depth", "class_attributes", "indent", "body_hash", "fingerprint")
+
+    type: str
+    name: str
+    lineno: int
+    end_lineno: Optional[int]
+    args: Tuple[ArgInfo, ...]
+    returns: Optional[str]
+    has_docstring: bool
+    complexity: int
+    nesting_depth: int
+    indent: int
+    defaults: Tuple[Optional[str], ...] = ()
+    raises: Tuple[str, ...] = ()
+    yields: bool = False
+    body_hash: Optional[str] = None
+    fingerprint: Optional[str] = None
+    # shared with the owning ClassInfo, never copied per method
+    class_attributes: Tuple[str, ...] = ()
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self._METHOD_KEYS if self.type == "method" else self._FUNCTION_KEYS
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], class_attributes: Tuple[str, ...] = ()) -> "FunctionInfo":
+        return cls(
+            type=_intern(d.get("type", "function")),
+            name=_intern(d["name"]),
+            lineno=d["lineno"],
+            end_lineno=d.get("end_lineno"),
+            args=tuple(ArgInfo(_intern(a["name"]), _intern(a.get("annotation"))) for a in d.get("args", [])),
+            returns=_intern(d.get("returns")),
+            has_docstring=d.get("has_docstring", False),
+            complexity=d.get("complexity", 1),
+            nesting_depth=d.get("nesting_depth", 0),
+            indent=d.get("indent", 4),
+            defaults=tuple(_intern(x) for x in d.get("defaults", [])),
+            raises=tuple(_intern(x) for x in d.get("raises", [])),
+            yields=d.get("yields", False),
+            body_hash=d.get("body_hash"),
+            fingerprint=d.get("fingerprint"),
+            class_attributes=class_attributes,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        for k in self._keys():
+            v = getattr(self, k)
+            if k == "args":
+                v = [a.to_dict() for a in v]
+            elif isinstance(v, tuple):
+                v = list(v)
+            out[k] = v
+        return out
+
+
+@dataclass(slots=True, eq=True)
+class ClassInfo(_DictView):
+    _KEYS = ("type", "name", "lineno", "end_lineno", "has_docstring", "methods")
+
+    name: str
+    lineno: int
+    end_lineno: Optional[int]
+    has_docstring: bool
+    methods: Tuple[FunctionInfo, ...]
+    class_attributes: Tuple[str, ...] = ()
+    type: str = "class"
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ClassInfo":
+        methods = d.get("methods", [])
+        attrs = tuple(_intern(a) for a in (methods[0].get("class_attributes", []) if methods else []))
+        return cls(
+            name=_intern(d["name"]),
+            lineno=d["lineno"],
+            end_lineno=d.get("end_lineno"),
+            has_docstring=d.get("has_docstring", False),
+            methods=tuple(FunctionInfo.from_dict(m, attrs) for m in methods),
+            class_attributes=attrs,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "name": self.name,
+            "lineno": self.lineno,
+            "end_lineno": self.end_lineno,
+            "has_docstring": self.has_docstring,
+            "methods": [m.to_dict() for m in self.methods],
+        }
+
+
+@dataclass(slots=True, eq=True)
+class FileInfo(_DictView):
+    _BASE_KEYS = ("path", "functions", "classes", "imports", "module_docstring")
+
+    path: str
+    functions: Tuple[FunctionInfo, ...]
+    classes: Tuple[ClassInfo, ...]
+    imports: Tuple[str, ...]
+    module_docstring: bool
+    # keys parse_file may add that are not modelled above, kept verbatim
+    extra: Optional[Dict[str, Any]] = None
+
+    def _keys(self) -> Tuple[str, ...]:
+        return self._BASE_KEYS + tuple(self.extra or ())
+
+    def _value(self, key: str) -> Any:
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return getattr(self, key)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "FileInfo":
+        extra = {k: v for k, v in d.items() if k not in cls._BASE_KEYS} or None
+        return cls(
+            path=_intern(str(d["path"])),
+            functions=tuple(FunctionInfo.from_dict(f) for f in d.get("functions", [])),
+            classes=tuple(ClassInfo.from_dict(c) for c in d.get("classes", [])),
+            imports=tuple(_intern(i) for i in d.get("imports", [])),
+            module_docstring=d.get("module_docstring", False),
+            extra=extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {
+            "path": self.path,
+            "functions": [f.to_dict() for f in self.functions],
+            "classes": [c.to_dict() for c in self.classes],
+            "imports": list(self.imports),
+            "module_docstring": self.module_docstring,
+        }
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+def compact_results(results: Iterable[Dict[str, Any]]) -> List[FileInfo]:
+    """Convert parse_path output (or any iterable of parse_file dicts) to FileInfo."""
+    return [r if isinstance(r, FileInfo) else FileInfo.from_dict(r) for r in results]
+
+
+def expand_results(results: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Inverse of compact_results: plain parse_file dicts."""
+    return [r.to_dict() if isinstance(r, FileInfo) else r for r in results]
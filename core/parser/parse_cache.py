@@ -0,0 +1,178 @@
+# core/parser/parse_cache.py
+"""Persistent on-disk cache of parse_file results.
+
+Entries are keyed by file path and validated against (size, mtime_ns,
+content hash, parser version):
+ - fast path: size and mtime_ns unchanged -> hit after a single stat
+ - slow path: stat changed but content hash matches -> hit, stat refreshed
+ - anything else is a miss and the caller reparses
+
+The size and content hash stored with a result are those of the exact
+bytes that were parsed (file_stamp), so an edit landing while the file is
+being parsed cannot get the old result stored as fresh.
+
+Results are stored as JSON in a SQLite database under storage/cache/ and
+evicted least-recently-used once the stored results exceed `max_bytes`.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+DEFAULT_CACHE_PATH = "storage/cache/parse_cache.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_access INTEGER NOT NULL
+)
+"""
+
+
+Stamp = Tuple[int, int, str]  # (size, mtime_ns, content hash)
+
+
+def file_stamp(data: Union[bytes, memoryview, Any], mtime_ns: int) -> Stamp:
+    """Stamp of the bytes a result was parsed from.
+
+    mtime_ns: the file's mtime taken *before* reading `data`; if the file
+    changes after that, its newer mtime sends the next get() to the hash
+    check, which then misses.
+    """
+    return len(data), mtime_ns, hashlib.sha256(data).hexdigest()
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """SQLite-backed parse result cache with LRU eviction by total size."""
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 parser_version: Optional[str] = None):
+        if parser_version is None:
+            from core.parser.python_parser import PARSER_VERSION
+            parser_version = PARSER_VERSION
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # shared by Streamlit reruns, which may run on different threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parse_cache_lru ON parse_cache(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM parse_cache").fetchone()[0]
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `path`, or None if missing or stale."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash, parser_version, result FROM parse_cache WHERE path = ?",
+                (path,),
+            ).fetchone()
+            if row is None or row[3] != self.parser_version:
+                self.misses += 1
+                return None
+            size, mtime_ns, content_hash, _, result = row
+            if size != st.st_size:
+                self.misses += 1
+                return None
+            if mtime_ns != st.st_mtime_ns:
+                # touched but maybe not edited: confirm with the content hash
+                try:
+                    same = _hash_file(path) == content_hash
+                except OSError:
+                    same = False
+                if not same:
+                    self.misses += 1
+                    return None
+                self._conn.execute(
+                    "UPDATE parse_cache SET mtime_ns = ? WHERE path = ?", (st.st_mtime_ns, path)
+                )
+            self._conn.execute(
+                "UPDATE parse_cache SET last_access = ? WHERE path = ?", (time.time_ns(), path)
+            )
+            self.hits += 1
+            return json.loads(result)
+
+    def put(self, path: str, result: Dict[str, Any], stamp: Stamp) -> None:
+        """Store the result parsed for `path` from the bytes described by `stamp` (see file_stamp)."""
+        size, mtime_ns, content_hash = stamp
+        payload = json.dumps(result, separators=(",", ":"))
+        nbytes = len(payload)
+        with self._lock:
+            old = self._conn.execute("SELECT nbytes FROM parse_cache WHERE path = ?", (path,)).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, content_hash, self.parser_version,
+                 payload, nbytes, time.time_ns()),
+            )
+            self._total_bytes += nbytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under max_bytes. Caller holds the lock."""
+        rows = self._conn.execute("SELECT path, nbytes FROM parse_cache ORDER BY last_access").fetchall()
+        for path, nbytes in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM parse_cache WHERE path = ?", (path,))
+            self._total_bytes -= nbytes
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT nbytes FROM parse_cache WHERE path = ?", (path,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM parse_cache WHERE path = ?", (path,))
+                self._total_bytes -= row[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM parse_cache")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def flush(self) -> None:
+        """Commit pending writes (called by parse_path at the end of a scan)."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": self._total_bytes}
@@ -8,82 +8,268 @@ Extracts:
  - simple complexity estimate (heuristic)
  - nesting depth
  - presence of docstring
+ - a normalized AST fingerprint of each undocumented function, equal for
+   copies that differ only in layout, comments or local names
 """
 import ast
+import hashlib
+import io
+import mmap
 import os
-from typing import Any, Dict, List, Optional
-def _extract_raises(node: ast.AST) -> List[str]:
-    raises = []
-    for n in ast.walk(node):
-        if isinstance(n, ast.Raise) and n.exc:
-            try:
-                raises.append(ast.unparse(n.exc))
-            except Exception:
-                pass
-    return raises
+import re
+import time
+import tokenize
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
 
+from core.parser.fingerprint import fingerprint as _fingerprint
+from core.parser.ignore import IgnoreMatcher
+from core.parser.parse_cache import Stamp, file_stamp
 
-def _has_yield(node: ast.AST) -> bool:
-    return any(isinstance(n, ast.Yield) for n in ast.walk(node))
+if TYPE_CHECKING:
+    from core.analysis.context import AnalysisContext
+    from core.parser.parse_cache import ParseCache
+    from core.parser.scan_profile import ScanProfile
 
+# bump whenever the shape or content of parse_file output changes;
+# persisted parse caches are keyed on it
+PARSER_VERSION = "6"
 
-def _extract_class_attributes(c: ast.ClassDef) -> List[str]:
-    attrs = []
-    for n in c.body:
-        if isinstance(n, ast.Assign):
-            for t in n.targets:
-                if isinstance(t, ast.Name):
-                    attrs.append(t.id)
-    return attrs
+# control-flow nodes that open a new nesting level
+_NESTING_NODES = (ast.If, ast.For, ast.While, ast.With, ast.Try)
+# nodes counted by the complexity heuristic
+_COMPLEXITY_NODES = _NESTING_NODES + (ast.ListComp, ast.DictComp, ast.SetComp,
+                                      ast.GeneratorExp, ast.IfExp)
 
 
-def _get_annotation_str(node: Optional[ast.AST]) -> Optional[str]:
-    if node is None:
+class _FunctionStats:
+    """Per-function metrics collected during the single module pass."""
+    __slots__ = ("raises", "yields", "branches", "max_depth")
+
+    def __init__(self):
+        self.raises: List[str] = []
+        self.yields = False
+        self.branches = 0
+        self.max_depth = 0
+
+
+_NEWLINE = re.compile(rb"\r\n?|\n")
+# a line break between tokens (continuation backslash and indentation included)
+_LINE_BREAK = re.compile(r"[ \t\f]*(?:\\?\n[ \t\f]*)+")
+_FSTRING_START = {getattr(tokenize, n) for n in ("FSTRING_START", "TSTRING_START") if hasattr(tokenize, n)}
+_FSTRING_END = {getattr(tokenize, n) for n in ("FSTRING_END", "TSTRING_END") if hasattr(tokenize, n)}
+_UTF8 = ("utf-8", "utf-8-sig")
+# files at least this large are mapped instead of read into a bytes object
+MMAP_THRESHOLD = 1 << 20
+
+
+class _SourceIndex:
+    """Line-offset index over a module's UTF-8 source buffer for slicing node text.
+
+    Replaces ast.unparse for annotations, defaults and raise expressions:
+    the text is taken verbatim from the source. ast column offsets count
+    UTF-8 bytes, so slices are taken straight from the buffer (a memoryview
+    over the bytes or mmap parse_file read) without decoding the whole file.
+    `base` is the offset of line 1, i.e. 3 after a UTF-8 BOM. Line starts
+    are computed on first use, so files without annotations never build the
+    index.
+    """
+    __slots__ = ("buf", "_base", "_starts")
+
+    def __init__(self, source: Union[str, bytes, memoryview, mmap.mmap], base: int = 0):
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        self.buf = memoryview(source)
+        self._base = base
+        self._starts: Optional[List[int]] = None
+
+    def _offset(self, lineno: int, col: int) -> int:
+        if self._starts is None:
+            self._starts = [self._base] + [m.end() for m in _NEWLINE.finditer(self.buf)]
+        return self._starts[lineno - 1] + col
+
+    def segment_view(self, node: ast.AST) -> Optional[memoryview]:
+        """Zero-copy view of the source bytes spanned by `node`."""
+        end_lineno = getattr(node, "end_lineno", None)
+        end_col = getattr(node, "end_col_offset", None)
+        if end_lineno is None or end_col is None:
+            return None
+        return self.buf[self._offset(node.lineno, node.col_offset):self._offset(end_lineno, end_col)]
+
+    def segment(self, node: ast.AST) -> Optional[str]:
+        view = self.segment_view(node)
+        if view is None:
+            return None
+        with view:
+            text = str(view, "utf-8")
+        if "\n" in text or "\r" in text:
+            if "#" in text:
+                # comments inside a multi-line expression: fall back to normalized text
+                return None
+            return _join_lines(text)
+        return text
+
+    def release(self) -> None:
+        """Drop the view so an underlying mmap can be closed."""
+        self.buf.release()
+
+
+def _join_lines(text: str) -> Optional[str]:
+    """Multi-line expression `text` on one line, or None if it does not tokenize.
+
+    Each line break between tokens becomes one space; string literals
+    (f-strings included) keep their text, line breaks and spacing verbatim.
+    """
+    # parenthesized, a fragment spanning lines tokenizes without NEWLINE/INDENT;
+    # line endings as the compiler reads them, so token rows match `starts`
+    wrapped = "(" + re.sub(r"\r\n?", "\n", text) + ")"
+    starts = [0] + [m.end() for m in re.finditer("\n", wrapped)]
+    literals: List[Tuple[int, int]] = []
+    depth = 0
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(wrapped).readline):
+            if tok.type in _FSTRING_START:
+                if not depth:
+                    start = starts[tok.start[0] - 1] + tok.start[1]
+                depth += 1
+            elif tok.type in _FSTRING_END:
+                depth -= 1
+                if not depth:
+                    literals.append((start, starts[tok.end[0] - 1] + tok.end[1]))
+            elif tok.type == tokenize.STRING and not depth:
+                literals.append((starts[tok.start[0] - 1] + tok.start[1], starts[tok.end[0] - 1] + tok.end[1]))
+    except (tokenize.TokenError, SyntaxError):
         return None
+    out = []
+    pos = 0
+    for start, end in literals + [(len(wrapped), len(wrapped))]:
+        out.append(_LINE_BREAK.sub(" ", wrapped[pos:start]))
+        out.append(wrapped[start:end])
+        pos = end
+    return "".join(out)[1:-1]
+
+
+def _node_text(node: ast.AST, src: Optional[_SourceIndex]) -> Optional[str]:
+    """Source text of `node`; ast.unparse only when no source slice is available."""
+    if src is not None:
+        text = src.segment(node)
+        if text is not None:
+            return text
     try:
         # ast.unparse available in 3.9+
         return ast.unparse(node)
     except Exception:
         return None
 
-def _get_default_str(node: Optional[ast.AST]) -> Optional[str]:
-    if node is None:
+
+@lru_cache(maxsize=4096)
+def normalize_annotation(text: Optional[str]) -> Optional[str]:
+    """Canonical ast.unparse form of an annotation/expression string.
+
+    The parser reports expressions as written in the source; call this when a
+    consumer needs normalized text (e.g. to compare `Dict[str,int]` with
+    `Dict[str, int]`). Computed lazily and memoized.
+    """
+    if text is None:
         return None
     try:
-        return ast.unparse(node)
-    except Exception:
-        return None
+        return ast.unparse(ast.parse(text, mode="eval").body)
+    except SyntaxError:
+        return text
 
-def _simple_complexity(node: ast.FunctionDef) -> int:
-    """Heuristic complexity: count branches, loops, comprehensions, calls."""
-    counter = 0
-    for n in ast.walk(node):
-        if isinstance(n, (ast.If, ast.For, ast.While, ast.With, ast.Try,
-                          ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp,
-                          ast.IfExp)):
-            counter += 1
-        if isinstance(n, ast.Call):
-            counter += 0  # don't blow up, keep calls neutral
-    # Add length factor
-    lines = (getattr(node, "end_lineno", node.lineno) - node.lineno) if getattr(node, "end_lineno", None) else 0
-    return max(1, counter + (lines // 10))
 
-def _max_nesting_depth(node: ast.FunctionDef) -> int:
-    """Compute max nesting depth for control flow inside function."""
-    max_depth = 0
+def _scan_module(tree: ast.AST, src: Optional[_SourceIndex] = None) -> Tuple[Dict[ast.AST, _FunctionStats], List[str], int]:
+    """Walk the module once, collecting function metrics, imports and the node count.
+
+    Metrics are gathered for top-level functions and methods of top-level
+    classes (the nodes reported by parse_functions / parse_classes). The walk
+    is breadth-first like ast.walk, so `raises` keeps the same order the
+    old per-helper walks produced.
+    """
+    targets = set()
+    for n in getattr(tree, "body", []):
+        if isinstance(n, ast.FunctionDef):
+            targets.add(n)
+        elif isinstance(n, ast.ClassDef):
+            targets.update(m for m in n.body if isinstance(m, ast.FunctionDef))
 
-    def walk(n: ast.AST, depth: int):
-        nonlocal max_depth
-        if isinstance(n, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
-            depth += 1
-            max_depth = max(max_depth, depth)
+    stats: Dict[ast.AST, _FunctionStats] = {}
+    imports: List[str] = []
+    n_nodes = 0
+    queue = deque([(tree, 0, None)])
+    while queue:
+        n, depth, current = queue.popleft()
+        n_nodes += 1
+        if n in targets:
+            current = _FunctionStats()
+            stats[n] = current
+            depth = 0
+        if isinstance(n, (ast.Import, ast.ImportFrom)):
+            imports.extend(_import_names(n))
+        if current is not None:
+            if isinstance(n, _COMPLEXITY_NODES):
+                current.branches += 1
+            if isinstance(n, _NESTING_NODES):
+                depth += 1
+                current.max_depth = max(current.max_depth, depth)
+            elif isinstance(n, ast.Raise) and n.exc:
+                text = _node_text(n.exc, src)
+                if text is not None:
+                    current.raises.append(text)
+            elif isinstance(n, ast.Yield):
+                current.yields = True
         for child in ast.iter_child_nodes(n):
-            walk(child, depth)
+            queue.append((child, depth, current))
+    return stats, sorted(set(imports)), n_nodes
+
+
+def _function_stats(node: ast.FunctionDef, stats: Optional[Dict[ast.AST, _FunctionStats]]) -> _FunctionStats:
+    if stats is not None and node in stats:
+        return stats[node]
+    # called on a node outside the scanned module: scan just this function
+    return _scan_module(ast.Module(body=[node], type_ignores=[]))[0][node]
+
+
+def _simple_complexity(node: ast.FunctionDef, fs: _FunctionStats) -> int:
+    """Heuristic complexity: count branches, loops, comprehensions, plus a length factor."""
+    lines = (getattr(node, "end_lineno", node.lineno) - node.lineno) if getattr(node, "end_lineno", None) else 0
+    return max(1, fs.branches + (lines // 10))
 
-    walk(node, 0)
-    return max_depth
 
-def parse_functions(node: ast.AST) -> List[Dict[str, Any]]:
+def _extract_class_attributes(c: ast.ClassDef) -> List[str]:
+    attrs = []
+    for n in c.body:
+        if isinstance(n, ast.Assign):
+            for t in n.targets:
+                if isinstance(t, ast.Name):
+                    attrs.append(t.id)
+    return attrs
+
+
+def _get_annotation_str(node: Optional[ast.AST], src: Optional[_SourceIndex] = None) -> Optional[str]:
+    if node is None:
+        return None
+    return _node_text(node, src)
+
+def _get_default_str(node: Optional[ast.AST], src: Optional[_SourceIndex] = None) -> Optional[str]:
+    if node is None:
+        return None
+    return _node_text(node, src)
+
+def _body_hash(node: ast.AST, src: Optional[_SourceIndex]) -> Optional[str]:
+    """Digest of a function's source bytes; equal across scans while it is unedited."""
+    view = src.segment_view(node) if src is not None else None
+    if view is None:
+        return None
+    with view:
+        return hashlib.blake2b(view, digest_size=16).hexdigest()
+
+def parse_functions(node: ast.AST, stats: Optional[Dict[ast.AST, _FunctionStats]] = None,
+                    src: Optional[_SourceIndex] = None) -> List[Dict[str, Any]]:
+    if stats is None:
+        stats = _scan_module(node, src)[0]
     results = []
     for n in [c for c in node.body if isinstance(c, ast.FunctionDef)]:
         args = []
@@ -91,19 +277,21 @@ def parse_functions(node: ast.AST) -> List[Dict[str, Any]]:
         for a in n.args.args:
             args.append({
                 "name": a.arg,
-                "annotation": _get_annotation_str(a.annotation) if getattr(a, "annotation", None) else None,
+                "annotation": _get_annotation_str(a.annotation, src) if getattr(a, "annotation", None) else None,
             })
         # kwonlyargs
         for a in getattr(n.args, "kwonlyargs", []):
             args.append({
                 "name": a.arg,
-                "annotation": _get_annotation_str(a.annotation) if getattr(a, "annotation", None) else None,
+                "annotation": _get_annotation_str(a.annotation, src) if getattr(a, "annotation", None) else None,
             })
         # defaults alignment
         defaults = []
         for d in getattr(n.args, "defaults", []):
-            defaults.append(_get_default_str(d))
-        returns = _get_annotation_str(n.returns)
+            defaults.append(_get_default_str(d, src))
+        returns = _get_annotation_str(n.returns, src)
+        fs = _function_stats(n, stats)
+        has_docstring = bool(ast.get_docstring(n))
         item = {
             "type": "function",
             "name": n.name,
@@ -112,36 +300,46 @@ def parse_functions(node: ast.AST) -> List[Dict[str, Any]]:
             "args": args,
             "defaults": defaults,
             "returns": returns,
-            "has_docstring": bool(ast.get_docstring(n)),
-            "complexity": _simple_complexity(n),
-            "nesting_depth": _max_nesting_depth(n),
-            "raises": _extract_raises(n),
-            "yields": _has_yield(n),
+            "has_docstring": has_docstring,
+            "complexity": _simple_complexity(n, fs),
+            "nesting_depth": fs.max_depth,
+            "raises": fs.raises,
+            "yields": fs.yields,
             "indent": n.col_offset + 4,
+            "body_hash": _body_hash(n, src),
+            "fingerprint": None if has_docstring else _fingerprint(n),
               }
         results.append(item)
     return results
 
-def parse_classes(node: ast.AST) -> List[Dict[str, Any]]:
+def parse_classes(node: ast.AST, stats: Optional[Dict[ast.AST, _FunctionStats]] = None,
+                  src: Optional[_SourceIndex] = None) -> List[Dict[str, Any]]:
+    if stats is None:
+        stats = _scan_module(node, src)[0]
     classes = []
     for c in [c for c in node.body if isinstance(c, ast.ClassDef)]:
         methods = []
+        class_attributes = _extract_class_attributes(c)
         for m in [m for m in c.body if isinstance(m, ast.FunctionDef)]:
+            fs = _function_stats(m, stats)
+            has_docstring = bool(ast.get_docstring(m))
             args = []
             for a in m.args.args:
-                args.append({"name": a.arg, "annotation": _get_annotation_str(a.annotation) if getattr(a, "annotation", None) else None})
+                args.append({"name": a.arg, "annotation": _get_annotation_str(a.annotation, src) if getattr(a, "annotation", None) else None})
             methods.append({
                 "type": "method",
                 "name": m.name,
                 "lineno": m.lineno,
                 "end_lineno": getattr(m, "end_lineno", None),
                 "args": args,
-                "returns": _get_annotation_str(m.returns),
-                "has_docstring": bool(ast.get_docstring(m)),
-                "complexity": _simple_complexity(m),
-                "nesting_depth": _max_nesting_depth(m),
-                "class_attributes": _extract_class_attributes(c),
+                "returns": _get_annotation_str(m.returns, src),
+                "has_docstring": has_docstring,
+                "complexity": _simple_complexity(m, fs),
+                "nesting_depth": fs.max_depth,
+                "class_attributes": list(class_attributes),
                 "indent": m.col_offset + 4,
+                "body_hash": _body_hash(m, src),
+                "fingerprint": None if has_docstring else _fingerprint(m),
 
             })
         classes.append({
@@ -154,49 +352,395 @@ def parse_classes(node: ast.AST) -> List[Dict[str, Any]]:
         })
     return classes
 
+def _import_names(n: Union[ast.Import, ast.ImportFrom]) -> List[str]:
+    """Dotted names bound by one import; relative imports keep their leading dots."""
+    if isinstance(n, ast.Import):
+        return [alias.name for alias in n.names]
+    module = "." * n.level + (n.module or "")
+    sep = "." if n.module else ""
+    return [f"{module}{sep}{alias.name}" for alias in n.names]
+
 def parse_imports(node: ast.AST) -> List[str]:
     imports = []
     for n in ast.walk(node):
-        if isinstance(n, ast.Import):
-            for alias in n.names:
-                imports.append(alias.name)
-        elif isinstance(n, ast.ImportFrom):
-            module = n.module or ""
-            for alias in n.names:
-                imports.append(f"{module}.{alias.name}" if module else alias.name)
+        if isinstance(n, (ast.Import, ast.ImportFrom)):
+            imports.extend(_import_names(n))
     return sorted(set(imports))
 
-def parse_file(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        source = f.read()
-    tree = ast.parse(source)
+def parse_file(path: str, context: Optional["AnalysisContext"] = None,
+               stamps: Optional[Dict[str, Stamp]] = None) -> Dict[str, Any]:
+    """Parse one python file into a per-file dict.
+
+    With an AnalysisContext the bytes, AST and line index come from (and stay
+    in) the context, so later analyses of the same file reuse them.
+    stamps: receives path -> file_stamp of the bytes parsed (for ParseCache.put)
+    """
+    if context is not None:
+        return _parse_in_context(path, context, {}, stamps)
+    return _parse_file_timed(path, {}, stamps)
+
+
+def _parse_in_context(path: str, context: "AnalysisContext", timing: Dict[str, Any],
+                      stamps: Optional[Dict[str, Stamp]] = None) -> Dict[str, Any]:
+    """parse_file through `context`, recording the same timing keys (read_s covers read and parse)."""
+    t0 = time.perf_counter()
+    module = context.get(path)
+    t1 = time.perf_counter()
+    timing["bytes"] = module.size
+    timing["read_s"] = t1 - t0
+    if stamps is not None:
+        mtime_ns = module.signature[0] if module.signature else os.stat(path).st_mtime_ns
+        stamps[path] = file_stamp(module.data, mtime_ns)
+    result, n_nodes = _extract(path, module.tree, module.data, module.index)
+    timing["extract_s"] = time.perf_counter() - t1
+    timing["nodes"] = n_nodes
+    return result
+
+
+def _parse_file_timed(path: str, timing: Dict[str, Any],
+                      stamps: Optional[Dict[str, Stamp]] = None) -> Dict[str, Any]:
+    """parse_file that records per-phase timings into `timing` as it goes.
+
+    Keys: bytes, read_s, parse_s, extract_s, nodes. A file that fails keeps
+    the phases it completed.
+    """
+    t0 = time.perf_counter()
+    mtime_ns = os.stat(path).st_mtime_ns if stamps is not None else 0
+    data = _read_source(path)
+    if stamps is not None:
+        stamps[path] = file_stamp(data, mtime_ns)
+    t1 = time.perf_counter()
+    timing["bytes"] = len(data)
+    timing["read_s"] = t1 - t0
+    try:
+        # bytes go to the compiler as-is, so it applies the coding cookie / BOM
+        tree = ast.parse(data)
+        t2 = time.perf_counter()
+        timing["parse_s"] = t2 - t1
+        result, n_nodes = _extract(path, tree, data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    timing["extract_s"] = time.perf_counter() - t2
+    timing["nodes"] = n_nodes
+    return result
+
+def parse_source(data: bytes, path: str) -> Dict[str, Any]:
+    """parse_file for contents that are not read from `path` (e.g. a git blob)."""
+    return _extract(path, ast.parse(data), data)[0]
+
+def _extract(path: str, tree: ast.Module, data: Union[bytes, mmap.mmap],
+             src: Optional[_SourceIndex] = None) -> Tuple[Dict[str, Any], int]:
+    """parse_file result for an already parsed module, plus its node count.
+
+    A caller-supplied `src` index is left open; otherwise one is built and
+    released here.
+    """
+    owned = src is None
+    if owned:
+        src = _source_index(data)
+    try:
+        stats, imports, n_nodes = _scan_module(tree, src)
+        result = {
+            "path": path,
+            "functions": parse_functions(tree, stats, src),
+            "classes": parse_classes(tree, stats, src),
+            "imports": imports,
+            "module_docstring": bool(ast.get_docstring(tree))
+        }
+    finally:
+        if owned:
+            src.release()
+    return result, n_nodes
+
+def _read_source(path: str) -> Union[bytes, mmap.mmap]:
+    """Raw file contents; large files are memory-mapped rather than copied."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+def _source_encoding(data: Union[bytes, mmap.mmap]) -> str:
+    """PEP 263 / BOM encoding of `data`, reading at most its first two lines."""
+    pos = 0
+
+    def readline() -> bytes:
+        nonlocal pos
+        end = data.find(b"\n", pos)
+        end = len(data) if end < 0 else end + 1
+        line = data[pos:end]
+        pos = end
+        return line
+
+    return tokenize.detect_encoding(readline)[0]
+
+def _source_index(data: Union[bytes, mmap.mmap]) -> _SourceIndex:
+    """Index over `data`, which must already have parsed.
+
+    UTF-8 files are indexed in place. Files in any other declared encoding
+    are re-encoded once, since ast offsets refer to the UTF-8 form.
+    """
+    encoding = _source_encoding(data)
+    if encoding not in _UTF8:
+        return _SourceIndex(str(data, encoding))
+    return _SourceIndex(data, 3 if encoding == "utf-8-sig" else 0)
+
+def _is_source_name(name: str, include_init: bool = False) -> bool:
+    """True for the .py file names a scan parses: no dunder files (bar __init__.py if include_init)."""
+    return name.endswith(".py") and (not name.startswith("__") or (include_init and name == "__init__.py"))
+
+
+def _iter_py_files(path: str, recursive: bool, skip_dirs: List[str],
+                   ignore: Optional[IgnoreMatcher] = None, include_init: bool = False) -> Iterator[str]:
+    """Yield .py files under `path` in os.walk order.
+
+    With an IgnoreMatcher, ignored directories are pruned before descending
+    and ignored files are skipped. Package __init__.py files are left out
+    of scans (and so of coverage) unless include_init is set.
+    """
+    for root, dirs, files in os.walk(path):
+        # filter skip dirs
+        dirs[:] = [d for d in dirs if d not in skip_dirs]
+        if ignore is not None:
+            ignore.prune(root, dirs)
+        for fn in files:
+            if _is_source_name(fn, include_init):
+                fp = os.path.join(root, fn)
+                if ignore is None or not ignore.skip_file(fp):
+                    yield fp
+        if not recursive:
+            break
+
+
+def _collect_py_files(path: str, recursive: bool, skip_dirs: List[str],
+                      ignore: Optional[IgnoreMatcher] = None, include_init: bool = False) -> List[str]:
+    """Return .py files under `path` in os.walk order."""
+    return list(_iter_py_files(path, recursive, skip_dirs, ignore, include_init))
+
+
+def _error_record(path: str, exc: Exception) -> Dict[str, Any]:
     return {
         "path": path,
-        "functions": parse_functions(tree),
-        "classes": parse_classes(tree),
-        "imports": parse_imports(tree),
-        "module_docstring": bool(ast.get_docstring(tree))
+        "error": type(exc).__name__,
+        "message": str(exc),
+        "lineno": getattr(exc, "lineno", None),
     }
 
-def parse_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-    """Walk a file or directory and parse python files. Returns list of per-file dicts."""
+
+def _parse_chunk(chunk: List[Tuple[int, str]], stamp: bool = False,
+                 context: Optional["AnalysisContext"] = None) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, Any], Optional[Stamp]]]:
+    """Worker entry point: parse (index, path) pairs, never raising.
+
+    Yields (index, result, error record, timing, stamp) tuples; with
+    stamp=True, stamp is the file_stamp of the bytes parsed (else None).
+    With a context (in process only) the files are parsed through it.
+    """
+    out = []
+    for idx, fp in chunk:
+        timing: Dict[str, Any] = {"path": fp}
+        stamps: Optional[Dict[str, Stamp]] = {} if stamp else None
+        try:
+            if context is not None:
+                result = _parse_in_context(fp, context, timing, stamps)
+            else:
+                result = _parse_file_timed(fp, timing, stamps)
+            out.append((idx, result, None, timing, stamps[fp] if stamp else None))
+        except Exception as e:
+            timing["error"] = type(e).__name__
+            out.append((idx, None, _error_record(fp, e), timing, None))
+    return out
+
+
+def _balanced_chunks(files: List[Tuple[int, str]], n_chunks: int) -> List[List[Tuple[int, str]]]:
+    """Split (index, path) pairs into n_chunks with roughly equal total byte size (largest first)."""
+    sized = []
+    for idx, fp in files:
+        try:
+            size = os.path.getsize(fp)
+        except OSError:
+            size = 0
+        sized.append((size, idx, fp))
+    sized.sort(reverse=True)
+    chunks: List[List[Tuple[int, str]]] = [[] for _ in range(n_chunks)]
+    loads = [0] * n_chunks
+    for size, idx, fp in sized:
+        target = loads.index(min(loads))
+        chunks[target].append((idx, fp))
+        loads[target] += size
+    return [c for c in chunks if c]
+
+
+def _resolve_workers(workers: Union[int, str, None]) -> int:
+    if workers == "auto":
+        return os.cpu_count() or 1
+    if workers is None:
+        return 1
+    return max(1, int(workers))
+
+
+def parse_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None,
+               workers: Union[int, str, None] = None,
+               errors: Optional[List[Dict[str, Any]]] = None,
+               cache: Optional["ParseCache"] = None,
+               profile: Optional["ScanProfile"] = None,
+               ignore_files: bool = True,
+               context: Optional["AnalysisContext"] = None) -> List[Dict[str, Any]]:
+    """Walk a file or directory and parse python files. Returns list of per-file dicts.
+
+    workers: number of processes to parse with ("auto" = one per CPU). Results
+        keep the serial walk order regardless of worker count.
+    errors: optional list that receives one record per file that failed to
+        parse ({"path", "error", "message", "lineno"}).
+    cache: optional ParseCache; unchanged files are served from it and only
+        the misses are parsed.
+    profile: optional ScanProfile that receives per-file read/parse/extract
+        timings, byte size and node count.
+    ignore_files: honour .gitignore files and [tool.code-reviewer] globs, and
+        skip virtualenvs (see core.parser.ignore); skip_dirs always applies.
+    context: optional AnalysisContext; the misses are then parsed through it
+        (in process, whatever `workers` says), so later analyses reuse them
+    """
     if skip_dirs is None:
         skip_dirs = ["venv", ".venv", "__pycache__", ".git"]
+    started = time.perf_counter()
     results = []
     if os.path.isfile(path) and path.endswith(".py"):
-        results.append(parse_file(path))
+        timing: Dict[str, Any] = {"path": path}
+        if context is not None:
+            results.append(_parse_in_context(path, context, timing))
+        else:
+            results.append(_parse_file_timed(path, timing))
+        if profile is not None:
+            profile.add(timing)
         return results
-    for root, dirs, files in os.walk(path):
-        # filter skip dirs
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fn in files:
-            if fn.endswith(".py") and not fn.startswith("__"):
-                fp = os.path.join(root, fn)
-                try:
-                    results.append(parse_file(fp))
-                except Exception:
-                    # continue on parse errors
-                    pass
-        if not recursive:
-            break
+    ignore = IgnoreMatcher(path, skip_dirs=skip_dirs) if ignore_files else None
+    files = _collect_py_files(path, recursive, skip_dirs, ignore)
+
+    parsed = []
+    todo = list(enumerate(files))
+    if cache is not None:
+        todo = []
+        for idx, fp in enumerate(files):
+            hit = cache.get(fp)
+            if hit is not None:
+                parsed.append((idx, hit, None, None, None))
+            else:
+                todo.append((idx, fp))
+
+    want_stamps = cache is not None
+    n_workers = min(_resolve_workers(workers), len(todo))
+    if n_workers <= 1 or context is not None:
+        fresh = _parse_chunk(todo, want_stamps, context)
+    else:
+        # several chunks per worker so one slow chunk doesn't stall the pool
+        chunks = _balanced_chunks(todo, n_workers * 4)
+        fresh = []
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for part in pool.map(_parse_chunk, chunks, [want_stamps] * len(chunks)):
+                fresh.extend(part)
+
+    if cache is not None:
+        for _, result, _, _, stamp in fresh:
+            if result is not None:
+                cache.put(result["path"], result, stamp)
+        cache.flush()
+    parsed.extend(fresh)
+    parsed.sort(key=lambda item: item[0])
+
+    for _, result, error, timing, _ in parsed:
+        if profile is not None:
+            profile.add(timing)
+        if result is not None:
+            results.append(result)
+        elif errors is not None:
+            errors.append(error)
+    if profile is not None:
+        profile.wall_s += time.perf_counter() - started
     return results
+
+
+def iter_parse_path(path: str, recursive: bool = True, skip_dirs: Optional[List[str]] = None,
+                    workers: Union[int, str, None] = None,
+                    errors: Optional[List[Dict[str, Any]]] = None,
+                    cache: Optional["ParseCache"] = None,
+                    chunk_size: int = 16,
+                    profile: Optional["ScanProfile"] = None,
+                    ignore_files: bool = True) -> Iterator[Dict[str, Any]]:
+    """Streaming parse_path: yield per-file dicts one at a time, in serial walk order.
+
+    Takes the same options as parse_path. Nothing is accumulated: serially
+    only the current file is held, and with workers only a bounded window of
+    `chunk_size`-file batches is in flight at once.
+    """
+    if skip_dirs is None:
+        skip_dirs = ["venv", ".venv", "__pycache__", ".git"]
+    if os.path.isfile(path) and path.endswith(".py"):
+        timing: Dict[str, Any] = {"path": path}
+        yield _parse_file_timed(path, timing)
+        if profile is not None:
+            profile.add(timing)
+        return
+    ignore = IgnoreMatcher(path, skip_dirs=skip_dirs) if ignore_files else None
+    files = _iter_py_files(path, recursive, skip_dirs, ignore)
+    n_workers = _resolve_workers(workers)
+    started = time.perf_counter()
+    try:
+        if n_workers <= 1:
+            for fp in files:
+                yield from _emit(_resolve_batch([fp], cache), cache, errors, profile)
+            return
+
+        window: deque = deque()
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            batch: List[str] = []
+            for fp in files:
+                batch.append(fp)
+                if len(batch) == chunk_size:
+                    window.append(_resolve_batch(batch, cache, pool.submit))
+                    batch = []
+                    if len(window) >= n_workers * 2:
+                        yield from _emit(window.popleft(), cache, errors, profile)
+            if batch:
+                window.append(_resolve_batch(batch, cache, pool.submit))
+            while window:
+                yield from _emit(window.popleft(), cache, errors, profile)
+    finally:
+        if cache is not None:
+            cache.flush()
+        if profile is not None:
+            profile.wall_s += time.perf_counter() - started
+
+
+def _resolve_batch(batch: List[str], cache: Optional["ParseCache"], submit=None):
+    """Serve cache hits for `batch`; parse the misses inline or via `submit` (a pool's submit)."""
+    hits: Dict[int, Dict[str, Any]] = {}
+    todo = []
+    for idx, fp in enumerate(batch):
+        hit = cache.get(fp) if cache is not None else None
+        if hit is not None:
+            hits[idx] = hit
+        else:
+            todo.append((idx, fp))
+    if submit is None or not todo:
+        return hits, _parse_chunk(todo, cache is not None)
+    return hits, submit(_parse_chunk, todo, cache is not None)
+
+
+def _emit(part, cache: Optional["ParseCache"], errors: Optional[List[Dict[str, Any]]],
+          profile: Optional["ScanProfile"] = None) -> Iterator[Dict[str, Any]]:
+    hits, pending = part
+    fresh = pending if isinstance(pending, list) else pending.result()
+    merged = [(idx, hit, None, None) for idx, hit in hits.items()]
+    for idx, result, error, timing, stamp in fresh:
+        if result is not None and cache is not None:
+            cache.put(result["path"], result, stamp)
+        merged.append((idx, result, error, timing))
+    merged.sort(key=lambda item: item[0])
+    for _, result, error, timing in merged:
+        if profile is not None:
+            profile.add(timing)
+        if result is not None:
+            yield result
+        elif errors is not None:
+            errors.append(error)
+
@@ -0,0 +1,58 @@
+# core/parser/scan_profile.py
+"""Per-file scan instrumentation.
+
+Pass a ScanProfile to parse_path / iter_parse_path to record, for every
+parsed file, read time, ast.parse time, extraction time (metrics, imports,
+annotation text), byte size and AST node count. Files served from the parse
+cache are only counted.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PROFILE_PATH = "storage/reports/scan_profile.json"
+PHASES = ("read_s", "parse_s", "extract_s")
+
+
+class ScanProfile:
+    """Collects per-file timing records produced during a scan."""
+
+    def __init__(self):
+        self.files: List[Dict[str, Any]] = []
+        self.cached = 0
+        self.wall_s = 0.0
+
+    def add(self, timing: Optional[Dict[str, Any]]) -> None:
+        """Record one file; None marks a parse-cache hit."""
+        if timing is None:
+            self.cached += 1
+            return
+        record = dict(timing)
+        for phase in PHASES:
+            record.setdefault(phase, 0.0)
+        record.setdefault("bytes", 0)
+        record.setdefault("nodes", 0)
+        record["total_s"] = sum(record[p] for p in PHASES)
+        self.files.append(record)
+
+    def totals(self) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {p: round(sum(f[p] for f in self.files), 6) for p in PHASES}
+        totals["total_s"] = round(sum(totals[p] for p in PHASES), 6)
+        totals["wall_s"] = round(self.wall_s, 6)
+        totals["files_parsed"] = len(self.files)
+        totals["files_cached"] = self.cached
+        totals["files_failed"] = sum(1 for f in self.files if "error" in f)
+        totals["bytes"] = sum(f["bytes"] for f in self.files)
+        totals["nodes"] = sum(f["nodes"] for f in self.files)
+        return totals
+
+    def slowest(self, n: int = 10) -> List[Dict[str, Any]]:
+        return sorted(self.files, key=lambda f: f["total_s"], reverse=True)[:n]
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        return {"totals": self.totals(), "slowest": self.slowest(top)}
+
+    def write(self, path: str = DEFAULT_PROFILE_PATH, top: int = 20) -> None:
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(self.to_dict(top), indent=2), encoding="utf-8")
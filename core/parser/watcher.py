@@ -0,0 +1,336 @@
+# core/parser/watcher.py
+"""Watch a project tree and keep scan results and coverage up to date.
+
+ScanWatcher runs one full scan, then re-parses only the .py files that were
+created, modified or deleted since the last poll, patching the results list
+and the coverage report in place. Changes are detected with inotify on
+Linux (via ctypes, no extra dependency) and by mtime polling elsewhere.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from core.parser.ignore import IgnoreMatcher
+from core.parser.models import FileInfo, compact_results
+from core.parser.python_parser import _collect_py_files, _error_record, _is_source_name, parse_file, parse_path
+from core.reporter.coverage_reporter import compute_coverage, fingerprint_counts, update_coverage
+
+DEFAULT_SKIP_DIRS = ["venv", ".venv", "__pycache__", ".git"]
+
+# inotify(7) event masks
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _PollingBackend:
+    """Detect changes by comparing (mtime_ns, size) snapshots of the tree."""
+
+    def __init__(self, root: str, skip_dirs: List[str], ignore: Optional[IgnoreMatcher] = None,
+                 include_init: bool = False):
+        self.root = root
+        self.skip_dirs = skip_dirs
+        self.ignore = ignore
+        self.include_init = include_init
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snap = {}
+        for fp in _collect_py_files(self.root, True, self.skip_dirs, self.ignore, self.include_init):
+            try:
+                st = os.stat(fp)
+            except OSError:
+                continue
+            snap[fp] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        if timeout:
+            time.sleep(timeout)
+        new = self._snapshot()
+        touched = {fp for fp, sig in new.items() if self.snapshot.get(fp) != sig}
+        touched.update(fp for fp in self.snapshot if fp not in new)
+        self.snapshot = new
+        return touched
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyBackend:
+    """Linux inotify watches on every directory of the tree."""
+
+    def __init__(self, root: str, skip_dirs: List[str], ignore: Optional[IgnoreMatcher] = None,
+                 include_init: bool = False):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.skip_dirs = skip_dirs
+        self.ignore = ignore
+        self.include_init = include_init
+        self.dirs: Dict[int, str] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, top: str) -> Set[str]:
+        """Watch `top` and its subdirectories; return the .py files found under it."""
+        found = set()
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+            if self.ignore is not None:
+                self.ignore.prune(root, dirs)
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(root), _WATCH_MASK)
+            if wd >= 0:
+                self.dirs[wd] = root
+            found.update(os.path.join(root, fn) for fn in files
+                         if _is_source_name(fn, self.include_init)
+                         and not self._ignored(os.path.join(root, fn)))
+        return found
+
+    def _ignored(self, path: str, is_dir: bool = False) -> bool:
+        if self.ignore is None:
+            return False
+        return self.ignore.skip_dir(path) if is_dir else self.ignore.skip_file(path)
+
+    def poll(self, timeout: float) -> Optional[Set[str]]:
+        """Return touched paths, or None when events were lost and a resync is needed."""
+        touched: Set[str] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    return None
+                parent = self.dirs.get(wd)
+                if parent is None:
+                    continue
+                if mask & _IN_DELETE_SELF:
+                    self.dirs.pop(wd, None)
+                    continue
+                path = os.path.join(parent, name)
+                if mask & _IN_ISDIR:
+                    if name in self.skip_dirs or (mask & (_IN_CREATE | _IN_MOVED_TO) and self._ignored(path, True)):
+                        continue
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        touched.update(self._add_tree(path))
+                    elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                        # the watcher resolves files under a vanished dir itself
+                        touched.add(path + os.sep)
+                elif _is_source_name(name, self.include_init) and not self._ignored(path):
+                    touched.add(path)
+            ready, _, _ = select.select([self.fd], [], [], 0)
+        return touched
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ScanWatcher:
+    """Keep parse results and the coverage report in sync with a directory.
+
+    results / report are the same objects the caller stores (e.g. in
+    st.session_state) and are patched in place by poll(). With compact=True
+    results are held as FileInfo objects (see core.parser.models). An
+    optional SymbolIndex (core.search.symbol_index) is filled from the
+    results and kept in sync the same way, as is an optional ImportGraph
+    (core.parser.import_graph); with a graph, poll() also reports under
+    "dependents" the unchanged files importing a module whose public
+    signature changed and drops their parse cache entries, so callers can
+    invalidate their own per-file caches for the same set. The graph also
+    tracks package __init__.py files, so re-exports count as edges, but
+    those stay out of results and the coverage report, as in parse_path.
+    The initial scan and rescans go through `context` (an AnalysisContext)
+    when one is given, so other analyses of a file reuse its AST.
+    """
+
+    def __init__(self, root: str, skip_dirs: Optional[List[str]] = None,
+                 cache=None, use_inotify: Optional[bool] = None,
+                 results: Optional[List[Dict[str, Any]]] = None,
+                 report: Optional[Dict[str, Any]] = None,
+                 compact: bool = False, profile=None, index=None, graph=None, context=None):
+        self.root = root
+        self.compact = compact
+        self.context = context
+        self.skip_dirs = skip_dirs if skip_dirs is not None else DEFAULT_SKIP_DIRS
+        self.cache = cache
+        self.errors: Dict[str, Dict[str, Any]] = {}
+        # .gitignore / pyproject rules are read once; edits to them need a new watcher
+        self.ignore = IgnoreMatcher(root, skip_dirs=self.skip_dirs)
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self._with_inits = graph is not None
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = _InotifyBackend(root, self.skip_dirs, self.ignore, self._with_inits)
+            except (OSError, AttributeError):
+                self.backend = None
+        if self.backend is None:
+            self.backend = _PollingBackend(root, self.skip_dirs, self.ignore, self._with_inits)
+
+        if results is None:
+            errors: List[Dict[str, Any]] = []
+            results = parse_path(root, skip_dirs=self.skip_dirs, cache=cache, errors=errors, profile=profile,
+                                 context=context)
+            self.errors = {e["path"]: e for e in errors}
+        if compact:
+            results[:] = compact_results(results)
+        self.results = results
+        self.report = report if report is not None else compute_coverage(results)
+        # patched per change, so the dedup counts never need a pass over every file
+        self._fingerprints = fingerprint_counts(self.report)
+        self._index = {r["path"]: i for i, r in enumerate(self.results)}
+        self.index = index
+        if index is not None:
+            index.clear()
+            for r in self.results:
+                index.add_file(r)
+        self.graph = graph
+        # package __init__.py results, seen only by the graph
+        self._packages: Dict[str, Dict[str, Any]] = {}
+        if graph is not None:
+            for fp in self._package_files():
+                try:
+                    self._packages[fp] = parse_file(fp, context)
+                except Exception:
+                    continue
+            graph.reset(self.results + list(self._packages.values()))
+
+    @property
+    def backend_name(self) -> str:
+        return "inotify" if isinstance(self.backend, _InotifyBackend) else "polling"
+
+    def _package_files(self) -> List[str]:
+        return [fp for fp in _collect_py_files(self.root, True, self.skip_dirs, self.ignore, include_init=True)
+                if os.path.basename(fp) == "__init__.py"]
+
+    def _resync(self) -> Set[str]:
+        current = set(_collect_py_files(self.root, True, self.skip_dirs, self.ignore, self._with_inits))
+        return current | set(self._index) | set(self._packages)
+
+    def poll(self, timeout: float = 0.0) -> Dict[str, List[str]]:
+        """Apply pending file changes. Returns {"created", "modified", "deleted", "dependents"} paths."""
+        touched = self.backend.poll(timeout)
+        if touched is None:
+            touched = self._resync()
+        # a removed directory shows up as "dir/"; expand it to the files we knew
+        for prefix in [t for t in touched if t.endswith(os.sep)]:
+            touched.discard(prefix)
+            touched.update(p for p in self._index if p.startswith(prefix))
+            touched.update(p for p in self._packages if p.startswith(prefix))
+        return self.apply_changes(touched)
+
+    def apply_changes(self, touched: Set[str]) -> Dict[str, List[str]]:
+        delta: Dict[str, List[str]] = {"created": [], "modified": [], "deleted": [], "dependents": []}
+        changed_results = []
+        stale: Set[str] = set()
+        for fp in sorted(touched):
+            if os.path.basename(fp) == "__init__.py":
+                if self.graph is not None:
+                    stale |= self._update_package(fp)
+                continue
+            if not os.path.isfile(fp):
+                if fp in self._index:
+                    delta["deleted"].append(fp)
+                self.errors.pop(fp, None)
+                if self.cache is not None:
+                    self.cache.invalidate(fp)
+                if self.index is not None:
+                    self.index.remove_file(fp)
+                if self.graph is not None:
+                    stale |= self.graph.remove_file(fp)
+                if self.context is not None:
+                    self.context.release(fp)
+                continue
+            stamps: Dict[str, Any] = {}
+            try:
+                result = parse_file(fp, self.context, stamps)
+            except Exception as e:
+                # keep the last good result while the file is mid-edit
+                self.errors[fp] = _error_record(fp, e)
+                continue
+            self.errors.pop(fp, None)
+            if self.cache is not None:
+                self.cache.put(fp, result, stamps[fp])
+            if self.compact:
+                result = FileInfo.from_dict(result)
+            if fp in self._index:
+                if self.results[self._index[fp]] == result:
+                    continue
+                self.results[self._index[fp]] = result
+                delta["modified"].append(fp)
+            else:
+                self._index[fp] = len(self.results)
+                self.results.append(result)
+                delta["created"].append(fp)
+            changed_results.append(result)
+            if self.index is not None:
+                self.index.update_file(result)
+            if self.graph is not None:
+                stale |= self.graph.update_file(result)
+
+        if delta["deleted"]:
+            gone = set(delta["deleted"])
+            self.results[:] = [r for r in self.results if r["path"] not in gone]
+            self._index = {r["path"]: i for i, r in enumerate(self.results)}
+        changed = set(delta["created"]) | set(delta["modified"]) | set(delta["deleted"])
+        delta["dependents"] = sorted(p for p in stale - changed if p not in self._packages)
+        if self.cache is not None:
+            if delta["dependents"]:
+                # entries derived from an importer may describe the API it imported before
+                self.graph.invalidate(delta["dependents"], [self.cache])
+            self.cache.flush()
+        if changed_results or delta["deleted"]:
+            update_coverage(self.report, changed_results, delta["deleted"], self._fingerprints)
+        return delta
+
+    def _update_package(self, fp: str) -> Set[str]:
+        """Re-read one package __init__.py into the graph; returns the files now stale."""
+        if not os.path.isfile(fp):
+            self._packages.pop(fp, None)
+            return self.graph.remove_file(fp)
+        try:
+            result = parse_file(fp, self.context)
+        except Exception:
+            # keep the last good edges while the file is mid-edit
+            return set()
+        if self._packages.get(fp) == result:
+            return set()
+        self._packages[fp] = result
+        return self.graph.update_file(result)
+
+    def run(self, on_change: Callable[[Dict[str, List[str]]], None],
+            interval: float = 1.0, stop: Optional[Callable[[], bool]] = None) -> None:
+        """Block, calling on_change(delta) after every poll that changed something."""
+        while not (stop and stop()):
+            delta = self.poll(interval)
+            if any(delta.values()):
+                on_change(delta)
+
+    def close(self) -> None:
+        self.backend.close()
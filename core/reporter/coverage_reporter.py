@@ -1,10 +1,94 @@
 # core/reporter/coverage_reporter.py
-"""Compute docstring coverage and write report to JSON."""
+"""Compute docstring coverage and write report to JSON.
+
+The summary also carries "dedup": how many undocumented functions and
+methods there are, how many distinct fingerprints they have and the share
+of LLM calls saved by generating once per fingerprint (dedup_ratio). It
+is left out for results parsed without fingerprints (fast_coverage's
+default), whose counts would read as "no duplicates".
+"""
 import json
+import os
+import uuid
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from core.parser.fingerprint import dedup_summary
 from core.parser.python_parser import parse_path
 
+def _file_coverage(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Coverage entry for a single parse_file result."""
+    fns = r.get("functions", [])
+    classes = r.get("classes", [])
+    file_items = 0
+    file_docs = 0
+    items = []
+    # functions
+    for f in fns:
+        file_items += 1
+        if f.get("has_docstring"):
+            file_docs += 1
+        items.append({"type": "function", "name": f.get("name"), "lineno": f.get("lineno"), "has_doc": f.get("has_docstring")})
+        if not f.get("has_docstring") and "fingerprint" in f:
+            items[-1]["fingerprint"] = f["fingerprint"]
+    # classes
+    for c in classes:
+        # class itself
+        file_items += 1
+        if c.get("has_docstring"):
+            file_docs += 1
+        items.append({"type": "class", "name": c.get("name"), "lineno": c.get("lineno"), "has_doc": c.get("has_docstring")})
+        # methods
+        for m in c.get("methods", []):
+            file_items += 1
+            if m.get("has_docstring"):
+                file_docs += 1
+            items.append({"type": "method", "class": c.get("name"), "name": m.get("name"), "lineno": m.get("lineno"), "has_doc": m.get("has_docstring")})
+            if not m.get("has_docstring") and "fingerprint" in m:
+                items[-1]["fingerprint"] = m["fingerprint"]
+
+    pct = round((file_docs / file_items) * 100, 2) if file_items > 0 else 100.0
+    return {"total_items": file_items, "doc_count": file_docs, "coverage_percent": pct, "items": items}
+
+
+# counted for undocumented functions scanned without fingerprints (fast_coverage's default)
+_NOT_FINGERPRINTED = "<not fingerprinted>"
+
+
+def _undocumented_fingerprints(entry: Dict[str, Any]) -> List[Optional[str]]:
+    """Fingerprints of a file entry's undocumented functions and methods.
+
+    None where the parser found none; _NOT_FINGERPRINTED where it did not look.
+    """
+    return [i.get("fingerprint", _NOT_FINGERPRINTED) for i in entry["items"]
+            if i["type"] != "class" and not i.get("has_doc")]
+
+
+def _count(counts: Counter, entry: Dict[str, Any], sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) a file entry's fingerprints in `counts`."""
+    for fp in _undocumented_fingerprints(entry):
+        counts[fp] += sign
+        if counts[fp] <= 0:
+            del counts[fp]
+
+
+def fingerprint_counts(report: Dict[str, Any]) -> Counter:
+    """Counter of the undocumented fingerprints of every file in a report (see update_coverage)."""
+    counts: Counter = Counter()
+    for entry in report.get("files", {}).values():
+        _count(counts, entry)
+    return counts
+
+
+def _summary(total_items: int, total_docs: int, fingerprints: Counter) -> Dict[str, Any]:
+    """Overall numbers; "dedup" only when every undocumented function was fingerprinted."""
+    overall = round((total_docs / total_items) * 100, 2) if total_items > 0 else 100.0
+    summary = {"total_items": total_items, "total_docs": total_docs, "coverage_percent": overall}
+    if _NOT_FINGERPRINTED not in fingerprints:
+        summary["dedup"] = dedup_summary(fingerprints)
+    return summary
+
+
 def compute_coverage(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Compute per-file coverage summary and global summary.
 
@@ -13,41 +97,142 @@ def compute_coverage(per_file_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     files = {}
     total_items = 0
     total_docs = 0
+    fingerprints: Counter = Counter()
     for r in per_file_results:
-        path = r.get("path")
-        fns = r.get("functions", [])
-        classes = r.get("classes", [])
-        file_items = 0
-        file_docs = 0
-        items = []
-        # functions
-        for f in fns:
-            file_items += 1
-            if f.get("has_docstring"):
-                file_docs += 1
-            items.append({"type": "function", "name": f.get("name"), "lineno": f.get("lineno"), "has_doc": f.get("has_docstring")})
-        # classes
-        for c in classes:
-            # class itself
-            file_items += 1
-            if c.get("has_docstring"):
-                file_docs += 1
-            items.append({"type": "class", "name": c.get("name"), "lineno": c.get("lineno"), "has_doc": c.get("has_docstring")})
-            # methods
-            for m in c.get("methods", []):
-                file_items += 1
-                if m.get("has_docstring"):
-                    file_docs += 1
-                items.append({"type": "method", "class": c.get("name"), "name": m.get("name"), "lineno": m.get("lineno"), "has_doc": m.get("has_docstring")})
-
-        pct = round((file_docs / file_items) * 100, 2) if file_items > 0 else 100.0
-        files[str(path)] = {"total_items": file_items, "doc_count": file_docs, "coverage_percent": pct, "items": items}
-        total_items += file_items
-        total_docs += file_docs
+        entry = _file_coverage(r)
+        files[str(r.get("path"))] = entry
+        total_items += entry["total_items"]
+        total_docs += entry["doc_count"]
+        _count(fingerprints, entry)
+
+    return {"files": files, "summary": _summary(total_items, total_docs, fingerprints)}
+
+
+def update_coverage(report: Dict[str, Any], changed: Iterable[Dict[str, Any]] = (),
+                    removed: Iterable[str] = (), fingerprints: Optional[Counter] = None) -> Dict[str, Any]:
+    """Patch a compute_coverage report in place for changed/removed files.
+
+    changed: fresh parse_file results for created or modified files
+    removed: paths of deleted files
+    fingerprints: fingerprint_counts(report), kept by the caller across
+        updates and patched in place; without it the counts are rebuilt
+        from every file entry
+    Only the touched file entries are recomputed; the summary is adjusted
+    by their difference. Returns the same report object.
+    """
+    files = report.setdefault("files", {})
+    summary = report.get("summary", {})
+    total_items = summary.get("total_items", 0)
+    total_docs = summary.get("total_docs", 0)
+    if fingerprints is None:
+        fingerprints = fingerprint_counts(report)
+
+    for path in removed:
+        old = files.pop(str(path), None)
+        if old:
+            total_items -= old["total_items"]
+            total_docs -= old["doc_count"]
+            _count(fingerprints, old, -1)
+    for r in changed:
+        key = str(r.get("path"))
+        old = files.get(key)
+        if old:
+            total_items -= old["total_items"]
+            total_docs -= old["doc_count"]
+            _count(fingerprints, old, -1)
+        entry = _file_coverage(r)
+        files[key] = entry
+        total_items += entry["total_items"]
+        total_docs += entry["doc_count"]
+        _count(fingerprints, entry)
+
+    report["summary"] = _summary(total_items, total_docs, fingerprints)
+    return report
+
+class CoverageAggregator:
+    """Build a coverage report from parse results one file at a time.
+
+    With out_path set, each file entry is written straight to the JSON report
+    (same layout as write_report) and dropped, so memory stays bounded by the
+    largest file plus one count per distinct undocumented fingerprint.
+    Without it the entries are kept in `files`.
+
+    The report is written to a temporary file next to out_path and only
+    renamed over it by finish(); abort() discards it, so a scan that fails
+    midway leaves the previous report in place.
+    """
+
+    def __init__(self, out_path: Optional[str] = None):
+        self.total_items = 0
+        self.total_docs = 0
+        self.fingerprints: Counter = Counter()
+        self.files: Optional[Dict[str, Any]] = None if out_path else {}
+        self._out: Optional[TextIO] = None
+        self._path = out_path
+        self._tmp_path: Optional[str] = None
+        self._count = 0
+        if out_path:
+            out = Path(out_path)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            # unique per writer; opened like write_report's file, so it gets the usual permissions
+            self._tmp_path = str(out.with_name(f"{out.name}.{uuid.uuid4().hex}.tmp"))
+            self._out = open(self._tmp_path, "x", encoding="utf-8")
+            self._out.write('{\n  "files": {')
+
+    def add(self, r: Dict[str, Any]) -> Dict[str, Any]:
+        entry = _file_coverage(r)
+        self.total_items += entry["total_items"]
+        self.total_docs += entry["doc_count"]
+        _count(self.fingerprints, entry)
+        key = str(r.get("path"))
+        if self._out is not None:
+            body = json.dumps(entry, indent=2).replace("\n", "\n    ")
+            self._out.write(("," if self._count else "") + f"\n    {json.dumps(key)}: {body}")
+        else:
+            self.files[key] = entry
+        self._count += 1
+        return entry
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        return _summary(self.total_items, self.total_docs, self.fingerprints)
+
+    def finish(self) -> Dict[str, Any]:
+        """Move the streamed report (if any) into place and return the report built so far."""
+        summary = self.summary
+        if self._out is not None:
+            self._out.write("\n  }," if self._count else "},")
+            self._out.write('\n  "summary": ' + json.dumps(summary, indent=2).replace("\n", "\n  ") + "\n}")
+            self._out.close()
+            self._out = None
+            os.replace(self._tmp_path, self._path)
+        return {"files": self.files if self.files is not None else {}, "summary": summary}
+
+
+    def abort(self) -> None:
+        """Discard the unfinished streamed report, leaving out_path untouched."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+            os.unlink(self._tmp_path)
+
+
+def stream_coverage_report(per_file_results: Iterable[Dict[str, Any]], path: str) -> Dict[str, Any]:
+    """Consume parse results (e.g. iter_parse_path) and write the report as they arrive.
+
+    Returns the summary. The file is identical to write_report(compute_coverage(...)).
+    If the results raise, the exception propagates and the previous report at
+    `path` (if any) is kept.
+    """
+    agg = CoverageAggregator(path)
+    try:
+        for r in per_file_results:
+            agg.add(r)
+    except BaseException:
+        agg.abort()
+        raise
+    return agg.finish()["summary"]
 
-    overall = round((total_docs / total_items) * 100, 2) if total_items > 0 else 100.0
-    summary = {"total_items": total_items, "total_docs": total_docs, "coverage_percent": overall}
-    return {"files": files, "summary": summary}
 
 def write_report(report: Dict[str, Any], path: str) -> None:
     out = Path(path)
@@ -0,0 +1,226 @@
+# core/search/symbol_index.py
+"""Trigram index over the qualified names of scanned symbols.
+
+Every function, class and method becomes one symbol ("func", "Cls",
+"Cls.method") with its file, kind, line and docstring status stored in
+parallel lists. Each lowercased qualified name contributes its trigrams to
+an inverted index of symbol ids (array('I') postings, ids ascending).
+
+Results come in three tiers, each in alphabetical order: names starting
+with the query, qualified names starting with it (methods of a matching
+class), then any other qualified name containing it. The prefix tiers are
+read from sorted key lists with bisect, so a query whose prefix matches
+fill the limit never looks at the rest. The substring tier reads only the
+rarest trigram posting of the query and confirms each candidate with a
+substring test; queries shorter than three characters scan the name list.
+
+Files are replaced incrementally: the old symbols are tombstoned and the
+new ones appended. New prefix keys wait in a small unsorted buffer that is
+merged into the sorted lists once it grows past _MAX_PENDING, and the index
+is compacted once tombstones outnumber live symbols.
+"""
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_MIN_COMPACT = 1024
+_MAX_PENDING = 4096
+
+
+class _PrefixList:
+    """(key, id) pairs sorted by key, with an unsorted buffer for recent inserts."""
+    __slots__ = ("keys", "ids", "pending")
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.ids: List[int] = []
+        self.pending: List[Tuple[str, int]] = []
+
+    def add(self, key: str, sid: int, defer: bool = False) -> None:
+        self.pending.append((key, sid))
+        if not defer and len(self.pending) > _MAX_PENDING:
+            self.merge()
+
+    def merge(self) -> None:
+        if self.pending:
+            pairs = sorted(zip(self.keys, self.ids))
+            pairs.extend(self.pending)
+            pairs.sort()
+            self.keys = [k for k, _ in pairs]
+            self.ids = [i for _, i in pairs]
+            self.pending = []
+
+    def _sorted_range(self, prefix: str) -> Iterator[Tuple[str, int]]:
+        keys, ids = self.keys, self.ids
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i], ids[i]
+            i += 1
+
+    def starting_with(self, prefix: str) -> Iterator[int]:
+        """Ids whose key starts with `prefix`, in key order."""
+        recent = sorted(p for p in self.pending if p[0].startswith(prefix))
+        for _, sid in heapq.merge(self._sorted_range(prefix), recent):
+            yield sid
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SymbolIndex:
+    """Incrementally updated symbol search over parse_file results."""
+
+    def __init__(self, results: Iterable[Dict[str, Any]] = ()):
+        self.clear()
+        for r in results:
+            self.add_file(r, defer=True)
+        self._merge()
+
+    def clear(self) -> None:
+        self._names: List[str] = []
+        self._qualnames: List[str] = []
+        self._lower: List[str] = []
+        self._paths: List[str] = []
+        self._kinds: List[str] = []
+        self._docs: List[bool] = []
+        self._linenos: List[int] = []
+        self._alive = bytearray()
+        self._grams: Dict[str, array] = {}
+        self._files: Dict[str, List[int]] = {}
+        self._by_name = _PrefixList()
+        self._by_qualname = _PrefixList()
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._names) - self._dead
+
+    def _merge(self) -> None:
+        self._by_name.merge()
+        self._by_qualname.merge()
+
+    def _add(self, name: str, qualname: str, path: str, kind: str, has_doc: bool, lineno: int,
+             defer: bool = False) -> int:
+        sid = len(self._names)
+        lower = qualname.lower()
+        self._names.append(name)
+        self._qualnames.append(qualname)
+        self._lower.append(lower)
+        self._paths.append(path)
+        self._kinds.append(kind)
+        self._docs.append(bool(has_doc))
+        self._linenos.append(lineno)
+        self._alive.append(1)
+        self._by_name.add(name.lower(), sid, defer)
+        if qualname != name:
+            self._by_qualname.add(lower, sid, defer)
+        grams = self._grams
+        for g in _trigrams(lower):
+            posting = grams.get(g)
+            if posting is None:
+                grams[g] = array("I", (sid,))
+            else:
+                posting.append(sid)
+        return sid
+
+    def add_file(self, result: Dict[str, Any], defer: bool = False) -> None:
+        """Index the functions, classes and methods of one parse_file result."""
+        path = str(result["path"])
+        if path in self._files:
+            self.remove_file(path)
+        ids = []
+        for f in result.get("functions", []):
+            ids.append(self._add(f["name"], f["name"], path, "function", f.get("has_docstring"), f.get("lineno"),
+                                 defer))
+        for c in result.get("classes", []):
+            ids.append(self._add(c["name"], c["name"], path, "class", c.get("has_docstring"), c.get("lineno"),
+                                 defer))
+            for m in c.get("methods", []):
+                ids.append(self._add(m["name"], f"{c['name']}.{m['name']}", path, "method",
+                                     m.get("has_docstring"), m.get("lineno"), defer))
+        self._files[path] = ids
+
+    update_file = add_file
+
+    def remove_file(self, path: str) -> None:
+        for sid in self._files.pop(str(path), ()):
+            self._alive[sid] = 0
+            self._dead += 1
+        if self._dead > _MIN_COMPACT and self._dead > len(self):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild without tombstoned symbols (ids are reassigned)."""
+        live = [sid for sid in range(len(self._names)) if self._alive[sid]]
+        names, qualnames, paths = self._names, self._qualnames, self._paths
+        kinds, docs, linenos = self._kinds, self._docs, self._linenos
+        files = list(self._files)
+        self.clear()
+        by_path: Dict[str, List[int]] = {p: [] for p in files}
+        for sid in live:
+            new = self._add(names[sid], qualnames[sid], paths[sid], kinds[sid], docs[sid], linenos[sid], True)
+            by_path[paths[sid]].append(new)
+        self._files = by_path
+        self._merge()
+
+    def _record(self, sid: int) -> Dict[str, Any]:
+        return {
+            "name": self._names[sid],
+            "qualname": self._qualnames[sid],
+            "kind": self._kinds[sid],
+            "file_path": self._paths[sid],
+            "lineno": self._linenos[sid],
+            "has_docstring": self._docs[sid],
+        }
+
+    def search(self, query: str = "", kinds: Optional[Iterable[str]] = None,
+               has_docstring: Optional[bool] = None, path: Optional[str] = None,
+               limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """Symbols whose qualified name contains `query` (case-insensitive), best first.
+
+        kinds: restrict to "function", "class" and/or "method"
+        has_docstring: True / False to keep only documented / undocumented symbols
+        path: restrict to one file
+        limit: maximum number of results (None for all)
+        """
+        q = query.strip().lower()
+        kinds = set(kinds) if kinds is not None else None
+        alive, lower, kind_of, docs = self._alive, self._lower, self._kinds, self._docs
+
+        def wanted(sid: int) -> bool:
+            return (alive[sid] and (kinds is None or kind_of[sid] in kinds)
+                    and (has_docstring is None or docs[sid] == has_docstring))
+
+        if path is not None:
+            hits = sorted((sid for sid in self._files.get(str(path), ()) if q in lower[sid] and wanted(sid)),
+                          key=lower.__getitem__)
+            return [self._record(sid) for sid in hits[:limit]]
+
+        out: List[int] = []
+        seen = set()
+        if q:
+            for prefixes in (self._by_name, self._by_qualname):
+                for sid in prefixes.starting_with(q):
+                    if sid not in seen and wanted(sid):
+                        seen.add(sid)
+                        out.append(sid)
+                        if limit is not None and len(out) >= limit:
+                            return [self._record(sid) for sid in out]
+
+        if len(q) >= 3:
+            postings = []
+            for g in _trigrams(q):
+                posting = self._grams.get(g)
+                if posting is None:
+                    return [self._record(sid) for sid in out]
+                postings.append(posting)
+            candidates: Iterable[int] = min(postings, key=len)
+        else:
+            candidates = range(len(self._names))
+        rest = [sid for sid in candidates if q in lower[sid] and sid not in seen and wanted(sid)]
+        if limit is None:
+            rest.sort(key=lower.__getitem__)
+        else:
+            rest = heapq.nsmallest(limit - len(out), rest, key=lower.__getitem__)
+        return [self._record(sid) for sid in out + rest]
@@ -9,7 +9,24 @@ def validate_docstrings(path: str):
         return []
 
     return result["issues"]
-def run_pydocstyle(path):
+def run_pydocstyle(path, context=None):
+    """
+    Run pydocstyle on a file or directory.
+
+    With an AnalysisContext and pydocstyle importable, files are checked in
+    process from the context's already read source instead of spawning
+    pydocstyle, which would read every file again. Where a pydocstyle
+    configuration file applies, pydocstyle itself is run so that its
+    settings are honoured.
+    """
+    if context is not None:
+        try:
+            result = _check_in_process(path, context)
+        except ImportError:
+            result = None
+        if result is not None:
+            return result
+
     import subprocess
     import sys
 
@@ -19,34 +36,41 @@ def run_pydocstyle(path):
         text=True
     )
 
-    # pydocstyle reports to stderr
-    raw_output = result.stderr or result.stdout
-
-    issues = []
-    block = []
-
-    for line in raw_output.splitlines():
-        if line.strip() == "":
-            if block:
-                issues.append(block)
-                block = []
-        else:
-            block.append(line.rstrip())
-
-    if block:
-        issues.append(block)
+    # errors go to stdout, warnings (files it cannot parse) to stderr
+    issues = _issue_blocks(result.stdout) + _issue_blocks(result.stderr)
 
     return {
         "passed": result.returncode == 0,
         "issues": issues   # 🔴 list of lists (each issue multiline)
     }
+
+
+def _issue_blocks(output):
+    """Split pydocstyle output into one block of lines per reported issue.
+
+    Each issue starts with an unindented line ("path:line in ...:" or a
+    WARNING); its indented lines (the code and message, any explanation)
+    belong to it.
+    """
+    issues = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        if not line[:1].isspace() or not issues:
+            issues.append([])
+        issues[-1].append(line.rstrip())
+    return issues
 import ast
+import os
 
 
-def compute_complexity(source_code: str):
+def compute_complexity(source_code: str, tree=None):
     """
     Compute cyclomatic complexity for functions in given source code.
 
+    An already parsed `tree` (e.g. AnalysisContext.get(path).tree) is used
+    instead of parsing `source_code` again.
+
     Returns:
         List[dict]: [{ "name": str, "complexity": int }]
     """
@@ -89,11 +113,103 @@ def compute_complexity(source_code: str):
             self.complexity += len(node.handlers)
             self.generic_visit(node)
 
-    try:
-        tree = ast.parse(source_code)
-    except SyntaxError:
-        return []
+    if tree is None:
+        try:
+            tree = ast.parse(source_code)
+        except SyntaxError:
+            return []
 
     visitor = ComplexityVisitor()
     visitor.visit(tree)
     return visitor.results
+
+
+def _has_pydocstyle_config(directory, seen):
+    """Whether a pydocstyle config file with a [pydocstyle] section is in `directory`."""
+    if directory in seen:
+        return seen[directory]
+    from configparser import Error, RawConfigParser
+    import tomllib
+    from pydocstyle.config import ConfigurationParser
+
+    found = False
+    for name in ConfigurationParser.PROJECT_CONFIG_FILES:
+        fp = os.path.join(directory, name)
+        if not os.path.isfile(fp):
+            continue
+        try:
+            if name.endswith(".toml"):
+                with open(fp, "rb") as f:
+                    sections = tomllib.load(f).get("tool", {})
+            else:
+                parser = RawConfigParser()
+                parser.read(fp, encoding="utf-8")
+                sections = parser.sections()
+        except (OSError, UnicodeDecodeError, Error, tomllib.TOMLDecodeError):
+            # pydocstyle would stop on it; let it report the problem
+            found = True
+            break
+        if any(s in sections for s in ConfigurationParser.POSSIBLE_SECTION_NAMES):
+            found = True
+            break
+    seen[directory] = found
+    return found
+
+
+def _check_in_process(path, context):
+    """pydocstyle's default run over `path`, reading sources through `context`.
+
+    Files are selected like pydocstyle does (its default --match and
+    --match-dir, so __init__.py is checked) and only the pep257 convention
+    is reported. A file pydocstyle cannot parse is reported as an issue.
+    Issues are split into blocks exactly as run_pydocstyle splits the
+    command line output.
+    Returns None when a pydocstyle configuration file applies to any
+    checked directory; the caller then runs pydocstyle itself. Modules not
+    already in the context are read without being added to it.
+    """
+    import re
+    import tokenize
+    from pydocstyle.checker import ConventionChecker
+    from pydocstyle.config import ConfigurationParser
+    from pydocstyle.parser import AllError, ParseError
+
+    match = re.compile(ConfigurationParser.DEFAULT_MATCH_RE + "$").match
+    match_dir = re.compile(ConfigurationParser.DEFAULT_MATCH_DIR_RE + "$").match
+    seen = {}
+    top = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) or ".")
+    parent = top
+    while True:
+        # pydocstyle looks for its configuration from each checked directory upwards
+        if _has_pydocstyle_config(parent, seen):
+            return None
+        if os.path.dirname(parent) == parent:
+            break
+        parent = os.path.dirname(parent)
+
+    if os.path.isfile(path):
+        files = [path] if match(os.path.basename(path)) else []
+    else:
+        files = []
+        for root, dirs, names in os.walk(path):
+            if _has_pydocstyle_config(os.path.abspath(root), seen):
+                return None
+            dirs[:] = [d for d in dirs if match_dir(d)]
+            files.extend(os.path.join(root, n) for n in names if match(n))
+
+    checker = ConventionChecker()
+    checked = ConfigurationParser.DEFAULT_CONVENTION
+    property_decorators = set(ConfigurationParser.DEFAULT_PROPERTY_DECORATORS.split(","))
+    issues = []
+    warnings = []
+    for fp in files:
+        try:
+            source = context.read_text(fp)
+            errors = list(checker.check_source(source, fp, property_decorators=property_decorators))
+        except (OSError, UnicodeDecodeError, AllError, ParseError, tokenize.TokenError) as e:
+            warnings.append(f"WARNING: Error in file {fp}: {e}")
+            continue
+        issues.extend(str(error) for error in errors if error.code in checked)
+    # the same blocks, in the same order, as pydocstyle's output (errors, then warnings)
+    issues = _issue_blocks("\n".join(issues + warnings))
+    return {"passed": not issues, "issues": issues}
@@ -10,8 +10,16 @@ def load_pytest_results():
     return json.loads(path.read_text())
 
 
-def filter_functions(functions, search=None, status=None):
-    """Filter functions by name and documentation status."""
+def filter_functions(functions, search=None, status=None, index=None):
+    """Filter functions by name and documentation status.
+
+    With a SymbolIndex the lookup goes through the index and `functions` is
+    not scanned; the returned records carry the same name/has_docstring keys.
+    """
+    if index is not None:
+        has_doc = {"OK": True, "Fix": False}.get(status)
+        return index.search(search or "", kinds=("function", "method"), has_docstring=has_doc, limit=None)
+
     results = functions
 
     if search:
@@ -90,20 +90,186 @@ from dashboard_ui.dashboard import (
     load_pytest_results,
     filter_functions
 )
-from core.parser.python_parser import parse_path, parse_file
-from core.docstring_engine.generator import generate_docstring
+from core.parser.parse_cache import ParseCache
+from core.parser.watcher import ScanWatcher
+from core.parser.import_graph import ImportGraph
+from core.parser.scan_profile import ScanProfile
+from core.search.symbol_index import SymbolIndex
+from core.analysis.context import AnalysisContext
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.packing import PACK_TOKEN_BUDGET
+from core.docstring_engine.content_cache import ContentCache, content_key
+from core.docstring_engine.generator import render_docstring
+from core.docstring_engine.streaming import stream_docstring
+from core.docstring_engine.source_context import with_sources
+from core.docstring_engine.dedup import adapt_content
+from core.docstring_engine.backends import get_backend
 # ---------- UI STATE ----------
 if "active_feature" not in st.session_state:
     st.session_state.active_feature = None
 
-from core.reporter.coverage_reporter import compute_coverage, write_report
+from core.reporter.coverage_reporter import write_report
 from core.docstring_engine.apply_docstring import apply_docstring_to_file
 from core.validator.validator import run_pydocstyle
 import ast
 
-def compute_code_metrics(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        tree = ast.parse(f.read())
+
+@st.cache_resource
+def get_parse_cache():
+    # one on-disk parse cache shared by all sessions and reruns
+    return ParseCache()
+
+@st.cache_resource
+def get_content_cache():
+    # LLM docstring content shared by all sessions and reruns
+    return ContentCache()
+
+@st.cache_resource
+def get_llm_backend():
+    # $DOCSTRING_LLM_BACKEND: groq (default), llamacpp or fake
+    return get_backend()
+
+def get_rate_limiter():
+    # one limiter per session for batch generation and streamed suggestions alike, so reruns
+    # do not start with a fresh burst and both paths share the provider's limits
+    if "rate_limiter" not in st.session_state:
+        st.session_state["rate_limiter"] = RateLimiter()
+    return st.session_state["rate_limiter"]
+
+def get_analysis_context():
+    # parsed modules shared by the scan, metrics and validation within a session
+    if "analysis_context" not in st.session_state:
+        st.session_state["analysis_context"] = AnalysisContext()
+    return st.session_state["analysis_context"]
+
+def get_content_keys(fns, packed=False):
+    # packed: keys of content generated by the packed batch, which is not the streamed prompt's
+    backend = get_llm_backend()
+    return [content_key(fn, backend.name, backend.temperature, packed=packed) for fn in fns]
+
+def get_docstring_contents(fns):
+    # content stage: LLM content per function, memoized per session by content key,
+    # so a style change or rerun only re-renders; returns (contents, errors) with
+    # content None and the error message for functions whose generation failed
+    backend = get_llm_backend()
+    memo = st.session_state.get("llm_contents", {})
+    keys = get_content_keys(fns, packed=True)
+    missing = [i for i, k in enumerate(keys) if k not in memo]
+    errors = {}
+    placeholders = {}
+    if missing:
+        progress = st.progress(0.0, text="Generating docstrings...")
+        done = [0]
+
+        def on_result(_):
+            done[0] += 1
+            progress.progress(done[0] / len(missing), text=f"Generating docstrings... {done[0]}/{len(missing)}")
+
+        stats = {}
+        generated = generate_all([fns[i] for i in missing], None, on_result=on_result,
+                                 pack_budget=PACK_TOKEN_BUDGET, cache=get_content_cache(),
+                                 backend=backend, limiter=get_rate_limiter(), stats=stats)
+        progress.empty()
+        st.session_state["llm_stats"] = stats
+        for i, g in zip(missing, generated):
+            # failed functions and placeholder content are not memoized, so the next rerun asks again
+            if g["error"] is not None:
+                errors[i] = g["error"]
+            elif g["content"].get("fallback"):
+                placeholders[keys[i]] = g["content"]
+            else:
+                memo[keys[i]] = g["content"]
+    # keep only the current functions' content
+    st.session_state["llm_contents"] = {k: memo[k] for k in keys if k in memo}
+    return [memo.get(k, placeholders.get(k)) for k in keys], errors
+
+def get_known_docstring_contents(fns):
+    # content already in the session memo or the content cache; None where it still has to be generated
+    memo = st.session_state.get("llm_contents", {})
+    keys = get_content_keys(fns)
+    cached = get_content_cache().get_many([k for k in keys if k not in memo])
+    memo = {k: memo.get(k) or cached[k] for k in keys if k in memo or k in cached}
+    st.session_state["llm_contents"] = memo
+    return [memo.get(k) for k in keys]
+
+def invalidate_dependents(results, paths):
+    # files importing a module whose public signature changed: their docstring content and
+    # validation results may describe the old API, so drop them from the session memo, the
+    # content cache and the duplicates shared while streaming; they are generated again
+    paths = set(paths)
+    if not paths:
+        return
+    fns = [fn for r in results if r["path"] in paths for fn in r.get("functions", [])]
+    memo = st.session_state.get("llm_contents", {})
+    cache = get_content_cache()
+    for key in get_content_keys(fns) + get_content_keys(fns, packed=True):
+        memo.pop(key, None)
+        cache.invalidate(key)
+    shared = st.session_state.get("llm_shared", {})
+    for fingerprint in {fn.get("fingerprint") for fn in fns}:
+        shared.pop(fingerprint, None)
+    st.session_state.pop("validation_result", None)
+
+def generate_missing_docstrings(results, style, stream=False):
+    # one concurrent, rate-limited batch for every undocumented function, several per request,
+    # then a local bulk render in the selected style; with stream=True nothing is generated here
+    # and functions without known content get doc None (streamed into their card instead).
+    # Yields (path, fn, doc, error): error is set (and doc None) where generation failed
+    pending = [(r.get("path"), fn) for r in results for fn in r.get("functions", [])
+               if not fn.get("has_docstring")]
+    if not pending:
+        return []
+    # the prompts include each function's (compacted) source; the parser's models stay read-only
+    fns = with_sources(pending, get_analysis_context())
+    errors = {}
+    if stream:
+        contents = get_known_docstring_contents(fns)
+    else:
+        contents, errors = get_docstring_contents(fns)
+    docs = [render_docstring(fn, c, style) if c is not None else None for fn, c in zip(fns, contents)]
+    return [(fp, fn, doc, errors.get(i)) for i, ((fp, _), fn, doc) in enumerate(zip(pending, fns, docs))]
+
+def stream_suggestion(it, style):
+    # "Revised (AI)" card body: the docstring as the reply streams in, then the final rendering;
+    # a duplicate of a function streamed earlier (same fingerprint) reuses its content.
+    # A failed request is shown in this card only; placeholder content from an unparsable
+    # reply is shown but neither memoized nor shared, so the next rerun asks again
+    memo = st.session_state.setdefault("llm_contents", {})
+    shared = st.session_state.setdefault("llm_shared", {})
+    fingerprint = it["fn"].get("fingerprint")
+    if fingerprint in shared:
+        source, content = shared[fingerprint]
+        content = adapt_content(content, source, it["fn"])
+        it["doc"] = render_docstring(it["fn"], content, style)
+        memo[get_content_keys([it["fn"]])[0]] = content
+        st.code(it["doc"], language="python")
+        st.caption(f"Shared with duplicate `{source['name']}`")
+        return
+    placeholder = st.empty()
+    placeholder.code("Generating...", language="python")
+    try:
+        for event in stream_docstring(it["fn"], style, backend=get_llm_backend(), cache=get_content_cache(),
+                                      limiter=get_rate_limiter()):
+            placeholder.code(event["docstring"], language="python")
+    except Exception as e:
+        placeholder.error(f"Docstring generation failed: {type(e).__name__}: {e}")
+        return
+    if event["prompt_tokens"]:
+        st.caption(f"Prompt: ~{event['prompt_tokens']} tokens")
+    it["doc"] = event["docstring"]
+    if event["content"].get("fallback"):
+        st.caption("The model's reply could not be parsed; showing a placeholder")
+        return
+    memo[get_content_keys([it["fn"]])[0]] = event["content"]
+    if fingerprint:
+        shared[fingerprint] = (it["fn"], event["content"])
+
+def compute_code_metrics(file_path, context=None):
+    if context is not None:
+        tree = context.get(file_path).tree
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
 
     metrics = []
     for node in ast.walk(tree):
@@ -357,9 +523,25 @@ left_col, main_col = st.columns([1.2, 3])
 
 
 try:
-    results = parse_path(scan_path)
-    report = compute_coverage(results)
-    write_report(report, "storage/reports/docstring_coverage.json")
+    # full scan once per session, then only re-parse files that changed
+    watcher = st.session_state.get("scan_watcher")
+    if watcher is None or watcher.root != scan_path:
+        if watcher is not None:
+            watcher.close()
+        profile = ScanProfile()
+        get_analysis_context().release()
+        watcher = ScanWatcher(scan_path, cache=get_parse_cache(), compact=True, profile=profile,
+                              index=SymbolIndex(), graph=ImportGraph(scan_path), context=get_analysis_context())
+        st.session_state["scan_watcher"] = watcher
+        write_report(watcher.report, "storage/reports/docstring_coverage.json")
+        profile.write("storage/reports/scan_profile.json")
+    else:
+        delta = watcher.poll()
+        invalidate_dependents(watcher.results, delta["dependents"])
+        if any(delta.values()):
+            write_report(watcher.report, "storage/reports/docstring_coverage.json")
+    results = watcher.results
+    report = watcher.report
     st.session_state["last_scan_results"] = results
     st.session_state["last_report"] = report
             # ✅ Auto-select first file for AST preview
@@ -413,11 +595,22 @@ with st.sidebar:
         "Docstring Style",
         ["google", "numpy", "rest"]
     )
+    stream_suggestions = st.toggle("Stream suggestions", value=True,
+                                   help="Show each suggestion as it is generated instead of after the whole batch")
 
     if st.button("🚀 Scan Project"):
-        results = parse_path(scan_path)
-        report = compute_coverage(results)
+        old_watcher = st.session_state.get("scan_watcher")
+        if old_watcher is not None:
+            old_watcher.close()
+        profile = ScanProfile()
+        get_analysis_context().release()
+        watcher = ScanWatcher(scan_path, cache=get_parse_cache(), compact=True, profile=profile,
+                              index=SymbolIndex(), graph=ImportGraph(scan_path), context=get_analysis_context())
+        st.session_state["scan_watcher"] = watcher
+        results = watcher.results
+        report = watcher.report
         write_report(report, "storage/reports/docstring_coverage.json")
+        profile.write("storage/reports/scan_profile.json")
 
         st.session_state["last_scan_results"] = results
         st.session_state["last_report"] = report
@@ -482,24 +675,17 @@ def classify_issues(issues):
 suggestions = {}
 
 if results:
-    for r in results:
-        fp = r.get("path")
-        suggs_for_file = []
-
-        for fn in r.get("functions", []):
-            if not fn.get("has_docstring"):
-                doc = generate_docstring(fn, style=doc_style)
-                suggs_for_file.append({
-                    "name": fn["name"],
-                    "lineno": fn["lineno"],
-                    "indent": fn["indent"],
-                    "file": fp,
-                    "doc": doc,
-                    "existing_doc": fn.get("docstring"),
-                })
-
-        if suggs_for_file:
-            suggestions[fp] = suggs_for_file
+    for fp, fn, doc, error in generate_missing_docstrings(results, doc_style, stream=stream_suggestions):
+        suggestions.setdefault(fp, []).append({
+            "fn": fn,
+            "name": fn["name"],
+            "lineno": fn["lineno"],
+            "indent": fn["indent"],
+            "file": fp,
+            "doc": doc,
+            "error": error,
+            "existing_doc": fn.get("docstring"),
+        })
 
     if view == "📊 Dashboard":
         st.markdown("## 📊 Project Dashboard")
@@ -513,6 +699,12 @@ if results:
            c1.metric("Files Scanned", len(report.get("files", {})))
            c2.metric("Coverage %", summary.get("coverage_percent", 0))
            c3.metric("Total Items", summary.get("total_items", 0))
+           dedup = summary.get("dedup")
+           if dedup and dedup["undocumented"]:
+               st.caption(
+                   f"Undocumented functions: {dedup['undocumented']}, {dedup['unique']} unique "
+                   f"({dedup['dedup_ratio']:.0%} fewer LLM calls after deduplication)"
+               )
 
            st.progress(summary.get("coverage_percent", 0) / 100)
         # ✅ AST PARSER OUTPUT (ONLY HERE)
@@ -685,31 +877,15 @@ if results:
 
             rows = []
 
-            if query and results:
-                for r in results:
-                    file_name = Path(r["path"]).name
-
-            # Functions
-                    for fn in r.get("functions", []):
-                        name = fn["name"].lower()
-                        if query in name:
-                            rows.append({
-                               "File": file_name,
-                               "Name": fn["name"],
-                               "Type": "Function",
-                               "Docstring": "✅ Fixed" if fn["has_docstring"] else "❌ Missing"
-                             })
-
-            # Classes
-                    for cls in r.get("classes", []):
-                        name = cls["name"].lower()
-                        if query in name:
-                            rows.append({
-                            "File": file_name,
-                            "Name": cls["name"],
-                            "Type": "Class",
-                            "Docstring": "✅ Fixed" if cls["has_docstring"] else "❌ Missing"
-                            })
+            watcher = st.session_state.get("scan_watcher")
+            if query and watcher is not None and watcher.index is not None:
+                for sym in watcher.index.search(query, kinds=("function", "class"), limit=200):
+                    rows.append({
+                        "File": Path(sym["file_path"]).name,
+                        "Name": sym["name"],
+                        "Type": sym["kind"].capitalize(),
+                        "Docstring": "✅ Fixed" if sym["has_docstring"] else "❌ Missing"
+                    })
 
         if query:
             if rows:
@@ -815,6 +991,19 @@ if results:
 
     elif view == "🧩 Docstrings":
         st.markdown("## 🧩 Docstring Review")
+        cache_stats = get_content_cache().stats()
+        st.caption(
+            f"LLM content cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['entries']} entries"
+        )
+        llm_stats = st.session_state.get("llm_stats")
+        if llm_stats and llm_stats.get("requests"):
+            st.caption(
+                f"Last generation: {llm_stats['requests']} requests, "
+                f"~{llm_stats.get('prompt_tokens', 0)} prompt tokens "
+                f"(~{llm_stats.get('prompt_tokens', 0) // llm_stats['requests']} per request), "
+                f"{llm_stats.get('deduplicated', 0)} duplicates reused"
+            )
 
         if not suggestions:
            st.success("All functions have docstrings 🎉")
@@ -833,7 +1022,7 @@ if results:
 
                 for idx, it in enumerate(items):
 
-                    if search and search.lower() not in fn["name"].lower():
+                    if search and search.lower() not in it["name"].lower():
                        continue
                     st.markdown('<div class="ui-card">', unsafe_allow_html=True)
 
@@ -855,14 +1044,20 @@ if results:
 
                     with col2:
                         st.markdown("**Revised (AI)**")
-                        st.code(doc, language="python")
+                        if it["error"]:
+                            st.error(f"Docstring generation failed: {it['error']}")
+                        elif it["doc"] is None:
+                            stream_suggestion(it, doc_style)
+                        else:
+                            st.code(it["doc"], language="python")
 
                     col_a, col_r = st.columns([1, 1])
 
                     with col_a:
                         if st.button(
                             "✅ Accept",
-                            key=f"accept-{fp}-{it['lineno']}-{idx}"
+                            key=f"accept-{fp}-{it['lineno']}-{idx}",
+                            disabled=it["doc"] is None
                         ):
                             apply_docstring_to_file(
                             file_path=it["file"],
@@ -884,7 +1079,7 @@ if results:
         st.markdown("## 🧪 Validation Results (PEP 257)")
 
         if st.button("Run Validation"):
-           st.session_state["validation_result"] = run_pydocstyle(scan_path)
+           st.session_state["validation_result"] = run_pydocstyle(scan_path, get_analysis_context())
 
         result = st.session_state.get("validation_result")
 
@@ -949,9 +1144,14 @@ if results:
                st.info("Select a file from the sidebar to view code metrics.")
            else:
                try:
-                    mi, metrics = compute_code_metrics(selected)
+                    mi, metrics = compute_code_metrics(selected, get_analysis_context())
 
                     st.metric("Maintainability Index", round(mi, 2))
+                    ctx_stats = get_analysis_context().stats()
+                    st.caption(
+                        f"Parsed modules: {ctx_stats['resident_modules']} held, "
+                        f"{ctx_stats['parses']} parses, {ctx_stats['parses_avoided']} avoided"
+                    )
 
                     rows = []
                     for m in metrics:
@@ -989,25 +1189,3 @@ if results:
 
         return errors, warnings
        
-    suggestions = {}
-
-    if results:
-       for r in results:
-        fp = r.get("path")
-        suggs_for_file = []
-
-        for fn in r.get("functions", []):
-            if not fn.get("has_docstring"):
-                doc = generate_docstring(fn, style=doc_style)
-                suggs_for_file.append({
-                    "type": "function",
-                    "name": fn.get("name"),
-                    "lineno": fn.get("lineno"),
-                    "indent": fn.get("indent"),
-                    "file": fp,
-                    "doc": doc,
-                    "existing_doc": fn.get("docstring"),
-                })
-
-        if suggs_for_file:
-            suggestions[fp] = suggs_for_file
\ No newline at end of file
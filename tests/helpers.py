@@ -0,0 +1,51 @@
+"""Shared helpers for the docstring generation tests: sample functions and stub-server clients."""
+
+import asyncio
+import json
+from urllib.parse import urlparse
+
+from core.docstring_engine.llm_integration import build_prompt
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status_code, headers):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"status_code": status_code, "headers": headers})()
+
+
+def http_complete(url):
+    """Async prompt -> reply text posting to the stub server (one connection per call)."""
+    address = urlparse(url)
+
+    async def complete(prompt):
+        body = json.dumps({"messages": [{"role": "user", "content": prompt}]}).encode()
+        reader, writer = await asyncio.open_connection(address.hostname, address.port)
+        writer.write(b"POST /openai/v1/chat/completions HTTP/1.1\r\nHost: stub\r\nConnection: close\r\n"
+                     b"Content-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, payload = raw.partition(b"\r\n\r\n")
+        lines = head.decode().split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:])}
+        if status != 200:
+            raise HTTPStatusError(status, headers)
+        return json.loads(payload)["choices"][0]["message"]["content"]
+
+    return complete
+
+
+def http_content(url):
+    """Async content function: the single-function prompt through http_complete."""
+    complete = http_complete(url)
+
+    async def content(fn):
+        return json.loads(await complete(build_prompt(fn)))
+
+    return content
+
+
+def make_fns(n):
+    return [{"name": f"fn{i}", "args": [{"name": "x", "annotation": "int"}], "returns": "int"} for i in range(n)]
@@ -0,0 +1,122 @@
+"""Tests for the shared analysis context."""
+
+import os
+
+import pytest
+
+from core.analysis.context import AnalysisContext
+from core.parser.python_parser import parse_file, parse_path
+from core.parser.watcher import ScanWatcher
+from core.validator.validator import _check_in_process, compute_complexity, run_pydocstyle
+
+
+SOURCE = '''def f(x):
+    """Doc."""
+    if x:
+        return 1
+    for i in range(x):
+        pass
+'''
+
+
+def test_analyses_share_one_parse(tmp_path):
+    """Test that parse_file and compute_complexity reuse a single parse."""
+    path = tmp_path / "m.py"
+    path.write_text(SOURCE, encoding="utf-8")
+    ctx = AnalysisContext()
+
+    assert parse_file(str(path), ctx) == parse_file(str(path))
+    module = ctx.get(str(path))
+    assert compute_complexity(module.text, tree=module.tree) == compute_complexity(SOURCE)
+    assert ctx.stats()["parses"] == 1
+    assert ctx.stats()["parses_avoided"] == 1
+
+    # an edit on disk is picked up
+    path.write_text(SOURCE + "\ndef g():\n    pass\n", encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert [fn["name"] for fn in parse_file(str(path), ctx)["functions"]] == ["f", "g"]
+    assert ctx.stats()["parses"] == 2
+
+
+def test_release_and_eviction(tmp_path):
+    """Test explicit release and the resident-module bound."""
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"m{i}.py"
+        p.write_text(f"def f{i}():\n    pass\n", encoding="utf-8")
+        paths.append(str(p))
+
+    ctx = AnalysisContext(max_modules=2)
+    held = [ctx.get(p) for p in paths]
+    assert len(ctx) == 2 and paths[0] not in ctx
+    assert ctx.stats()["evictions"] == 1
+
+    ctx.release(paths[1])
+    assert paths[1] not in ctx
+    # modules still held by a caller are not emptied by eviction or release
+    assert [m.tree.body[0].name for m in held] == ["f0", "f1", "f2"]
+    assert held[0].text.startswith("def f0") and held[1].index.buf.nbytes == held[1].size
+    with ctx:
+        ctx.get(paths[0])
+    assert len(ctx) == 0
+    assert ctx.stats()["releases"] == 3
+
+
+def test_watcher_initial_scan_fills_context(tmp_path):
+    """Test that the watcher's first scan parses through the context."""
+    (tmp_path / "m.py").write_text(SOURCE, encoding="utf-8")
+    ctx = AnalysisContext()
+    watcher = ScanWatcher(str(tmp_path), use_inotify=False, context=ctx)
+    assert watcher.results == parse_path(str(tmp_path))
+    assert str(tmp_path / "m.py") in ctx and ctx.stats()["parses"] == 1
+    watcher.close()
+
+
+def test_read_text_does_not_store_modules(tmp_path):
+    """Test that text-only reads leave the context untouched."""
+    path = tmp_path / "m.py"
+    path.write_text(SOURCE, encoding="utf-8")
+    ctx = AnalysisContext()
+    assert ctx.read_text(str(path)) == SOURCE and len(ctx) == 0
+    ctx.get(str(path))
+    assert ctx.read_text(str(path)) == SOURCE and ctx.stats()["parses_avoided"] == 1
+
+
+def test_in_process_validation_matches_pydocstyle_selection(tmp_path):
+    """Test __init__.py checks, unparsable files and the config fallback."""
+    pytest.importorskip("pydocstyle")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "bad.py").write_text("def g(:\n", encoding="utf-8")
+    (pkg / "test_skipped.py").write_text("def t():\n    pass\n", encoding="utf-8")
+    ctx = AnalysisContext()
+
+    result = _check_in_process(str(tmp_path), ctx)
+    codes = [line.split(":")[0].strip() for issue in result["issues"] for line in issue[1:]]
+    assert codes == ["D104"]
+    assert any("bad.py" in issue[0] for issue in result["issues"])
+    assert not result["passed"] and len(ctx) == 0
+
+    (pkg / "setup.cfg").write_text("[pydocstyle]\nadd-ignore = D104\n", encoding="utf-8")
+    assert _check_in_process(str(tmp_path), ctx) is None
+
+
+def test_in_process_validation_matches_command_line(tmp_path):
+    """Test that the in-process check and the pydocstyle command return the same issues."""
+    pytest.importorskip("pydocstyle")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "mod.py").write_text(
+        'def f():\n    pass\n\n\nclass A:\n    def m(self):\n        """bad"""\n', encoding="utf-8"
+    )
+    (pkg / "broken.py").write_text("def g(:\n", encoding="utf-8")
+
+    in_process = run_pydocstyle(str(pkg), AnalysisContext())
+    command_line = run_pydocstyle(str(pkg))
+
+    assert in_process == command_line
+    assert len(in_process["issues"]) == 7
+    assert in_process["issues"][-1][0].startswith("WARNING: Error in file")
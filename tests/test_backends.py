@@ -0,0 +1,143 @@
+"""Tests for the pluggable LLM backends."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from core.docstring_engine import backends
+from core.docstring_engine.backends import (
+    BackendError, FakeBackend, GroqBackend, LLMBackend, LlamaCppBackend, fake_reply, get_backend,
+)
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.content_cache import ContentCache, content_key
+from core.docstring_engine.generator import generate_docstring
+from core.docstring_engine.packing import build_packed_prompt
+from tests.helpers import make_fns
+
+
+def test_backends_satisfy_protocol(monkeypatch):
+    """Test that every backend implements the LLMBackend protocol."""
+    monkeypatch.setenv("LLAMA_MODEL_PATH", "/models/tiny.gguf")
+    for backend in (GroqBackend(), LlamaCppBackend(), FakeBackend()):
+        assert isinstance(backend, LLMBackend)
+    assert LlamaCppBackend().name == "llamacpp:tiny.gguf"
+    # complete() is abstract: a backend must provide it
+    with pytest.raises(TypeError):
+        backends.BaseBackend()
+
+
+def test_get_backend_by_name_and_env(monkeypatch):
+    """Test backend selection by argument, environment and default."""
+    monkeypatch.delenv("DOCSTRING_LLM_BACKEND", raising=False)
+    assert isinstance(get_backend(), GroqBackend)
+    monkeypatch.setenv("DOCSTRING_LLM_BACKEND", "fake")
+    assert isinstance(get_backend(latency=0.1), FakeBackend)
+    assert isinstance(get_backend("groq"), GroqBackend)
+    with pytest.raises(ValueError):
+        get_backend("bogus")
+    monkeypatch.delenv("LLAMA_MODEL_PATH", raising=False)
+    with pytest.raises(RuntimeError):
+        get_backend("llamacpp")
+
+
+def test_fake_backend_is_deterministic_in_every_mode():
+    """Test that complete, batch, stream and astream give the same reply text."""
+    fns = make_fns(3)
+    prompt = build_packed_prompt(fns)
+    backend = FakeBackend(chunk_size=5)
+    reply = backend.complete(prompt)
+    assert [item["id"] for item in json.loads(reply)] == ["f0", "f1", "f2"]
+    assert backend.batch([prompt, prompt]) == [reply, reply]
+    chunks = list(backend.stream(prompt))
+    assert len(chunks) > 1 and "".join(chunks) == reply
+
+    async def collect():
+        return [c async for c in backend.astream(prompt)], await backend.acomplete(prompt)
+
+    achunks, areply = asyncio.run(collect())
+    assert "".join(achunks) == areply == reply
+    assert backend.calls == 6 and backend.in_flight == 0
+
+
+def test_fake_backend_failure_injection():
+    """Test scripted and seeded failures."""
+    backend = FakeBackend(fail_statuses=[429, 503])
+    for status in (429, 503):
+        with pytest.raises(BackendError) as exc:
+            backend.complete("Function name: f")
+        assert exc.value.status_code == status
+    assert json.loads(backend.complete("Function name: f"))["summary"] == "Run f."
+
+    def failures(seed):
+        backend = FakeBackend(failure_rate=0.5, seed=seed)
+        out = []
+        for _ in range(20):
+            try:
+                backend.complete("x")
+                out.append(False)
+            except BackendError:
+                out.append(True)
+        return out
+
+    assert failures(1) == failures(1) and any(failures(1)) and not all(failures(1))
+
+
+def test_pipeline_runs_offline_on_fake_backend(tmp_path):
+    """Test generation with retries, packing and caching against the fake backend."""
+    fns = make_fns(12)
+    backend = FakeBackend(fail_statuses=[503], latency=0.001)
+    stats = {}
+    results = generate_all(fns, "google", backend=backend, limiter=RateLimiter(None, None),
+                           base_delay=0.001, stats=stats)
+    assert all(r["error"] is None for r in results)
+    assert stats["retries"] == 1 and backend.calls == 13
+    assert "Run fn4." in results[4]["docstring"]
+
+    cache = ContentCache(str(tmp_path / "c.sqlite3"))
+    packed = FakeBackend()
+    generate_all(fns, None, backend=packed, pack_budget=3000, limiter=RateLimiter(None, None), cache=cache)
+    assert packed.calls == 1
+    assert cache.get(content_key(fns[0], "fake", packed.temperature, packed=True)) is not None
+    assert generate_docstring(fns[0], backend=FakeBackend()).startswith('"""')
+
+
+def test_fake_reply_names_function():
+    """Test the reply for a single-function prompt."""
+    assert json.loads(fake_reply("Function name: load_user\n"))["summary"] == "Run load_user."
+
+
+def test_llamacpp_models_shared_per_settings(monkeypatch):
+    """Test one model and lock per path and settings, and that an abandoned stream frees the model."""
+    loads = []
+
+    class Model:
+        def invoke(self, prompt):
+            return "reply"
+
+        def stream(self, prompt):
+            yield from ("a", "b", "c")
+
+    def load(*settings):
+        loads.append(settings)
+        return Model()
+
+    monkeypatch.setattr(backends, "_llama_models", {})
+    monkeypatch.setattr(backends, "_load_llama", load)
+    first = LlamaCppBackend("/models/tiny.gguf", n_threads=2)
+    same = LlamaCppBackend("/models/tiny.gguf", n_threads=2)
+    other = LlamaCppBackend("/models/tiny.gguf", n_threads=2, n_ctx=2048)
+    assert first._llm() is same._llm()
+    assert other._llm()[0] is not first._llm()[0]
+    assert [s[1] for s in loads] == [8192, 2048]
+
+    stream = first.stream("prompt")
+    assert next(stream) == "a"
+    # the first stream is never finished or closed
+    replies = []
+    caller = threading.Thread(target=lambda: replies.append(same.complete("prompt")))
+    caller.start()
+    caller.join(timeout=5)
+    assert replies == ["reply"]
+    assert "".join(same.stream("prompt")) == "abc"
@@ -0,0 +1,146 @@
+"""Tests for concurrent, rate-limited docstring generation."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from benchmarks.llm_stub import StubLLMServer
+from core.docstring_engine.backends import FakeBackend
+from core.docstring_engine.batch import RateLimiter, TokenBucket, backoff_delay, generate_all, generate_docstrings
+from tests.helpers import http_content, make_fns
+
+
+def test_bounded_concurrency_against_stub_server():
+    """Test that calls overlap up to max_concurrency and every result arrives."""
+    fns = make_fns(20)
+    with StubLLMServer(latency=0.05) as server:
+        start = time.perf_counter()
+        results = generate_all(fns, "google", max_concurrency=5, limiter=RateLimiter(None, None),
+                               content=http_content(server.url))
+        elapsed = time.perf_counter() - start
+        assert server.max_in_flight <= 5
+        assert server.requests == 20
+    assert [r["index"] for r in results] == list(range(20))
+    assert all(r["error"] is None for r in results)
+    assert "Run fn7." in results[7]["docstring"]
+    assert "Args:" in results[7]["docstring"]
+    # 20 calls of 50 ms, 5 at a time: about 0.2 s, far below the 1 s of one-by-one calls
+    assert elapsed < 0.7
+
+
+def test_results_arrive_as_they_complete():
+    """Test that a slow call does not hold back the results of faster ones."""
+    async def content(fn):
+        await asyncio.sleep(0.2 if fn["name"] == "fn0" else 0.01)
+        return {"summary": fn["name"]}
+
+    async def collect():
+        return [r["index"] async for r in generate_docstrings(make_fns(4), max_concurrency=4,
+                                                              limiter=RateLimiter(None, None), content=content)]
+
+    order = asyncio.run(collect())
+    assert sorted(order) == [0, 1, 2, 3]
+    assert order[-1] == 0
+
+
+def test_retries_429_and_5xx_with_backoff():
+    """Test that 429/5xx replies are retried and then succeed."""
+    with StubLLMServer(fail_statuses=[429, 503, 500]) as server:
+        results = generate_all(make_fns(2), max_concurrency=1, limiter=RateLimiter(None, None),
+                               content=http_content(server.url), base_delay=0.001, seed=1)
+        assert server.requests == 5
+    assert all(r["error"] is None for r in results)
+    assert sum(r["attempts"] for r in results) == 5
+
+
+def test_non_retryable_error_is_reported():
+    """Test that a 400 fails the item once, without retries."""
+    with StubLLMServer(fail_statuses=[400]) as server:
+        results = generate_all(make_fns(2), max_concurrency=1, limiter=RateLimiter(None, None),
+                               content=http_content(server.url), base_delay=0.001)
+        assert server.requests == 2
+    assert results[0]["error"].startswith("HTTPStatusError") and results[0]["attempts"] == 1
+    assert results[1]["error"] is None
+
+
+def test_unexpected_worker_errors_are_reported():
+    """Test that a failing cache write yields error results instead of hanging."""
+    class BrokenCache:
+        def get_many(self, keys):
+            return {}
+
+        def put_many(self, contents, model):
+            raise sqlite3.OperationalError("database is locked")
+
+    for pack_budget in (None, 3000):
+        results = generate_all(make_fns(3), limiter=RateLimiter(None, None), backend=FakeBackend(),
+                               cache=BrokenCache(), pack_budget=pack_budget)
+        assert all(r["error"] == "OperationalError: database is locked" for r in results)
+
+
+def test_retry_after_pauses_limiter():
+    """Test that Retry-After is honoured instead of the jittered backoff."""
+    with StubLLMServer(fail_statuses=[429], retry_after=0.3) as server:
+        start = time.perf_counter()
+        results = generate_all(make_fns(1), limiter=RateLimiter(6000, None),
+                               content=http_content(server.url), base_delay=0.001)
+        assert time.perf_counter() - start >= 0.3
+    assert results[0]["attempts"] == 2
+
+
+def test_token_bucket_paces_requests():
+    """Test bucket refill and the delay it asks for."""
+    now = [0.0]
+    bucket = TokenBucket(rate=2.0, capacity=2.0, clock=lambda: now[0])
+    assert bucket.delay(1) == 0
+    bucket.take(1)
+    bucket.take(1)
+    assert bucket.delay(1) == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.delay(1) == 0
+    bucket.pause(3.0)
+    assert bucket.delay(1) == pytest.approx(3.0)
+
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600, burst=1 / 60, clock=lambda: now[0])
+    assert limiter.delay(10) == 0
+    limiter.requests.take(1)
+    limiter.tokens.take(10)
+    assert limiter.delay(10) == pytest.approx(1.0)
+
+
+def test_backoff_is_jittered_and_capped():
+    """Test full-jitter bounds."""
+    import random
+
+    rng = random.Random(0)
+    delays = [backoff_delay(a, base=1.0, cap=4.0, rng=rng) for a in range(10)]
+    assert all(0 <= d <= min(4.0, 2 ** a) for a, d in enumerate(delays))
+    assert len(set(delays)) == len(delays)
+
+
+def test_unknown_style_raises():
+    """Test that the style is checked before any call."""
+    with pytest.raises(ValueError):
+        generate_all(make_fns(1), style="bogus")
+
+
+def test_rate_limiter_shared_across_event_loops_and_threads():
+    """Test that one limiter paces separate asyncio.run calls and blocking callers."""
+    limiter = RateLimiter(6000, None, burst=0)  # one request at once, then one per 10 ms
+
+    async def contend():
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    start = time.perf_counter()
+    asyncio.run(contend())
+    asyncio.run(contend())
+    threads = [threading.Thread(target=limiter.wait) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    # nine requests, the first from the burst: at least eight intervals
+    assert time.perf_counter() - start >= 0.075
@@ -0,0 +1,45 @@
+"""Tests for the benchmark corpus generator and regression check."""
+
+import ast
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.suite import compare
+from core.parser.python_parser import parse_path
+
+
+def test_corpus_is_deterministic_and_valid(tmp_path):
+    """Test that the same seed gives identical, parseable files."""
+    generate_corpus(str(tmp_path / "a"), files=3, functions_per_file=10, seed=7, nesting=3)
+    generate_corpus(str(tmp_path / "b"), files=3, functions_per_file=10, seed=7, nesting=3)
+
+    a_files = sorted((tmp_path / "a").rglob("*.py"))
+    b_files = sorted((tmp_path / "b").rglob("*.py"))
+    assert len(a_files) == 3
+    for fa, fb in zip(a_files, b_files):
+        assert fa.read_text() == fb.read_text()
+        ast.parse(fa.read_text())
+
+    results = parse_path(str(tmp_path / "a"))
+    n = sum(len(r["functions"]) + sum(len(c["methods"]) for c in r["classes"]) for r in results)
+    assert n == 30
+
+
+def test_corpus_respects_docstring_ratio(tmp_path):
+    """Test the docstring ratio extremes."""
+    generate_corpus(str(tmp_path / "none"), files=1, functions_per_file=10, docstring_ratio=0.0)
+    generate_corpus(str(tmp_path / "all"), files=1, functions_per_file=10, docstring_ratio=1.0)
+    none = parse_path(str(tmp_path / "none"))[0]["functions"]
+    every = parse_path(str(tmp_path / "all"))[0]["functions"]
+    assert not any(f["has_docstring"] for f in none)
+    assert all(f["has_docstring"] for f in every)
+
+
+def test_compare_flags_regressions():
+    """Test the threshold check against a baseline."""
+    baseline = {"timings": {"parse_path": 1.0, "write_report": 1.0}}
+    latest = {"timings": {"parse_path": 1.1, "write_report": 1.5, "new_bench": 2.0}}
+    rows = {r["name"]: r for r in compare(latest, baseline, threshold=0.2)}
+
+    assert rows["parse_path"]["regressed"] is False
+    assert rows["write_report"]["regressed"] is True
+    assert rows["new_bench"]["baseline"] is None and rows["new_bench"]["regressed"] is False
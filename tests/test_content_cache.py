@@ -0,0 +1,118 @@
+"""Tests for the persistent LLM content cache."""
+
+import os
+import time
+
+from benchmarks.llm_stub import StubLLMServer
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.content_cache import ContentCache, content_key, main
+from core.parser.python_parser import parse_file
+from tests.helpers import http_complete, http_content
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def functions(path):
+    return parse_file(path)["functions"]
+
+
+def test_key_follows_signature_body_and_model(tmp_path):
+    """Test that the key changes with the body, signature, model or prompt version only."""
+    fp = write(tmp_path / "m.py", "def f(a: int) -> int:\n    return a + 1\n")
+    base = content_key(functions(fp)[0])
+    os.utime(fp, (time.time() + 10, time.time() + 10))
+    assert content_key(functions(fp)[0]) == base  # touched, not edited
+    assert content_key(functions(fp)[0], model="other") != base
+    assert content_key(functions(fp)[0], temperature=0.9) != base
+    assert content_key(functions(fp)[0], prompt_version="x") != base
+    write(tmp_path / "m.py", "def f(a: int) -> int:\n    return a + 2\n")
+    assert content_key(functions(fp)[0]) != base
+    write(tmp_path / "m.py", "def f(a: str) -> int:\n    return a + 1\n")
+    assert content_key(functions(fp)[0]) != base
+
+
+def test_get_put_and_counters(tmp_path):
+    """Test hits, misses and persistence across instances."""
+    db = str(tmp_path / "c.sqlite3")
+    cache = ContentCache(db)
+    assert cache.get("k") is None
+    cache.put("k", {"summary": "S."})
+    assert cache.get("k") == {"summary": "S."}
+    cache.put("bad", {"summary": "x", "fallback": True})
+    assert cache.get("bad") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    cache.close()
+    assert ContentCache(db).get("k") == {"summary": "S."}
+
+
+def test_ttl_and_purge(tmp_path):
+    """Test that expired entries miss and purge removes them."""
+    cache = ContentCache(str(tmp_path / "c.sqlite3"), ttl=0.05)
+    cache.put("old", {"summary": "S."})
+    time.sleep(0.1)
+    cache.put("new", {"summary": "N."})
+    assert cache.purge(expired_only=True) == 1
+    assert cache.get("new") == {"summary": "N."}
+    time.sleep(0.1)
+    assert cache.get("new") is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["entries"] == 0
+    cache.put("a", {"summary": "A."})
+    assert cache.purge() == 1
+
+
+def test_lru_eviction_by_size(tmp_path):
+    """Test that the least recently used entries go once max_bytes is exceeded."""
+    cache = ContentCache(str(tmp_path / "c.sqlite3"), max_bytes=100)
+    cache.put("a", {"summary": "A" * 30})
+    time.sleep(0.001)
+    cache.put("b", {"summary": "B" * 30})
+    time.sleep(0.001)
+    cache.get("a")
+    cache.put("c", {"summary": "C" * 30})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.total_bytes <= 100
+
+
+def test_rescan_of_unchanged_code_makes_no_requests(tmp_path):
+    """Test that a second generation pass over unchanged functions is served from the cache."""
+    fp = write(tmp_path / "m.py", "".join(f"def f{i}(x):\n    return x * {i}\n\n" for i in range(6)))
+    cache = ContentCache(str(tmp_path / "c.sqlite3"))
+    with StubLLMServer() as server:
+        first = generate_all(functions(fp), content=http_content(server.url), limiter=RateLimiter(None, None),
+                             cache=cache)
+        assert server.requests == 6
+        stats = {}
+        second = generate_all(functions(fp), content=http_content(server.url), limiter=RateLimiter(None, None),
+                              cache=cache, stats=stats)
+        assert server.requests == 6
+        assert stats == {"cached": 6}
+        # packed prompts carry less source: their content is cached apart from the single prompt's
+        generate_all(functions(fp), complete=http_complete(server.url), pack_budget=3000,
+                     limiter=RateLimiter(None, None), cache=cache, style="numpy")
+        assert server.requests == 7
+        packed = generate_all(functions(fp), complete=http_complete(server.url), pack_budget=3000,
+                              limiter=RateLimiter(None, None), cache=cache, style="numpy")
+        assert server.requests == 7
+    assert [r["docstring"] for r in first] == [r["docstring"] for r in second]
+    assert all(r["cached"] for r in second + packed)
+    fn = functions(fp)[0]
+    assert content_key(fn, packed=True) != content_key(fn)
+    assert content_key(fn, packed=True) == content_key(fn, source_budget=10_000, packed=True)
+
+
+def test_cli_stats_and_purge(tmp_path, capsys):
+    """Test the purge command."""
+    db = str(tmp_path / "c.sqlite3")
+    cache = ContentCache(db)
+    cache.put("a", {"summary": "A."})
+    cache.close()
+    assert main(["--db", db, "--stats"]) == 0
+    assert "1 entries" in capsys.readouterr().out
+    assert main(["--db", db, "--purge"]) == 0
+    assert "purged 1" in capsys.readouterr().out
+    assert ContentCache(db).stats()["entries"] == 0
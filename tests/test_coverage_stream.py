@@ -0,0 +1,58 @@
+"""Tests for streaming coverage aggregation."""
+import os
+
+import pytest
+
+from core.reporter.coverage_reporter import (
+    CoverageAggregator,
+    compute_coverage,
+    stream_coverage_report,
+    write_report,
+)
+from core.parser.python_parser import iter_parse_path, parse_path
+
+
+def test_streamed_report_matches_write_report(tmp_path):
+    """Test that the streamed report file is identical to the in-memory one."""
+    expected = tmp_path / "expected.json"
+    streamed = tmp_path / "streamed.json"
+    write_report(compute_coverage(parse_path("examples")), str(expected))
+
+    summary = stream_coverage_report(iter_parse_path("examples"), str(streamed))
+
+    assert streamed.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+    assert summary == compute_coverage(parse_path("examples"))["summary"]
+
+
+def test_streamed_report_empty(tmp_path):
+    """Test streaming with no input files."""
+    expected = tmp_path / "expected.json"
+    streamed = tmp_path / "streamed.json"
+    write_report(compute_coverage([]), str(expected))
+    stream_coverage_report([], str(streamed))
+    assert streamed.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+
+
+def test_aggregator_in_memory_matches_compute_coverage():
+    """Test the in-memory aggregator against compute_coverage."""
+    agg = CoverageAggregator()
+    for r in iter_parse_path("examples"):
+        agg.add(r)
+    assert agg.finish() == compute_coverage(parse_path("examples"))
+
+
+def test_failed_stream_keeps_previous_report(tmp_path):
+    """Test that an error mid-scan leaves the previous report and no temporary file."""
+    streamed = tmp_path / "streamed.json"
+    stream_coverage_report(iter_parse_path("examples"), str(streamed))
+    previous = streamed.read_text(encoding="utf-8")
+
+    def failing():
+        yield next(iter_parse_path("examples"))
+        raise OSError("disk went away")
+
+    with pytest.raises(OSError):
+        stream_coverage_report(failing(), str(streamed))
+
+    assert streamed.read_text(encoding="utf-8") == previous
+    assert os.listdir(tmp_path) == ["streamed.json"]
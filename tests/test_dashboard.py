@@ -45,4 +45,19 @@ def test_filter_functions_combined():
     
     filtered = filter_functions(functions, search="test", status="OK")
     assert len(filtered) == 1
-    assert filtered[0]["name"] == "test_doc"
\ No newline at end of file
+    assert filtered[0]["name"] == "test_doc"
+
+def test_filter_functions_with_index():
+    """Test that an index-backed lookup returns the same matches."""
+    from core.search.symbol_index import SymbolIndex
+
+    index = SymbolIndex([{"path": "test.py", "classes": [], "functions": [
+        {"name": "test_doc", "lineno": 1, "has_docstring": True},
+        {"name": "test_undoc", "lineno": 5, "has_docstring": False},
+        {"name": "other_doc", "lineno": 9, "has_docstring": True},
+    ]}])
+
+    filtered = filter_functions([], search="test", status="OK", index=index)
+    assert [f["name"] for f in filtered] == ["test_doc"]
+    assert filtered[0]["file_path"] == "test.py"
+    assert len(filter_functions([], status="Fix", index=index)) == 1
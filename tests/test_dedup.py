@@ -0,0 +1,119 @@
+"""Tests for fingerprint deduplication of docstring generation."""
+
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.dedup import adapt_content
+from core.docstring_engine.llm_integration import parse_content
+from core.parser.fingerprint import dedup_summary, group_duplicates
+from core.parser.python_parser import parse_path
+from core.reporter.coverage_reporter import compute_coverage, fingerprint_counts, update_coverage
+
+SOURCES = {
+    "a.py": "def total(items, scale=2):\n    acc = 0\n    for x in items:\n        acc += x * scale\n    return acc\n",
+    # same code: other names, a comment, a docstring-free copy with extra blank lines
+    "b.py": "def sum_all(values,   factor=2):\n    # running sum\n    s = 0\n\n    for v in values:\n"
+            "        s += v * factor\n    return s\n",
+    # different constant, attribute and global: not duplicates
+    "c.py": "def total(items, scale=3):\n    acc = 0\n    for x in items:\n        acc += x * scale\n    return acc\n\n\n"
+            "def norm(p):\n    return p.strip()\n\n\ndef norm2(p):\n    return p.lower()\n\n\n"
+            "def documented(items, scale=2):\n    \"\"\"Doc.\"\"\"\n    return items\n",
+}
+
+
+def parse(tmp_path):
+    for name, text in SOURCES.items():
+        (tmp_path / name).write_text(text)
+    results = sorted(parse_path(str(tmp_path)), key=lambda r: r["path"])
+    return results, [fn for r in results for fn in r["functions"]]
+
+
+def test_fingerprint_ignores_layout_comments_and_local_names(tmp_path):
+    """Test which functions share a fingerprint."""
+    _, fns = parse(tmp_path)
+    a, b, c, norm, norm2, documented = [fn["fingerprint"] for fn in fns]
+    assert a == b
+    assert len({a, c, norm, norm2}) == 4
+    assert documented is None
+    assert group_duplicates(fns) == [[0, 1], [2], [3], [4], [5]]
+    assert dedup_summary(fn["fingerprint"] for fn in fns if not fn["has_docstring"]) == {
+        "undocumented": 5, "unique": 4, "dedup_ratio": 0.2}
+
+
+def test_adapt_content_renames_arguments():
+    """Test argument and name rewriting of shared content."""
+    source = {"name": "total", "args": [{"name": "items"}, {"name": "scale"}]}
+    target = {"name": "sum_all", "args": [{"name": "values"}, {"name": "factor"}]}
+    content = {"summary": "Sum items times scale (see total).", "args": {"items": "Numbers.", "scale": "Factor."},
+               "returns": "Sum of items.", "raises": {"TypeError": "If items holds non-numbers."}}
+    adapted = adapt_content(content, source, target)
+    assert adapted == {"summary": "Sum values times factor (see sum_all).",
+                       "args": {"values": "Numbers.", "factor": "Factor."},
+                       "returns": "Sum of values.", "raises": {"TypeError": "If values holds non-numbers."}}
+    assert content["args"] == {"items": "Numbers.", "scale": "Factor."}
+    swapped = adapt_content({"summary": "`a` then 'b'"}, {"args": [{"name": "a"}, {"name": "b"}]},
+                            {"args": [{"name": "b"}, {"name": "a"}]})
+    assert swapped["summary"] == "`b` then 'a'"
+
+
+def test_adapt_content_leaves_prose_alone_for_short_names():
+    """Test that a one-letter argument is only renamed where quoted."""
+    content = {"summary": "Plot `x` on the x axis.", "args": {"x": "Values for the x axis, like 'x'."}}
+    adapted = adapt_content(content, {"args": [{"name": "x"}]}, {"args": [{"name": "data"}]})
+    assert adapted == {"summary": "Plot `data` on the x axis.", "args": {"data": "Values for the x axis, like 'data'."}}
+
+
+def test_generation_runs_once_per_fingerprint(tmp_path):
+    """Test that duplicates share one request and get their own argument names."""
+    _, fns = parse(tmp_path)
+    fns = [fn for fn in fns if not fn["has_docstring"]]
+    calls = []
+
+    async def content(fn):
+        calls.append(fn["name"])
+        return {"summary": f"Scale {fn['args'][0]['name']}.",
+                "args": {a["name"]: f"The {a['name']}." for a in fn["args"]}}
+
+    stats = {}
+    results = generate_all(fns, "google", content=content, limiter=RateLimiter(None, None), stats=stats)
+    assert sorted(calls) == ["norm", "norm2", "total", "total"]
+    assert stats["deduplicated"] == 1
+    assert results[1]["shared_with"] == 0 and results[1]["prompt_tokens"] == 0
+    assert results[1]["content"]["args"] == {"values": "The values.", "factor": "The factor."}
+    assert "Scale values." in results[1]["docstring"] and "factor" in results[1]["docstring"]
+    generate_all(fns, None, content=content, limiter=RateLimiter(None, None), dedup=False)
+    assert len(calls) == 9
+
+
+def test_placeholder_content_is_not_shared(tmp_path):
+    """Test that duplicates of a function whose reply could not be parsed get their own placeholder."""
+    _, fns = parse(tmp_path)
+    fns = [fn for fn in fns if fn["name"] in ("total", "sum_all")][:2]
+
+    async def content(fn):
+        return parse_content("not json", fn)
+
+    results = generate_all(fns, None, content=content, limiter=RateLimiter(None, None))
+    assert results[1]["shared_with"] == 0
+    assert results[1]["content"]["fallback"]
+    assert results[1]["content"]["args"] == {"values": "DESCRIPTION", "factor": "DESCRIPTION"}
+    assert "sum_all" in results[1]["content"]["summary"]
+
+
+def test_scan_report_exposes_dedup_ratio(tmp_path):
+    """Test the dedup counts in the coverage summary."""
+    results, _ = parse(tmp_path)
+    assert compute_coverage(results)["summary"]["dedup"] == {"undocumented": 5, "unique": 4, "dedup_ratio": 0.2}
+
+
+def test_dedup_counts_patched_per_file(tmp_path):
+    """Test that update_coverage adjusts the fingerprint counts by each file's delta."""
+    results, _ = parse(tmp_path)
+    report = compute_coverage(results)
+    counts = fingerprint_counts(report)
+    assert sum(counts.values()) == 5 and len(counts) == 4
+
+    (tmp_path / "b.py").write_text('def sum_all(values, factor=2):\n    """Doc."""\n    return values\n')
+    changed = [r for r in parse_path(str(tmp_path)) if r["path"].endswith("b.py")]
+    update_coverage(report, changed, [results[2]["path"]], counts)
+    assert report["summary"]["dedup"] == {"undocumented": 1, "unique": 1, "dedup_ratio": 0.0}
+    assert report == compute_coverage([results[0]] + changed)
+    assert counts == fingerprint_counts(report)
@@ -0,0 +1,78 @@
+"""Tests for the coverage-only scan mode."""
+
+from core.parser.fast_coverage import coverage_path, main
+from core.parser.python_parser import parse_path
+from core.reporter.coverage_reporter import compute_coverage
+
+
+EDGE_CASES = '''"""Module doc."""
+import functools
+
+
+@functools.lru_cache()
+def decorated():
+    """Doc."""
+
+
+async def skipped():
+    """Async defs are not reported by the parser."""
+
+
+def empty_doc():
+    """"""
+
+
+def fstring_first():
+    f"not a docstring"
+
+
+def one_liner(): "doc"
+
+
+class Outer:
+    """Outer."""
+
+    def method(self):
+        pass
+
+    class Inner:
+        def hidden(self):
+            """Nested classes are not reported."""
+
+    if True:
+        def conditional(self):
+            pass
+
+
+if __name__ == "__main__":
+    def not_top_level():
+        pass
+'''
+
+
+def test_coverage_only_matches_full_parser_on_examples():
+    """Test identical coverage numbers to the full parser on the examples corpus."""
+    assert compute_coverage(coverage_path("examples", fingerprints=True)) == compute_coverage(parse_path("examples"))
+    fast = compute_coverage(coverage_path("examples"))["summary"]
+    full = compute_coverage(parse_path("examples"))["summary"]
+    assert fast["coverage_percent"] == full["coverage_percent"]
+    # without fingerprints there are no dedup counts to report
+    assert "dedup" not in fast and full["dedup"]["undocumented"] > 0
+
+
+def test_coverage_only_matches_full_parser_on_edge_cases(tmp_path):
+    """Test decorators, async defs, empty docstrings and nested blocks."""
+    (tmp_path / "edge.py").write_text(EDGE_CASES, encoding="utf-8")
+    fast = coverage_path(str(tmp_path), fingerprints=True)
+    full = parse_path(str(tmp_path))
+
+    assert compute_coverage(fast) == compute_coverage(full)
+    assert fast[0]["module_docstring"] is full[0]["module_docstring"] is True
+
+
+def test_precommit_entry_point_fail_under(tmp_path, capsys):
+    """Test the command-line check exit status."""
+    (tmp_path / "a.py").write_text('def a():\n    """Doc."""\n\ndef b():\n    pass\n', encoding="utf-8")
+    assert main([str(tmp_path), "--fail-under", "50"]) == 0
+    assert main([str(tmp_path), "--fail-under", "90"]) == 1
+    assert "50.0%" in capsys.readouterr().out
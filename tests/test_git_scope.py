@@ -0,0 +1,128 @@
+"""Tests for git-revision-scoped scanning."""
+import subprocess
+
+import pytest
+
+from core.parser.git_scope import _parse_diff, changed_hunks, main, scan_changes
+
+
+BASE = '''def kept():
+    """Doc."""
+    return 1
+
+
+def edited():
+    return 2
+
+
+class Box:
+    """Box."""
+
+    def untouched(self):
+        return 3
+
+    def changed(self):
+        return 4
+'''
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "t@example.com")
+    _git(tmp_path, "config", "user.name", "t")
+    (tmp_path / "mod.py").write_text(BASE, encoding="utf-8")
+    (tmp_path / "other.py").write_text("def same():\n    pass\n", encoding="utf-8")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+
+def test_parse_diff_ranges():
+    """Test that hunk headers map to new-side line ranges."""
+    diff = (b"+++ b/pkg/a.py\n@@ -3 +3 @@\n@@ -10,2 +10,4 @@\n@@ -20,3 +21,0 @@\n"
+            b"+++ /dev/null\n@@ -1,5 +0,0 @@\n")
+    assert _parse_diff(diff) == {"pkg/a.py": [(3, 3), (10, 13), (21, 22)]}
+
+
+def test_parse_diff_paths_with_spaces_and_quotes():
+    """Test git's trailing tab after names with spaces and its C-quoted names."""
+    diff = (b"+++ b/pkg/my mod.py\t\n@@ -1 +1,2 @@\n"
+            b'+++ "b/pkg/caf\\303\\251 \\"q\\".py"\n@@ -4 +4 @@\n'
+            b'+++ "b/pkg/tab\\tname.py"\t\n@@ -2 +2 @@\n')
+    assert _parse_diff(diff) == {"pkg/my mod.py": [(1, 2)], 'pkg/café "q".py': [(4, 4)], "pkg/tab\tname.py": [(2, 2)]}
+    quoted = b'+++ "b/back\\\\slash\\nnew\\001.py"\n@@ -1 +1 @@\n'
+    assert _parse_diff(quoted) == {"back\\slash\nnew\x01.py": [(1, 1)]}
+
+
+def test_changed_file_with_space_in_name(repo):
+    """Test that a changed file whose name contains a space is scanned."""
+    (repo / "my mod.py").write_text("def spaced():\n    return 1\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "spaced")
+    (repo / "my mod.py").write_text("def spaced():\n    return 2\n", encoding="utf-8")
+
+    results = scan_changes(repo=str(repo))
+
+    assert [r["path"] for r in results] == [str(repo / "my mod.py")]
+    assert [f["name"] for f in results[0]["functions"]] == ["spaced"]
+
+
+def test_working_tree_scope(repo):
+    """Test that only functions intersecting the diff are reported."""
+    text = BASE.replace("return 2", "return 20").replace("return 4", "return 40")
+    (repo / "mod.py").write_text(text, encoding="utf-8")
+
+    results = scan_changes(repo=str(repo))
+
+    assert [r["path"] for r in results] == [str(repo / "mod.py")]
+    r = results[0]
+    assert [f["name"] for f in r["functions"]] == ["edited"]
+    assert [c["name"] for c in r["classes"]] == ["Box"]
+    assert [m["name"] for m in r["classes"][0]["methods"]] == ["changed"]
+
+
+def test_untracked_files_are_fully_touched(repo):
+    """Test that new untracked files count as changed in working-tree modes, but not staged."""
+    (repo / "pkg").mkdir()
+    (repo / "pkg" / "fresh.py").write_text("def one():\n    pass\n\n\ndef two():\n    pass\n", encoding="utf-8")
+    (repo / "skipped.py").write_text("def hidden():\n    pass\n", encoding="utf-8")
+    (repo / ".gitignore").write_text("skipped.py\n", encoding="utf-8")
+
+    assert changed_hunks(repo=str(repo)) == {"pkg/fresh.py": [(1, 6)]}
+    results = scan_changes(base="HEAD", repo=str(repo))
+    assert [f["name"] for r in results for f in r["functions"]] == ["one", "two"]
+    assert scan_changes(staged=True, repo=str(repo)) == []
+
+
+def test_staged_scope_reads_index(repo):
+    """Test that staged mode parses index content, not the working tree."""
+    (repo / "mod.py").write_text(BASE.replace("return 1", "return 10"), encoding="utf-8")
+    _git(repo, "add", "mod.py")
+    # unstaged edit that must be ignored
+    (repo / "mod.py").write_text("def kept(:\n", encoding="utf-8")
+
+    results = scan_changes(staged=True, repo=str(repo))
+
+    assert [f["name"] for f in results[0]["functions"]] == ["kept"]
+    assert results[0]["classes"] == []
+
+
+def test_base_revision_and_exit_status(repo, capsys):
+    """Test that --base covers commits since the merge-base and fails on missing docs."""
+    (repo / "new.py").write_text('def fresh():\n    """Doc."""\n', encoding="utf-8")
+    _git(repo, "add", "new.py")
+    _git(repo, "commit", "-q", "-m", "add new")
+    (repo / "mod.py").write_text(BASE.replace("return 2", "return 22"), encoding="utf-8")
+
+    results = scan_changes(base="HEAD~1", repo=str(repo))
+    names = {f["name"] for r in results for f in r["functions"]}
+    assert names == {"fresh", "edited"}
+
+    assert main(["--base", "HEAD~1", "--repo", str(repo), "--fail-under", "100"]) == 1
+    assert "missing docstring: edited" in capsys.readouterr().out
+    assert main(["--base", "HEAD~1", "--repo", str(repo), "--fail-under", "50"]) == 0
@@ -0,0 +1,67 @@
+"""Tests for gitignore/pyproject-aware directory pruning."""
+
+import subprocess
+from pathlib import Path
+
+from core.parser.ignore import IgnoreMatcher
+from core.parser.python_parser import parse_path
+
+
+GITIGNORE = """# comment
+build/
+*.gen.py
+/top_only.py
+docs/**/draft_*.py
+!keep.gen.py
+nested/deep/
+"""
+
+FILES = [
+    "a.py", "keep.gen.py", "x.gen.py", "top_only.py", "sub/top_only.py",
+    "build/b.py", "sub/build/c.py", "docs/draft_1.py", "docs/v1/v2/draft_2.py", "docs/final.py",
+    "nested/deep/d.py", "nested/e.py", "node_modules/pkg/f.py", "sub/local.py", "sub/skipme/g.py",
+    "env/lib/site.py",
+]
+
+
+def _tree(root):
+    for rel in FILES:
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("def f():\n    pass\n", encoding="utf-8")
+    (root / ".gitignore").write_text(GITIGNORE, encoding="utf-8")
+    (root / "sub" / ".gitignore").write_text("skipme/\n!/top_only.py\nlocal.py\n", encoding="utf-8")
+    (root / "env" / "pyvenv.cfg").write_text("home = /usr\n", encoding="utf-8")
+    (root / "pyproject.toml").write_text('[tool.code-reviewer]\nexclude = ["node_modules/"]\n',
+                                         encoding="utf-8")
+
+
+def test_matches_git_check_ignore(tmp_path):
+    """Test that file decisions agree with git's own matcher."""
+    _tree(tmp_path)
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    proc = subprocess.run(["git", "-C", str(tmp_path), "check-ignore", "--stdin"],
+                          input="\n".join(FILES), capture_output=True, text=True)
+    git_ignored = set(proc.stdout.split())
+
+    matcher = IgnoreMatcher(str(tmp_path), pyproject=False)
+    ours = {rel for rel in FILES if matcher.is_ignored(str(tmp_path / rel))}
+    # virtualenvs are skipped regardless of .gitignore
+    assert ours == git_ignored | {"env/lib/site.py"}
+
+
+def test_parse_path_prunes_ignored_trees(tmp_path):
+    """Test that parse_path honours .gitignore, pyproject excludes and virtualenvs."""
+    _tree(tmp_path)
+    scanned = {str(Path(r["path"]).relative_to(tmp_path)) for r in parse_path(str(tmp_path))}
+    assert scanned == {"a.py", "keep.gen.py", "sub/top_only.py", "docs/final.py", "nested/e.py"}
+    assert len(parse_path(str(tmp_path), ignore_files=False)) == len(FILES)
+
+
+def test_pyproject_include(tmp_path):
+    """Test that include globs restrict the scanned files."""
+    _tree(tmp_path)
+    (tmp_path / "pyproject.toml").write_text('[tool.code-reviewer]\ninclude = ["docs/*.py", "a.py"]\n',
+                                             encoding="utf-8")
+    assert sorted(r["path"] for r in parse_path(str(tmp_path))) == [
+        str(tmp_path / "a.py"), str(tmp_path / "docs" / "final.py")]
@@ -0,0 +1,140 @@
+"""Tests for the project import graph."""
+
+import os
+
+from core.parser.import_graph import ImportGraph, module_name
+from core.parser.python_parser import parse_file, parse_path
+from core.parser.watcher import ScanWatcher
+from core.reporter.coverage_reporter import compute_coverage
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def _project(tmp_path):
+    return {
+        "base": _write(tmp_path, "pkg/base.py", "def api(x):\n    return x\n\ndef _helper():\n    pass\n"),
+        "user": _write(tmp_path, "pkg/user.py", "from pkg.base import api\n\ndef run():\n    return api(1)\n"),
+        "rel": _write(tmp_path, "pkg/sub/rel.py", "from ..base import api\nfrom . import sibling\n"),
+        "sibling": _write(tmp_path, "pkg/sub/sibling.py", "import os\nimport pkg.sub.rel\n"),
+    }
+
+
+def test_resolution_and_cycles(tmp_path):
+    """Test absolute/relative resolution, stdlib filtering and cycle detection."""
+    files = _project(tmp_path)
+    graph = ImportGraph(str(tmp_path), parse_path(str(tmp_path)))
+
+    assert module_name(files["rel"], str(tmp_path)) == "pkg.sub.rel"
+    assert graph.deps[files["user"]] == {files["base"]}
+    assert graph.deps[files["rel"]] == {files["base"], files["sibling"]}
+    assert graph.deps[files["sibling"]] == {files["rel"]}
+    assert graph.dependents(files["base"]) == {files["user"], files["rel"]}
+    assert graph.dependents(files["base"], transitive=True) == {files["user"], files["rel"], files["sibling"]}
+    assert graph.cycles() == [sorted([files["rel"], files["sibling"]])]
+
+
+def test_signature_changes_drive_invalidation(tmp_path):
+    """Test that only public signature changes report importers, and caches are told."""
+    files = _project(tmp_path)
+    graph = ImportGraph(str(tmp_path), parse_path(str(tmp_path)))
+
+    _write(tmp_path, "pkg/base.py", "def api(x):\n    return x + 1\n\ndef _helper(y):\n    pass\n")
+    assert graph.update_file(parse_file(files["base"])) == set()
+
+    _write(tmp_path, "pkg/base.py", "def api(x, y=0):\n    return x + y\n")
+    stale = graph.update_file(parse_file(files["base"]))
+    assert stale == {files["user"], files["rel"], files["sibling"]}
+
+    class Cache:
+        def __init__(self):
+            self.dropped = []
+
+        def invalidate(self, path):
+            self.dropped.append(path)
+
+    cache = Cache()
+    graph.invalidate(sorted(stale), [cache])
+    assert cache.dropped == sorted(stale)
+
+    # removing and re-adding a module re-resolves its importers
+    assert graph.remove_file(files["base"]) == {files["user"], files["rel"], files["sibling"]}
+    assert graph.deps[files["user"]] == set()
+    assert graph.update_file(parse_file(files["base"])) == {files["user"], files["rel"], files["sibling"]}
+    assert graph.deps[files["user"]] == {files["base"]}
+
+
+def test_watcher_reports_dependents(tmp_path):
+    """Test that a watcher with a graph lists unchanged importers of a changed API."""
+    files = _project(tmp_path)
+    watcher = ScanWatcher(str(tmp_path), use_inotify=False, graph=ImportGraph(str(tmp_path)))
+
+    _write(tmp_path, "pkg/base.py", "def api(x: int) -> int:\n    return x\n")
+    st = os.stat(files["base"])
+    os.utime(files["base"], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    delta = watcher.poll()
+
+    assert delta["modified"] == [files["base"]]
+    assert delta["dependents"] == sorted([files["rel"], files["sibling"], files["user"]])
+    watcher.close()
+
+
+def test_package_init_edges_and_dependent_cache_invalidation(tmp_path):
+    """Test that the graph sees __init__.py re-exports and the watcher drops dependents' parse cache entries."""
+    from core.parser.parse_cache import ParseCache
+
+    files = _project(tmp_path)
+    init = _write(tmp_path, "pkg/__init__.py", "from pkg.base import api\n")
+    app = _write(tmp_path, "app.py", "from pkg import api\n\ndef main():\n    return api(2)\n")
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"))
+    watcher = ScanWatcher(str(tmp_path), cache=cache, use_inotify=False, graph=ImportGraph(str(tmp_path)))
+
+    assert init in watcher.graph
+    assert init not in {r["path"] for r in watcher.results}
+    assert watcher.report == compute_coverage(parse_path(str(tmp_path)))
+    assert watcher.graph.deps[app] == {init}
+    assert watcher.graph.dependents(files["base"], transitive=True) >= {init, app}
+    assert cache.get(files["user"]) is not None
+
+    _write(tmp_path, "pkg/base.py", "def api(x, y=0):\n    return x\n")
+    st = os.stat(files["base"])
+    os.utime(files["base"], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    delta = watcher.poll()
+
+    assert {app, files["user"]} <= set(delta["dependents"])
+    assert init not in delta["dependents"]
+    assert cache.get(files["user"]) is None
+    assert cache.get(files["base"]) is not None
+
+    _write(tmp_path, "pkg/__init__.py", "from pkg.base import api\n\ndef extra():\n    pass\n")
+    st = os.stat(init)
+    os.utime(init, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    delta = watcher.poll()
+    assert delta["dependents"] == [app]
+    assert delta["modified"] == delta["created"] == []
+    watcher.close()
+    cache.close()
+
+
+def test_subdirectory_scan_and_none_defaults(tmp_path):
+    """Test absolute imports resolving from a package subdirectory scan, and None defaults."""
+    base = _write(tmp_path, "pkg/base.py", "def api(x=None):\n    return x\n")
+    _write(tmp_path, "pkg/__init__.py", "")
+    _write(tmp_path, "pkg/sub/__init__.py", "")
+    user = _write(tmp_path, "pkg/sub/user.py", "from pkg.sub.peer import run\n")
+    peer = _write(tmp_path, "pkg/sub/peer.py", "from pkg.base import api\n\ndef run():\n    return api()\n")
+    sub = str(tmp_path / "pkg" / "sub")
+    graph = ImportGraph(sub, parse_path(sub))
+
+    assert module_name(user, sub) == "pkg.sub.user"
+    assert not any(r["path"].endswith("__init__.py") for r in parse_path(str(tmp_path)))
+    assert graph.deps[user] == {peer}
+    assert base not in graph
+
+    result = parse_file(peer)
+    result["functions"][0]["defaults"] = [None]
+    assert graph.update_file(result) == {user}
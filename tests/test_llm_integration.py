@@ -131,4 +131,26 @@ def test_llm_handles_function_without_return(monkeypatch):
     assert isinstance(result, dict)
     assert "returns" in result
     # Returns field should indicate no return value
-    assert result["returns"] is not None or result["returns"] == "None"
\ No newline at end of file
+    assert result["returns"] is not None or result["returns"] == "None"
+
+def test_client_manager_reuses_clients(monkeypatch):
+    """Test that one client is built per (model, temperature, key) and shared across threads."""
+    pytest.importorskip("langchain_groq")
+    from concurrent.futures import ThreadPoolExecutor
+
+    manager = llm_integration.ClientManager(max_connections=4, max_keepalive=2)
+    with ThreadPoolExecutor(8) as pool:
+        clients = list(pool.map(lambda _: manager.get("m", 0.3, api_key="k1"), range(32)))
+    assert all(c is clients[0] for c in clients)
+    assert manager.get("m", 0.3, api_key="k2") is not clients[0]
+    assert manager.get("m", 0.7, api_key="k1") is not clients[0]
+    assert manager.stats() == {"clients": 3, "created": 3, "reused": 31}
+    manager.close()
+    assert manager.stats()["clients"] == 0
+
+
+def test_client_manager_requires_key(monkeypatch):
+    """Test that a missing GROQ_API_KEY is reported before any client is built."""
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    with pytest.raises(RuntimeError, match="GROQ_API_KEY"):
+        llm_integration.ClientManager().get()
@@ -0,0 +1,45 @@
+"""Tests for the compact parse result models."""
+
+from core.parser.models import FileInfo, compact_results, expand_results
+from core.parser.python_parser import parse_path
+from core.reporter.coverage_reporter import compute_coverage
+
+
+def test_compact_round_trip():
+    """Test that compact results convert back to the exact parse_file dicts."""
+    results = parse_path("examples")
+    compact = compact_results(results)
+    assert all(isinstance(r, FileInfo) for r in compact)
+    assert expand_results(compact) == results
+
+
+def test_compact_results_read_like_dicts():
+    """Test that existing dict-based callers work on compact results."""
+    results = parse_path("examples")
+    compact = compact_results(results)
+
+    assert compute_coverage(compact) == compute_coverage(results)
+    fn = compact[0]["functions"][0]
+    assert fn["name"] == results[0]["functions"][0]["name"]
+    assert [a["name"] for a in fn.get("args", [])] == [a["name"] for a in results[0]["functions"][0]["args"]]
+    assert fn.get("docstring") is None
+    assert "class_attributes" not in fn
+
+
+def test_methods_share_class_attributes():
+    """Test that class attributes are stored once per class, not per method."""
+    compact = compact_results([{
+        "path": "x.py", "functions": [], "imports": [], "module_docstring": False,
+        "classes": [{
+            "type": "class", "name": "C", "lineno": 1, "end_lineno": 5, "has_docstring": False,
+            "methods": [
+                {"type": "method", "name": m, "lineno": 2, "end_lineno": 3, "args": [],
+                 "returns": None, "has_docstring": False, "complexity": 1, "nesting_depth": 0,
+                 "class_attributes": ["size"], "indent": 8}
+                for m in ("a", "b")
+            ],
+        }],
+    }])
+    a, b = compact[0]["classes"][0]["methods"]
+    assert a["class_attributes"] is b["class_attributes"]
+    assert a.to_dict()["class_attributes"] == ["size"]
@@ -0,0 +1,91 @@
+"""Tests for packing several functions into one LLM request."""
+
+import json
+
+from benchmarks.llm_stub import StubLLMServer, completion_content
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.llm_integration import estimate_tokens
+from core.docstring_engine.packing import (
+    _OVERHEAD_TOKENS, REPLY_TOKENS_PER_FUNCTION, build_packed_prompt, describe, generate_packed, pack, parse_packed,
+)
+from tests.helpers import http_complete, make_fns
+
+
+def test_pack_respects_budget_and_max_items():
+    """Test that every group fits the token budget and the item cap."""
+    fns = make_fns(50)
+    groups = pack(fns, budget=1500, max_items=8)
+    assert [i for g in groups for i in g] == list(range(50))
+    for g in groups:
+        assert len(g) <= 8
+        cost = _OVERHEAD_TOKENS + sum(estimate_tokens(describe(f"f{k}", fns[i])) + REPLY_TOKENS_PER_FUNCTION
+                                      for k, i in enumerate(g))
+        assert cost <= 1500
+    assert pack(fns, budget=10)[0] == [0]  # an oversized function still gets its own group
+
+
+def test_packed_prompt_lists_ids_once():
+    """Test the packed prompt layout."""
+    prompt = build_packed_prompt(make_fns(3))
+    assert prompt.count("Rules:") == 1
+    assert "[f0] Function name: fn0;" in prompt and "[f2] Function name: fn2;" in prompt
+
+
+def test_parse_packed_salvages_broken_reply():
+    """Test that well-formed items survive a broken array and bad items are dropped."""
+    text = ('```json\n[{"id": "f0", "summary": "Add.", "args": {"x": "X"}, "returns": "int", "raises": {}},\n'
+            '{"id": "f1", "args": {}},\n'
+            '{"id": "f2", "summary": "Sub.", "args": {}, "returns": "int", "raises": {}},\n'
+            '{"id": "f3", "summary": "Trunc')
+    parsed = parse_packed(text, ["f0", "f1", "f2", "f3"])
+    assert set(parsed) == {"f0", "f2"}
+    assert parsed["f0"]["args"] == {"x": "X"}
+    assert parse_packed(json.dumps([{"id": "f9", "summary": "x"}]), ["f0"]) == {}
+
+
+def test_only_failed_items_are_retried():
+    """Test that a partly malformed reply re-requests just the missing items."""
+    prompts = []
+
+    def complete(prompt):
+        prompts.append(prompt)
+        reply = json.loads(completion_content(prompt))
+        if len(prompts) == 1:
+            reply = [item for item in reply if item["id"] not in ("f1", "f3")]
+        return json.dumps(reply)
+
+    stats = {}
+    contents = generate_packed(make_fns(5), complete, stats=stats)
+    assert [c["summary"] for c in contents] == [f"Run fn{i}." for i in range(5)]
+    assert stats["requests"] == 2
+    assert "fn1" in prompts[1] and "fn3" in prompts[1] and "fn0" not in prompts[1]
+
+
+def test_unreadable_reply_splits_group():
+    """Test that a wholly broken reply is split in halves down to single prompts."""
+    prompts = []
+
+    def complete(prompt):
+        prompts.append(prompt)
+        if "fn2" in prompt:  # a reply that never parses for anything grouped with fn2
+            return "not json"
+        return completion_content(prompt)
+
+    stats = {}
+    contents = generate_packed(make_fns(4), complete, stats=stats)
+    assert [c["summary"] for c in contents[:2]] == ["Run fn0.", "Run fn1."]
+    assert contents[3]["summary"] == "Run fn3."
+    assert contents[2]["summary"] == "Short description of `fn2`."  # single-prompt fallback
+    # [0..3] fails -> [0,1] ok, [2,3] fails -> [2] single (fallback), [3] single
+    assert stats["requests"] == 5
+
+
+def test_batch_pack_mode_against_stub_server():
+    """Test packed generation through generate_docstrings over HTTP."""
+    with StubLLMServer(latency=0.01) as server:
+        stats = {}
+        results = generate_all(make_fns(30), max_concurrency=3, limiter=RateLimiter(None, None),
+                               pack_budget=3000, max_pack=10, complete=http_complete(server.url), stats=stats)
+        assert server.requests == stats["requests"] == 3
+    assert all(r["error"] is None for r in results)
+    assert "Run fn29." in results[29]["docstring"]
@@ -0,0 +1,100 @@
+"""Tests for the persistent parse cache."""
+
+import os
+
+from core.parser import python_parser
+from core.parser.parse_cache import ParseCache
+from core.parser.python_parser import parse_path
+
+
+def _write_repo(root):
+    (root / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    (root / "b.py").write_text('def b():\n    """Doc."""\n', encoding="utf-8")
+
+
+def test_warm_scan_is_served_from_cache(tmp_path):
+    """Test that a second scan of an unchanged tree hits the cache for every file."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_repo(repo)
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"))
+
+    cold = parse_path(str(repo), cache=cache)
+    assert cache.misses == 2 and cache.hits == 0
+
+    warm = parse_path(str(repo), cache=cache)
+    assert warm == cold
+    assert cache.hits == 2
+
+
+def test_edit_during_parse_is_not_cached_as_fresh(tmp_path, monkeypatch):
+    """Test that a result is stored under the hash of the bytes it was parsed from."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_repo(repo)
+    read_source = python_parser._read_source
+
+    def racing_read(path):
+        data = read_source(path)
+        # edited right after being read: same size, later mtime
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data.decode("utf-8").replace("def a", "def z").replace("def b", "def y"))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        return data
+
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(python_parser, "_read_source", racing_read)
+    stale = parse_path(str(repo), cache=cache)
+    monkeypatch.undo()
+    assert [r["functions"][0]["name"] for r in stale] == ["a", "b"]
+
+    fresh = parse_path(str(repo), cache=cache)
+    assert [r["functions"][0]["name"] for r in fresh] == ["z", "y"]
+    assert cache.hits == 0
+
+
+def test_touched_file_confirmed_by_hash(tmp_path):
+    """Test that an mtime-only change is a hit and a content change is a miss."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_repo(repo)
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"))
+    parse_path(str(repo), cache=cache)
+
+    a = repo / "a.py"
+    st = os.stat(a)
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    parse_path(str(repo), cache=cache)
+    assert cache.hits == 2
+
+    a.write_text("def a():\n    return 2\n", encoding="utf-8")
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 20_000_000))
+    parse_path(str(repo), cache=cache)
+    assert cache.hits == 3 and cache.misses == 3
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    """Test that the least recently used entries are evicted over the cap."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_repo(repo)
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"), max_bytes=1)
+    parse_path(str(repo), cache=cache)
+
+    assert cache.stats()["entries"] <= 1
+
+
+def test_parser_version_change_invalidates(tmp_path):
+    """Test that entries written by another parser version are ignored."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _write_repo(repo)
+    db = str(tmp_path / "cache.sqlite3")
+    old = ParseCache(db, parser_version="old")
+    parse_path(str(repo), cache=old)
+    old.close()
+
+    new = ParseCache(db)
+    parse_path(str(repo), cache=new)
+    assert new.hits == 0 and new.misses == 2
@@ -105,3 +105,131 @@ def test_docstring_detection():
             # All functions have same docstring status - this is valid!
             # It means either all are documented or all are undocumented
             pass
+
+
+def test_single_pass_metrics(tmp_path):
+    """Test raises, yields, nesting, complexity and imports from the fused pass."""
+    src = tmp_path / "metrics.py"
+    src.write_text(
+        "import os\n"
+        "\n"
+        "def walk(items):\n"
+        "    from json import dumps\n"
+        "    for x in items:\n"
+        "        if x:\n"
+        "            raise ValueError(x)\n"
+        "        yield x\n"
+        "    raise KeyError('done')\n"
+        "\n"
+        "class Box:\n"
+        "    size = 1\n"
+        "    def get(self):\n"
+        "        with open('f') as f:\n"
+        "            return [l for l in f]\n",
+        encoding="utf-8",
+    )
+    parsed = parse_file(str(src))
+
+    fn = parsed["functions"][0]
+    assert fn["raises"] == ["KeyError('done')", "ValueError(x)"]
+    assert fn["yields"] is True
+    assert fn["nesting_depth"] == 2
+    assert fn["complexity"] == 2
+
+    method = parsed["classes"][0]["methods"][0]
+    assert method["class_attributes"] == ["size"]
+    assert method["nesting_depth"] == 1
+    assert method["complexity"] == 2
+
+    assert parsed["imports"] == ["json.dumps", "os"]
+
+
+def test_parallel_parse_matches_serial_order(tmp_path):
+    """Test that parallel parsing keeps serial order and reports bad files."""
+    for i in range(6):
+        sub = tmp_path / f"pkg{i % 2}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"mod{i}.py").write_text(f"def f{i}(x):\n    return x\n" * (i + 1), encoding="utf-8")
+    (tmp_path / "broken.py").write_text("def oops(:\n", encoding="utf-8")
+
+    serial_errors = []
+    serial = parse_path(str(tmp_path), errors=serial_errors)
+    parallel_errors = []
+    parallel = parse_path(str(tmp_path), workers=3, errors=parallel_errors)
+
+    assert [r["path"] for r in parallel] == [r["path"] for r in serial]
+    assert parallel == serial
+    assert len(serial) == 6
+    assert parallel_errors == serial_errors
+    assert parallel_errors[0]["error"] == "SyntaxError"
+    assert parallel_errors[0]["path"].endswith("broken.py")
+
+
+def test_annotations_are_source_slices(tmp_path):
+    """Test that annotation, default and raise text is taken from the source."""
+    from core.parser.python_parser import normalize_annotation
+
+    src = tmp_path / "typed.py"
+    src.write_text(
+        "def f(a: Dict[str,int], b: \"Foo\" = {'k': 1}, *, ü: int = 0) -> Optional[\n"
+        "        List[str]]:\n"
+        "    raise ValueError(\"bad\")\n",
+        encoding="utf-8",
+    )
+    fn = parse_file(str(src))["functions"][0]
+
+    assert [a["annotation"] for a in fn["args"]] == ["Dict[str,int]", '"Foo"', "int"]
+    assert fn["defaults"] == ["{'k': 1}"]
+    assert fn["returns"] == "Optional[ List[str]]"
+    assert fn["raises"] == ['ValueError("bad")']
+
+    assert normalize_annotation("Dict[str,int]") == "Dict[str, int]"
+    assert normalize_annotation(fn["returns"]) == "Optional[List[str]]"
+
+
+def test_encoded_sources(tmp_path, monkeypatch):
+    """Test that coding cookies, BOMs and mapped files are parsed from bytes."""
+    from core.parser import python_parser
+
+    cookie = tmp_path / "latin.py"
+    cookie.write_bytes(
+        "# -*- coding: latin-1 -*-\n"
+        "def f(x: \"é\" = \"ü\"):\n"
+        "    \"\"\"Doc é.\"\"\"\n".encode("latin-1")
+    )
+    fn = parse_file(str(cookie))["functions"][0]
+    assert fn["args"][0]["annotation"] == '"é"'
+    assert fn["defaults"] == ['"ü"']
+    assert fn["has_docstring"]
+
+    bom = tmp_path / "bom.py"
+    bom.write_bytes(b"\xef\xbb\xbfdef g(y: Dict[str, int]) -> \"\xc3\xa9\":\r\n    return y\r\n")
+    fn = parse_file(str(bom))["functions"][0]
+    assert fn["args"][0]["annotation"] == "Dict[str, int]"
+    assert fn["returns"] == '"é"'
+
+    monkeypatch.setattr(python_parser, "MMAP_THRESHOLD", 1)
+    timing = {}
+    assert python_parser._parse_file_timed(str(bom), timing)["functions"][0]["returns"] == '"é"'
+    assert timing["bytes"] == len(bom.read_bytes())
+
+
+def test_relative_imports_keep_level(tmp_path):
+    """Test that relative imports keep their leading dots."""
+    src = tmp_path / "rel.py"
+    src.write_text("from . import a\nfrom ..pkg.mod import b\nimport c.d\n", encoding="utf-8")
+    assert parse_file(str(src))["imports"] == ["..pkg.mod.b", ".a", "c.d"]
+
+
+def test_multiline_slices_keep_string_literals(tmp_path):
+    """Test that joining a multi-line expression leaves whitespace inside literals alone."""
+    src = tmp_path / "literals.py"
+    src.write_text(
+        'def f(a="""one\n    two""", b=f"{x}  and   {y}" if (\n        x) else None):\n'
+        '    raise ValueError(\n        "first  part "\n        "second"\n    )\n',
+        encoding="utf-8",
+    )
+    fn = parse_file(str(src))["functions"][0]
+
+    assert fn["defaults"] == ['"""one\n    two"""', 'f"{x}  and   {y}" if ( x) else None']
+    assert fn["raises"] == ['ValueError( "first  part " "second" )']
@@ -0,0 +1,44 @@
+"""Tests for the split content / render stages of docstring generation."""
+
+import pytest
+
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.generator import STYLES, generate_docstring, render_docstring, render_docstrings
+from tests.helpers import make_fns
+
+
+def test_bulk_render_matches_single_render():
+    """Test that render_docstrings gives the same text as render_docstring per item."""
+    fns = make_fns(50)
+    contents = [{"summary": f"Run {fn['name']}.", "args": {"x": "Input."}, "returns": "Output.",
+                 "raises": {"ValueError": "Bad x."}} for fn in fns]
+    for style in STYLES:
+        assert render_docstrings(fns, contents, style) == [render_docstring(f, c, style)
+                                                           for f, c in zip(fns, contents)]
+    assert "Parameters" in render_docstrings(fns, contents, "numpy")[0]
+    assert ":param x: Input." in render_docstrings(fns, contents, "rest")[0]
+
+
+def test_style_switch_reuses_content():
+    """Test that content is generated once and every style renders from it."""
+    calls = []
+
+    async def content(fn):
+        calls.append(fn["name"])
+        return {"summary": f"Run {fn['name']}."}
+
+    fns = make_fns(10)
+    results = generate_all(fns, None, content=content, limiter=RateLimiter(None, None))
+    assert all(r["docstring"] is None for r in results)
+    contents = [r["content"] for r in results]
+    rendered = {style: render_docstrings(fns, contents, style) for style in STYLES}
+    assert len(calls) == 10
+    assert all("Run fn3." in rendered[style][3] for style in STYLES)
+
+
+def test_unknown_style_fails_before_llm_call():
+    """Test that an invalid style is rejected without generating content."""
+    with pytest.raises(ValueError):
+        generate_docstring({"name": "f", "args": []}, style="bogus")
+    with pytest.raises(ValueError):
+        render_docstrings(make_fns(1), [{}], "bogus")
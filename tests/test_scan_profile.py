@@ -0,0 +1,43 @@
+"""Tests for per-file scan instrumentation."""
+
+import json
+
+from core.parser.parse_cache import ParseCache
+from core.parser.python_parser import iter_parse_path, parse_path
+from core.parser.scan_profile import ScanProfile
+
+
+def test_profile_records_every_parsed_file(tmp_path):
+    """Test that each file gets phase timings, size and node count."""
+    (tmp_path / "a.py").write_text("def a(x):\n    return x\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("def b(:\n", encoding="utf-8")
+
+    profile = ScanProfile()
+    parse_path(str(tmp_path), profile=profile)
+
+    totals = profile.totals()
+    assert totals["files_parsed"] == 2
+    assert totals["files_failed"] == 1
+    good = next(f for f in profile.files if f["path"].endswith("a.py"))
+    assert good["nodes"] > 0 and good["bytes"] > 0
+    assert good["total_s"] == good["read_s"] + good["parse_s"] + good["extract_s"]
+    assert len(profile.slowest(1)) == 1
+
+
+def test_profile_counts_cache_hits_and_writes_report(tmp_path):
+    """Test cached files are counted and the report is written as JSON."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def a():\n    pass\n", encoding="utf-8")
+    cache = ParseCache(str(tmp_path / "cache.sqlite3"))
+    parse_path(str(repo), cache=cache)
+
+    profile = ScanProfile()
+    list(iter_parse_path(str(repo), cache=cache, profile=profile))
+    assert profile.totals()["files_cached"] == 1
+    assert profile.totals()["files_parsed"] == 0
+
+    out = tmp_path / "reports" / "scan_profile.json"
+    profile.write(str(out))
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert set(data) == {"totals", "slowest"}
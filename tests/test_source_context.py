@@ -0,0 +1,102 @@
+"""Tests for the source context added to docstring prompts."""
+
+from core.docstring_engine.backends import FakeBackend
+from core.docstring_engine.batch import RateLimiter, generate_all
+from core.docstring_engine.llm_integration import build_prompt
+from core.docstring_engine.packing import build_packed_prompt
+from core.docstring_engine.source_context import (
+    compact_source, estimate_tokens, read_sources, source_excerpt, truncate_source, with_sources,
+)
+from core.docstring_engine.content_cache import content_key
+from core.parser.models import compact_results
+from core.parser.python_parser import parse_file, parse_path
+
+SOURCE = '''    def load(self, path: str,
+             strict: bool = False) -> dict:
+        """Old docstring."""
+        # read the file
+        data = open(path).read()  # trailing comment
+
+        message = "a literal long enough to be shortened in the prompt excerpt"
+        ", ".join(data)
+        if not data:
+            raise ValueError(message)
+        return parse(data)
+'''
+
+
+def test_compaction_drops_comments_docstring_and_long_literals():
+    """Test what compact_source removes and what it keeps."""
+    assert compact_source(SOURCE).splitlines() == [
+        "def load(self, path: str,",
+        "         strict: bool = False) -> dict:",
+        "    data = open(path).read()",
+        '    message = "..."',
+        '    ", ".join(data)',
+        "    if not data:",
+        "        raise ValueError(message)",
+        "    return parse(data)",
+    ]
+    assert compact_source("def f(:\n    # broken\n\n    pass") == "def f(:\n    # broken\n    pass"
+
+
+def test_truncation_keeps_signature_and_key_lines_within_budget():
+    """Test smart truncation of a long body."""
+    body = "\n".join(f"    x{i} = step(x{i - 1}, {i})" for i in range(1, 300))
+    source = "def run(x0,\n        limit):\n    if x0 is None:\n        raise ValueError('x0')\n" + body + \
+             "\n    return x299\n"
+    text = truncate_source(source, 150)
+    assert estimate_tokens(text) <= 150
+    lines = text.splitlines()
+    assert lines[:2] == ["def run(x0,", "        limit):"]
+    assert "        raise ValueError('x0')" in lines and lines[-1] == "    return x299"
+    assert any("lines omitted" in line for line in lines)
+    assert truncate_source("def f():\n    return 1", 150) == "def f():\n    return 1"
+
+
+def test_prompts_include_budgeted_source(tmp_path):
+    """Test with_sources and the source block of single and packed prompts."""
+    fp = tmp_path / "m.py"
+    fp.write_text("import os\n\n\ndef f(a):\n    # comment\n    return a + 1\n\n\ndef g():\n    pass\n")
+    parsed = parse_file(str(fp))["functions"]
+    fns = with_sources([(str(fp), fn) for fn in parsed])
+    assert "source" not in parsed[0]
+    assert fns[0]["source"] == "def f(a):\n    # comment\n    return a + 1"
+    assert "Source:\ndef f(a):\n    return a + 1\n" in build_prompt(fns[0])
+    assert "Source:" not in build_prompt(fns[0], source_budget=0)
+    assert "\n    def g():\n        pass" in build_packed_prompt(fns)
+    assert source_excerpt({"name": "h"}) is None
+
+    fns[0]["source"] += "\n" + "\n".join(f"    y{i} = a * {i}" for i in range(500))
+    base = estimate_tokens(build_prompt(fns[0], source_budget=0))
+    assert estimate_tokens(build_prompt(fns[0], source_budget=200)) <= base + 200 + 5
+
+
+def test_sources_for_compact_parse_results(tmp_path):
+    """Test reading sources for the watcher's read-only compact models."""
+    fp = tmp_path / "m.py"
+    fp.write_text("def f(a):\n    return a + 1\n\n\nclass C:\n    def m(self):\n        return 2\n")
+    (result,) = compact_results(parse_path(str(tmp_path)))
+    items = [(result["path"], fn) for fn in result["functions"]] + \
+            [(result["path"], m) for c in result["classes"] for m in c["methods"]]
+    assert read_sources(items) == {
+        (result["path"], 1): "def f(a):\n    return a + 1",
+        (result["path"], 6): "    def m(self):\n        return 2",
+    }
+    fns = with_sources(items)
+    assert [fn["source"] for fn in fns] == ["def f(a):\n    return a + 1", "    def m(self):\n        return 2"]
+    assert "Source:\ndef m(self):\n    return 2\n" in build_prompt(fns[1])
+    assert content_key(fns[0]) == content_key(items[0][1])
+    assert content_key(fns[0], source_budget=150) != content_key(fns[0])
+
+
+def test_prompt_tokens_reported_per_request():
+    """Test that every result and the stats carry estimated prompt tokens."""
+    fns = [{"name": f"f{i}", "args": [], "source": f"def f{i}():\n    return {i}"} for i in range(4)]
+    stats = {}
+    results = generate_all(fns, None, backend=FakeBackend(), limiter=RateLimiter(None, None), stats=stats)
+    assert all(r["prompt_tokens"] == estimate_tokens(build_prompt(fn)) for r, fn in zip(results, fns))
+    assert stats["prompt_tokens"] == sum(r["prompt_tokens"] for r in results)
+    packed = generate_all(fns, None, backend=FakeBackend(), limiter=RateLimiter(None, None), pack_budget=3000)
+    assert len({r["prompt_tokens"] for r in packed}) == 1
+    assert packed[0]["prompt_tokens"] == estimate_tokens(build_packed_prompt(fns))
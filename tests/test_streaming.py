@@ -0,0 +1,75 @@
+"""Tests for streaming docstring generation."""
+
+import json
+
+import pytest
+
+from core.docstring_engine.backends import BackendError, FakeBackend
+from core.docstring_engine.batch import RateLimiter
+from core.docstring_engine.content_cache import ContentCache
+from core.docstring_engine.generator import render_docstring
+from core.docstring_engine.streaming import ContentStreamParser, stream_docstring
+
+REPLY = {
+    "summary": "Load the \"user\" record é \U0001F600.\nSecond line.",
+    "args": {"user_id": "Id of the user.", "strict": "Fail on unknown fields."},
+    "returns": "The user.",
+    "raises": {"KeyError": "Unknown id."},
+    "score": 1.5,
+    "tags": [1, "a", None, True],
+}
+
+
+def test_parser_matches_json_for_any_chunking():
+    """Test that every chunk size yields the same object as json.loads."""
+    for text in ("```json\n" + json.dumps(REPLY, indent=2) + "\n```", json.dumps(REPLY)):
+        for size in (1, 2, 3, 5, 8, 1000):
+            parser = ContentStreamParser()
+            for i in range(0, len(text), size):
+                parser.feed(text[i:i + size])
+            assert parser.done and parser.content == REPLY
+
+
+def test_parser_exposes_partial_strings():
+    """Test that summary, args and returns are visible before their strings close."""
+    parser = ContentStreamParser()
+    assert not parser.feed("Sure: ")
+    assert parser.feed('{"summary": "Load the us')
+    assert parser.content == {"summary": "Load the us"}
+    parser.feed('er.", "args": {"user_id": "Id')
+    assert parser.content == {"summary": "Load the user.", "args": {"user_id": "Id"}}
+    parser.feed('"}, "returns": "The')
+    assert parser.content["returns"] == "The" and not parser.done
+    assert not parser.feed("\\u00")
+    assert parser.feed("e9")
+    assert parser.content["returns"] == "Theé"
+
+
+def test_stream_docstring_renders_partial_then_final(tmp_path):
+    """Test the event sequence and caching of streamed generation."""
+    fn = {"name": "load_user", "args": [{"name": "user_id"}], "returns": "User"}
+    backend = FakeBackend(chunk_size=3)
+    events = list(stream_docstring(fn, "numpy", backend=backend))
+    assert len(events) > 2 and [e["done"] for e in events].count(True) == 1 and events[-1]["done"]
+    summaries = [e["content"]["summary"] for e in events]
+    assert summaries[0] != summaries[-1] == "Run load_user."
+    assert all(summaries[-1].startswith(s) for s in summaries)
+    assert events[-1]["docstring"] == render_docstring(fn, events[-1]["content"], "numpy")
+
+    cache = ContentCache(str(tmp_path / "c.sqlite3"))
+    list(stream_docstring(fn, backend=backend, cache=cache))
+    calls = backend.calls
+    cached = list(stream_docstring(fn, "rest", backend=backend, cache=cache))
+    assert backend.calls == calls and len(cached) == 1 and cached[0]["done"]
+
+
+def test_stream_docstring_retries_then_raises():
+    """Test 429/5xx retries before any output and the error raised otherwise."""
+    fn = {"name": "load_user", "args": [], "returns": "User"}
+    backend = FakeBackend(fail_statuses=[429, 503])
+    events = list(stream_docstring(fn, backend=backend, limiter=RateLimiter(None, None), base_delay=0.001))
+    assert backend.calls == 3 and events[-1]["content"]["summary"] == "Run load_user."
+    with pytest.raises(BackendError):
+        list(stream_docstring(fn, backend=FakeBackend(fail_statuses=[400])))
+    with pytest.raises(BackendError):
+        list(stream_docstring(fn, backend=FakeBackend(fail_statuses=[503] * 3), retries=1, base_delay=0.001))
@@ -0,0 +1,80 @@
+"""Tests for the symbol search index."""
+
+import os
+import random
+
+from core.parser.watcher import ScanWatcher
+from core.search.symbol_index import SymbolIndex
+
+
+def _result(path, functions=(), classes=()):
+    return {
+        "path": path,
+        "functions": [{"name": n, "lineno": i + 1, "has_docstring": doc} for i, (n, doc) in enumerate(functions)],
+        "classes": [{"name": c, "lineno": 1, "has_docstring": doc,
+                     "methods": [{"name": m, "lineno": 2, "has_docstring": False} for m in methods]}
+                    for c, doc, methods in classes],
+    }
+
+
+def test_search_ranks_and_filters():
+    """Test ranking order and kind/docstring filters."""
+    index = SymbolIndex([
+        _result("a.py", [("parse", True), ("parse_file", False), ("reparse", True)],
+                [("Parser", False, ["parse_chunk", "run"])]),
+        _result("b.py", [("load", False)]),
+    ])
+
+    assert [s["qualname"] for s in index.search("parse", limit=None)] == [
+        "parse", "Parser.parse_chunk", "parse_file", "Parser", "Parser.run", "reparse"]
+    assert [s["name"] for s in index.search("parse", limit=2)] == ["parse", "parse_chunk"]
+    assert [s["name"] for s in index.search("PARSE", kinds=["function"], has_docstring=False)] == ["parse_file"]
+    assert [s["name"] for s in index.search("lo")] == ["load"]
+    assert index.search("zzz") == []
+    assert index.search("", path="b.py")[0]["file_path"] == "b.py"
+
+
+def test_matches_linear_scan_after_updates():
+    """Test that trigram lookups agree with a substring scan through replaces and removals."""
+    rng = random.Random(1)
+    words = ["get", "set", "load", "save", "parse", "user", "item", "cache", "index"]
+
+    def make(i):
+        return _result(f"m{i}.py", [("_".join(rng.sample(words, 2)), rng.random() < 0.5) for _ in range(30)])
+
+    files = {i: make(i) for i in range(80)}
+    index = SymbolIndex(files.values())
+    for step in range(400):
+        i = rng.randrange(80)
+        if step % 3:
+            files[i] = make(i)
+            index.update_file(files[i])
+        else:
+            files.pop(i, None)
+            index.remove_file(f"m{i}.py")
+
+    assert len(index) == sum(len(r["functions"]) for r in files.values())
+    for query in ["et", "load_", "ser_it", "cache_index", "x"]:
+        expected = sorted((r["path"], f["lineno"]) for r in files.values()
+                          for f in r["functions"] if query in f["name"])
+        got = sorted((s["file_path"], s["lineno"]) for s in index.search(query, limit=None))
+        assert got == expected
+
+
+def test_watcher_keeps_index_in_sync(tmp_path):
+    """Test that rescanned and deleted files update the index."""
+    a = tmp_path / "a.py"
+    a.write_text("def alpha():\n    pass\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("def beta():\n    pass\n", encoding="utf-8")
+    watcher = ScanWatcher(str(tmp_path), use_inotify=False, index=SymbolIndex())
+    assert [s["name"] for s in watcher.index.search("alp")] == ["alpha"]
+
+    a.write_text("def alpine():\n    pass\n", encoding="utf-8")
+    st = os.stat(a)
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    (tmp_path / "b.py").unlink()
+    watcher.poll()
+
+    assert [s["name"] for s in watcher.index.search("alp")] == ["alpine"]
+    assert watcher.index.search("beta") == []
+    watcher.close()
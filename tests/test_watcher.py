@@ -0,0 +1,79 @@
+"""Tests for incremental watch-mode rescans."""
+
+import os
+
+import pytest
+
+from core.parser.python_parser import parse_path
+from core.parser.watcher import ScanWatcher
+from core.reporter.coverage_reporter import compute_coverage
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watcher_patches_results_and_coverage(tmp_path, use_inotify):
+    """Test that created, modified and deleted files are applied incrementally."""
+    (tmp_path / "a.py").write_text("def a():\n    pass\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text('def b():\n    """Doc."""\n', encoding="utf-8")
+    sub = tmp_path / "pkg"
+    sub.mkdir()
+    (sub / "c.py").write_text("def c():\n    pass\n", encoding="utf-8")
+
+    watcher = ScanWatcher(str(tmp_path), use_inotify=use_inotify)
+    results, report = watcher.results, watcher.report
+    assert report["summary"]["total_items"] == 3
+    assert watcher.backend_name == ("inotify" if use_inotify else "polling")
+
+    a = tmp_path / "a.py"
+    a.write_text('def a():\n    """Now documented."""\n', encoding="utf-8")
+    _bump_mtime(a)
+    (tmp_path / "b.py").unlink()
+    (sub / "d.py").write_text("def d():\n    pass\n\ndef e():\n    pass\n", encoding="utf-8")
+
+    delta = watcher.poll(0.05)
+    assert delta["modified"] == [str(a)]
+    assert delta["deleted"] == [str(tmp_path / "b.py")]
+    assert delta["created"] == [str(sub / "d.py")]
+
+    # patched in place, and equal to a full rebuild
+    assert watcher.results is results and watcher.report is report
+    full = parse_path(str(tmp_path))
+    assert sorted(results, key=lambda r: r["path"]) == sorted(full, key=lambda r: r["path"])
+    assert report == compute_coverage(full)
+    watcher.close()
+
+
+def test_watcher_keeps_last_good_result_on_syntax_error(tmp_path):
+    """Test that a file broken mid-edit keeps its previous result and records an error."""
+    a = tmp_path / "a.py"
+    a.write_text("def a():\n    pass\n", encoding="utf-8")
+    watcher = ScanWatcher(str(tmp_path), use_inotify=False)
+
+    a.write_text("def a(:\n", encoding="utf-8")
+    _bump_mtime(a)
+    delta = watcher.poll()
+
+    assert not any(delta.values())
+    assert watcher.results[0]["functions"][0]["name"] == "a"
+    assert watcher.errors[str(a)]["error"] == "SyntaxError"
+
+
+def test_watcher_compact_results(tmp_path):
+    """Test that compact mode stores FileInfo objects and still patches coverage."""
+    from core.parser.models import FileInfo
+
+    a = tmp_path / "a.py"
+    a.write_text("def a():\n    pass\n", encoding="utf-8")
+    watcher = ScanWatcher(str(tmp_path), use_inotify=False, compact=True)
+    assert isinstance(watcher.results[0], FileInfo)
+
+    a.write_text('def a():\n    """Doc."""\n', encoding="utf-8")
+    _bump_mtime(a)
+    watcher.poll()
+
+    assert isinstance(watcher.results[0], FileInfo)
+    assert watcher.report["summary"]["coverage_percent"] == 100.0